@@ -0,0 +1,65 @@
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from fastapi import Response
+from pydantic_core import to_json
+
+from app.schemas.parameters import Parameter
+from app.schemas.principles import Principle
+from app.services import parameters as parameters_service
+from app.services import principles as principles_service
+
+
+class JSONBytesResponse(Response):
+    """Response for a body that is already encoded JSON."""
+
+    media_type = "application/json"
+
+
+def json_list(fragments: Iterable[bytes]) -> bytes:
+    return b"[" + b",".join(fragments) + b"]"
+
+
+class CatalogJSON:
+    """The static TRIZ catalog, serialized to JSON once.
+
+    Catalog routes return these bytes as they are, and search routes splice the cached item
+    fragments together with their scores, so no response model is validated or encoded per
+    request.
+    """
+
+    def __init__(
+        self,
+        principles: List[Principle],
+        parameters: List[Parameter],
+        matrix: List[List[List[int]]],
+    ):
+        self.principles: Dict[int, bytes] = {p.id: to_json(p) for p in principles}
+        self.parameters: Dict[int, bytes] = {p.id: to_json(p) for p in parameters}
+        self.all_principles = json_list(self.principles.values())
+        self.all_parameters = json_list(self.parameters.values())
+        self.matrix = to_json({"cells": matrix})
+
+    def principle_list(self, principles: Iterable[Principle]) -> bytes:
+        return json_list(self.principles[p.id] for p in principles)
+
+    def scored_principles(self, results: Iterable[Tuple[Principle, float]]) -> bytes:
+        return json_list(
+            b'{"principle":' + self.principles[p.id] + b',"score":' + to_json(float(score)) + b"}"
+            for p, score in results
+        )
+
+    def scored_parameters(self, results: Iterable[Tuple[Parameter, float]]) -> bytes:
+        return json_list(
+            b'{"parameter":' + self.parameters[p.id] + b',"score":' + to_json(float(score)) + b"}"
+            for p, score in results
+        )
+
+
+@lru_cache()
+def get_catalog_json() -> CatalogJSON:
+    return CatalogJSON(
+        principles=principles_service.get_all_principles(),
+        parameters=parameters_service.get_all_parameters(),
+        matrix=principles_service.get_matrix(),
+    )
@@ -0,0 +1,21 @@
+from fastapi import Request, Response, status
+
+from app.api.catalog_json import JSONBytesResponse
+from app.utils import get_catalog_etag
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    candidates = [value.strip().removeprefix("W/") for value in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+def catalog_response(request: Request, content: bytes) -> Response:
+    """Serve pre-serialized catalog JSON tagged with the catalog ETag.
+
+    Returns:
+        A 304 response when the client already holds the current catalog, otherwise the content
+    """
+    etag = get_catalog_etag()
+    if _matches(request.headers.get("if-none-match", ""), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    return JSONBytesResponse(content, headers={"ETag": etag, "Cache-Control": "no-cache"})
@@ -0,0 +1,26 @@
+from typing import Awaitable, Callable
+
+from fastapi import HTTPException, status
+
+from app.core.readiness import get_readiness
+from app.schemas.health import ComponentState
+
+# Seconds a client is asked to wait before retrying a route whose component is warming up
+RETRY_AFTER_SECONDS = 5
+
+
+def requires(component: str) -> Callable[[], Awaitable[None]]:
+    """Route dependency answering 503 while a component it needs is still warming up.
+
+    Without it, a request arriving mid warm-up would load the component a second time.
+    """
+
+    async def check() -> None:
+        if get_readiness().state(component) in (ComponentState.PENDING, ComponentState.LOADING):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"The {component} component is still warming up",
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+
+    return check
@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException, Query, status
 from app.services import contradictions as contradictions_service
 
 from ...core.config import settings
+from ...core.tokens import InputTooLongError
 from ...schemas.contradictions import TContradictions, TextInput
 
 logger = logging.getLogger(__name__)
@@ -27,9 +28,7 @@ router = APIRouter(
 )
 def extract_technical_contradiction(text_input: TextInput) -> TContradictions:
     """Extract technical contradiction from text description."""
-    logger.info(
-        f"Extracting technical contradictions (text_length={len(text_input.description)})"
-    )
+    logger.info(f"Extracting technical contradictions (text_length={len(text_input.description)})")
     try:
         result = contradictions_service.extract_tc(
             text_input.description,
@@ -40,6 +39,8 @@ def extract_technical_contradiction(text_input: TextInput) -> TContradictions:
             f"Successfully extracted {len(result.contradictions)} technical contradictions"
         )
         return result
+    except InputTooLongError as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
     except Exception as e:
         logger.error(f"Failed to extract technical contradiction: {str(e)}")
         raise HTTPException(
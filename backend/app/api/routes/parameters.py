@@ -1,8 +1,11 @@
 import logging
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
+from app.api.catalog_json import JSONBytesResponse, get_catalog_json
+from app.api.etag import catalog_response
+from app.api.readiness import requires
 from app.schemas.parameters import Parameter, ScoredParameter
 from app.services import parameters as parameters_service
 
@@ -19,10 +22,13 @@ router = APIRouter(
     response_model=List[Parameter],
     status_code=status.HTTP_200_OK,
 )
-def get_all_parameters() -> List[Parameter]:
-    """Get all TRIZ parameters."""
+def get_all_parameters(request: Request) -> Response:
+    """Get all TRIZ parameters.
+
+    Responses carry the catalog ETag; send it back in `If-None-Match` to get a 304.
+    """
     try:
-        return parameters_service.get_all_parameters()
+        return catalog_response(request, get_catalog_json().all_parameters)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -34,11 +40,12 @@ def get_all_parameters() -> List[Parameter]:
     "/search",
     response_model=List[ScoredParameter],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(requires("embeddings"))],
 )
 def search_parameters(
     q: str = Query(..., description="Search query"),
     limit: int = Query(1, description="Number of results to return", ge=1, le=39),
-) -> List[ScoredParameter]:
+) -> Response:
     """Search TRIZ parameters by semantic similarity."""
     logger.info(f"Searching parameters (query='{q}', limit={limit})")
     try:
@@ -48,10 +55,12 @@ def search_parameters(
         elif len(results) > 1:
             scores = [score for _, score in results]
             avg_score = sum(scores) / len(scores)
-            logger.info(f"Found {len(results)} parameter matches (avg={avg_score:.2f}, range={min(scores):.2f}-{max(scores):.2f})")
+            logger.info(
+                f"Found {len(results)} parameter matches (avg={avg_score:.2f}, range={min(scores):.2f}-{max(scores):.2f})"
+            )
         else:
             logger.info("Found 0 parameter matches")
-        return [ScoredParameter(parameter=param, score=score) for param, score in results]
+        return JSONBytesResponse(get_catalog_json().scored_parameters(results))
     except Exception as e:
         logger.error(f"Failed to search parameters: {str(e)}")
         raise HTTPException(
@@ -65,14 +74,15 @@ def search_parameters(
     response_model=Parameter,
     status_code=status.HTTP_200_OK,
 )
-def get_parameter_by_id(parameter_id: int) -> Parameter:
+def get_parameter_by_id(parameter_id: int) -> Response:
     """Get a specific TRIZ parameter by ID."""
     logger.info(f"Getting parameter by ID: {parameter_id}")
     try:
-        return parameters_service.get_parameter_by_id(parameter_id)
+        parameter = parameters_service.get_parameter_by_id(parameter_id)
     except ValueError as e:
         logger.error(f"Parameter not found: {parameter_id}")
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    return JSONBytesResponse(get_catalog_json().parameters[parameter.id])
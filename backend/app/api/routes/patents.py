@@ -1,12 +1,22 @@
+import asyncio
+import contextvars
 import logging
-import tempfile
-from pathlib import Path
+import time
+from contextlib import ExitStack
+from typing import AsyncIterator, Callable, Optional
 
 from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from ...core.config import settings
-from ...schemas.patents import PatentDocument, PatentUrlRequest
+from ...core.fetch import FetchError
+from ...core.ocr_pool import OCRQueueFullError
+from ...core.uploads import UploadTooLargeError, spool_upload
+from ...schemas.jobs import PatentJob
+from ...schemas.patents import PatentDocument, PatentPipelineEvent, PatentUrlRequest
 from ...services import patents as patents_service
+from ...services.jobs import get_job_manager
 
 logger = logging.getLogger(__name__)
 
@@ -16,6 +26,15 @@ router = APIRouter(
 )
 
 
+def _check_upload_size(file: UploadFile) -> None:
+    if file.size is not None and file.size > settings.MAX_UPLOAD_BYTES:
+        logger.warning(f"Rejecting uploaded file of {file.size} bytes")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Uploaded file exceeds the limit of {settings.MAX_UPLOAD_BYTES} bytes",
+        )
+
+
 @router.post(
     "/extract-tc/upload",
     response_model=PatentDocument,
@@ -30,25 +49,33 @@ def extract_tc_from_upload(
     technical contradictions extracted from the document.
     """
     logger.info(f"Processing uploaded file: {file.filename}")
+    _check_upload_size(file)
 
     try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            content = file.file.read()
-            tmp_file.write(content)
-            tmp_path = Path(tmp_file.name)
-
-        try:
+        with spool_upload(file.file, file.filename or "upload.pdf", settings.MAX_UPLOAD_BYTES) as (
+            source,
+            content_hash,
+        ):
             result = patents_service.patent_tc_pipeline(
-                source=tmp_path,
+                source=source,
                 model=settings.DEFAULT_MODEL,
                 provider=settings.DEFAULT_PROVIDER,
+                source_hash=content_hash,
             )
             return result
-        finally:
-            # Clean up temporary file
-            tmp_path.unlink(missing_ok=True)
 
+    except UploadTooLargeError as e:
+        logger.warning(f"Rejecting uploaded file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except OCRQueueFullError as e:
+        logger.warning(f"Rejecting uploaded file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Failed to extract contradictions from uploaded file: {str(e)}")
         raise HTTPException(
@@ -80,6 +107,18 @@ def extract_tc_from_url(
         )
         return result
 
+    except FetchError as e:
+        logger.warning(f"Could not download patent PDF: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=str(e),
+        )
+    except OCRQueueFullError as e:
+        logger.warning(f"Rejecting patent URL: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+        )
     except Exception as e:
         logger.error(f"Failed to extract contradictions from URL: {str(e)}")
         raise HTTPException(
@@ -88,6 +127,204 @@ def extract_tc_from_url(
         )
 
 
+# ================================================================================================
+# Streaming Progress
+# ================================================================================================
+
+
+def _event_stream(
+    run: Callable[[patents_service.PipelineListener], None],
+    cleanup: Optional[Callable[[], None]] = None,
+) -> StreamingResponse:
+    """Run a pipeline in a worker thread and stream its events as server-sent events.
+
+    cleanup runs once the pipeline is done, or after the response when the client went away
+    before the pipeline was started.
+    """
+    started = False
+
+    async def events() -> AsyncIterator[str]:
+        nonlocal started
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue[Optional[PatentPipelineEvent]] = asyncio.Queue()
+        start = time.perf_counter()
+        reported_error = False
+
+        def listener(event: PatentPipelineEvent) -> None:
+            nonlocal reported_error
+            reported_error = reported_error or event.event == "error"
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+        def worker() -> None:
+            try:
+                run(listener)
+            except Exception as e:
+                logger.error(f"Streaming patent pipeline failed: {str(e)}")
+                # Failures before the pipeline started have no event yet
+                if not reported_error:
+                    elapsed = time.perf_counter() - start
+                    listener(PatentPipelineEvent(event="error", elapsed=elapsed, data=str(e)))
+            finally:
+                if cleanup is not None:
+                    cleanup()
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+        # The pipeline runs in the request's context, e.g. its profile
+        started = True
+        loop.run_in_executor(None, contextvars.copy_context().run, worker)
+        while (event := await queue.get()) is not None:
+            yield f"event: {event.event}\ndata: {event.model_dump_json()}\n\n"
+
+    def cleanup_unstarted() -> None:
+        if not started and cleanup is not None:
+            cleanup()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(cleanup_unstarted),
+    )
+
+
+@router.post(
+    "/extract-tc/upload/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def stream_extract_tc_from_upload(
+    file: UploadFile = File(..., description="Patent PDF file to upload"),
+) -> StreamingResponse:
+    """Extract technical contradictions from an uploaded patent PDF, streaming progress.
+
+    Responds with server-sent events: `stage_started` and `stage_finished` for each stage
+    (the latter with its partial result, e.g. metadata as soon as it is extracted),
+    `ocr_progress` with page counts, and finally `result` or `error`.
+    """
+    logger.info(f"Streaming extraction for uploaded file: {file.filename}")
+    _check_upload_size(file)
+
+    # The upload is closed once this function returns, so it is spooled before streaming
+    spooled = ExitStack()
+    try:
+        source, content_hash = spooled.enter_context(
+            spool_upload(file.file, file.filename or "upload.pdf", settings.MAX_UPLOAD_BYTES)
+        )
+    except UploadTooLargeError as e:
+        logger.warning(f"Rejecting uploaded file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+
+    def run(listener: patents_service.PipelineListener) -> None:
+        patents_service.patent_tc_pipeline(
+            source=source,
+            model=settings.DEFAULT_MODEL,
+            provider=settings.DEFAULT_PROVIDER,
+            source_hash=content_hash,
+            on_event=listener,
+        )
+
+    return _event_stream(run, cleanup=spooled.close)
+
+
+@router.post(
+    "/extract-tc/from-url/stream",
+    response_class=StreamingResponse,
+    status_code=status.HTTP_200_OK,
+)
+def stream_extract_tc_from_url(request: PatentUrlRequest) -> StreamingResponse:
+    """Extract technical contradictions from a patent PDF at a URL, streaming progress.
+
+    Emits the same server-sent events as `/patents/extract-tc/upload/stream`, with an
+    additional `fetch` stage for the download.
+    """
+    logger.info(f"Streaming extraction for patent URL: {request.url}")
+
+    def run(listener: patents_service.PipelineListener) -> None:
+        patents_service.patent_tc_pipeline(
+            source=request.url,
+            model=settings.DEFAULT_MODEL,
+            provider=settings.DEFAULT_PROVIDER,
+            on_event=listener,
+        )
+
+    return _event_stream(run)
+
+
+# ================================================================================================
+# Background Jobs
+# ================================================================================================
+
+
+@router.post(
+    "/jobs/upload",
+    response_model=PatentJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_upload_job(
+    file: UploadFile = File(..., description="Patent PDF file to upload"),
+) -> PatentJob:
+    """Queue technical contradiction extraction for an uploaded patent PDF file.
+
+    Returns immediately with a job that can be polled at `/patents/jobs/{job_id}`.
+    """
+    logger.info(f"Queueing uploaded file: {file.filename}")
+    _check_upload_size(file)
+    try:
+        return get_job_manager().submit_upload(file.file, file.filename or "upload.pdf")
+    except UploadTooLargeError as e:
+        logger.warning(f"Rejecting uploaded file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e),
+        )
+    except Exception as e:
+        logger.error(f"Failed to queue uploaded file: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue uploaded file: {str(e)}",
+        )
+
+
+@router.post(
+    "/jobs/from-url",
+    response_model=PatentJob,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+def submit_url_job(request: PatentUrlRequest) -> PatentJob:
+    """Queue technical contradiction extraction for a patent PDF available at a URL.
+
+    Returns immediately with a job that can be polled at `/patents/jobs/{job_id}`.
+    """
+    logger.info(f"Queueing patent from URL: {request.url}")
+    try:
+        return get_job_manager().submit_url(request.url)
+    except Exception as e:
+        logger.error(f"Failed to queue patent URL: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to queue patent URL: {str(e)}",
+        )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=PatentJob,
+    status_code=status.HTTP_200_OK,
+)
+def get_job(job_id: str) -> PatentJob:
+    """Get the status, stage, progress and result of a patent job."""
+    try:
+        return get_job_manager().get(job_id)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e),
+        )
+
+
 # @router.post(
 #     "/classify",
 #     response_model=List[ScoredPrinciple],
@@ -1,9 +1,12 @@
 import logging
 from typing import List
 
-from fastapi import APIRouter, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 
-from app.schemas.principles import Principle, ScoredPrinciple
+from app.api.catalog_json import JSONBytesResponse, get_catalog_json
+from app.api.etag import catalog_response
+from app.api.readiness import requires
+from app.schemas.principles import ContradictionMatrix, Principle, ScoredPrinciple
 from app.services import principles as principles_service
 
 logger = logging.getLogger(__name__)
@@ -19,10 +22,13 @@ router = APIRouter(
     response_model=List[Principle],
     status_code=status.HTTP_200_OK,
 )
-def get_all_principles() -> List[Principle]:
-    """Get all TRIZ inventive principles."""
+def get_all_principles(request: Request) -> Response:
+    """Get all TRIZ inventive principles.
+
+    Responses carry the catalog ETag; send it back in `If-None-Match` to get a 304.
+    """
     try:
-        return principles_service.get_all_principles()
+        return catalog_response(request, get_catalog_json().all_principles)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -34,11 +40,12 @@ def get_all_principles() -> List[Principle]:
     "/search",
     response_model=List[ScoredPrinciple],
     status_code=status.HTTP_200_OK,
+    dependencies=[Depends(requires("embeddings"))],
 )
 def search_principles(
     q: str = Query(..., description="Search query"),
     limit: int = Query(1, description="Number of results to return", ge=1, le=40),
-) -> List[ScoredPrinciple]:
+) -> Response:
     """Search TRIZ inventive principles by semantic similarity."""
     logger.info(f"Searching principles (query='{q}', limit={limit})")
     try:
@@ -48,10 +55,12 @@ def search_principles(
         elif len(results) > 1:
             scores = [score for _, score in results]
             avg_score = sum(scores) / len(scores)
-            logger.info(f"Found {len(results)} principle matches (avg={avg_score:.2f}, range={min(scores):.2f}-{max(scores):.2f})")
+            logger.info(
+                f"Found {len(results)} principle matches (avg={avg_score:.2f}, range={min(scores):.2f}-{max(scores):.2f})"
+            )
         else:
             logger.info("Found 0 principle matches")
-        return [ScoredPrinciple(principle=prin, score=score) for prin, score in results]
+        return JSONBytesResponse(get_catalog_json().scored_principles(results))
     except Exception as e:
         logger.error(f"Failed to search principles: {str(e)}")
         raise HTTPException(
@@ -65,15 +74,16 @@ def search_principles(
     response_model=Principle,
     status_code=status.HTTP_200_OK,
 )
-def get_principle_by_name(principle_name: str) -> Principle:
+def get_principle_by_name(principle_name: str) -> Response:
     """Get a specific TRIZ inventive principle by name."""
     try:
-        return principles_service.get_principle_by_name(principle_name)
+        principle = principles_service.get_principle_by_name(principle_name)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    return JSONBytesResponse(get_catalog_json().principles[principle.id])
 
 
 @router.get(
@@ -83,10 +93,11 @@ def get_principle_by_name(principle_name: str) -> Principle:
 )
 def get_random_principles(
     limit: int = Query(5, description="Number of random principles to return", ge=1, le=40),
-) -> List[Principle]:
+) -> Response:
     """Get a specified number of random TRIZ inventive principles."""
     try:
-        return principles_service.get_random_principles(limit)
+        principles = principles_service.get_random_principles(limit)
+        return JSONBytesResponse(get_catalog_json().principle_list(principles))
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -102,13 +113,15 @@ def get_random_principles(
 def lookup_principles_from_matrix(
     improving: List[int] = Query(..., description="List of improving parameter IDs"),
     preserving: List[int] = Query(..., description="List of preserving parameter IDs"),
-) -> List[Principle]:
+) -> Response:
     """Get inventive principles from TRIZ contradiction matrix based on parameter pairs."""
-    logger.info(f"Looking up principles from matrix (improving={improving}, preserving={preserving})")
+    logger.info(
+        f"Looking up principles from matrix (improving={improving}, preserving={preserving})"
+    )
     try:
         principles = principles_service.get_principles_from_matrix(improving, preserving)
         logger.info(f"Found {len(principles)} principles from matrix")
-        return principles
+        return JSONBytesResponse(get_catalog_json().principle_list(principles))
     except (TypeError, ValueError) as e:
         logger.error(f"Invalid parameters for matrix lookup: {str(e)}")
         raise HTTPException(
@@ -123,17 +136,37 @@ def lookup_principles_from_matrix(
         )
 
 
+@router.get(
+    "/matrix/table",
+    response_model=ContradictionMatrix,
+    status_code=status.HTTP_200_OK,
+)
+def get_contradiction_matrix(request: Request) -> Response:
+    """Get the whole TRIZ contradiction matrix.
+
+    Responses carry the catalog ETag; send it back in `If-None-Match` to get a 304.
+    """
+    try:
+        return catalog_response(request, get_catalog_json().matrix)
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get contradiction matrix: {str(e)}",
+        )
+
+
 @router.get(
     "/{principle_id}",
     response_model=Principle,
     status_code=status.HTTP_200_OK,
 )
-def get_principle_by_id(principle_id: int) -> Principle:
+def get_principle_by_id(principle_id: int) -> Response:
     """Get a specific TRIZ inventive principle by ID."""
     try:
-        return principles_service.get_principle_by_id(principle_id)
+        principle = principles_service.get_principle_by_id(principle_id)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         )
+    return JSONBytesResponse(get_catalog_json().principles[principle.id])
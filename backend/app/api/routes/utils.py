@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+
+from app.core.readiness import get_readiness
+from app.schemas.health import ReadinessReport
 
 router = APIRouter(
     prefix="/utils",
@@ -8,4 +11,21 @@ router = APIRouter(
 
 @router.get("/health-check/")
 async def health_check() -> bool:
+    """Liveness: the process is up and serving, whatever is still warming up."""
     return True
+
+
+@router.get(
+    "/readiness/",
+    response_model=ReadinessReport,
+    responses={503: {"model": ReadinessReport}},
+)
+async def readiness(response: Response) -> ReadinessReport:
+    """Readiness: warm-up state and duration of each component.
+
+    Answers 503 until every component warmed up at startup is ready.
+    """
+    report = get_readiness().report()
+    if not report.ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
@@ -0,0 +1,86 @@
+"""Import time of the API app, with a budget for CI.
+
+Imports app.main in a fresh interpreter under `python -X importtime`, lists the slowest
+modules by cumulative time and exits non-zero when the total exceeds the budget:
+
+    uv run python -m app.benchmarks.importtime --budget 2.0
+
+Heavy dependencies (torch via sentence-transformers, docling, the LLM SDKs, and numpy, httpx
+and jinja2) are imported on first use, so they should not appear here. ENABLED_ROUTERS in the
+environment applies as it does for the server. tests/test_importtime.py checks the same budget
+and that none of HEAVY_MODULES is imported.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BUDGET_SECONDS = 2.0
+# Imported on first use only; any of these in the import of app.main costs startup time
+HEAVY_MODULES = (
+    "torch",
+    "sentence_transformers",
+    "sklearn",
+    "docling",
+    "pypdfium2",
+    "numpy",
+    "openai",
+    "anthropic",
+    "instructor",
+    "httpx",
+    "jinja2",
+    "frontmatter",
+)
+
+
+def measure(module: str) -> Dict[str, int]:
+    """Cumulative import time in microseconds of every module imported by `import module`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        sys.exit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.removeprefix("import time:").split("|")
+        if total.strip().isdigit():
+            cumulative[name.strip()] = int(total)
+    return cumulative
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure and budget the app import time")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument(
+        "--budget", type=float, help=f"Fail above this many seconds (CI uses {BUDGET_SECONDS})"
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to list")
+    args = parser.parse_args()
+
+    cumulative = measure(args.module)
+    total = cumulative[args.module] / 1e6
+    # Top-level packages only; their submodules are included in the cumulative time
+    packages: List[Tuple[str, int]] = sorted(
+        ((name, us) for name, us in cumulative.items() if "." not in name),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+    print(f"{'package':<40}{'cumulative ms':>14}")
+    for name, us in packages[: args.top]:
+        print(f"{name:<40}{us / 1000:>14.1f}")
+    print(f"\nimport {args.module}: {total:.2f}s")
+
+    if args.budget is not None and total > args.budget:
+        sys.exit(f"Import time {total:.2f}s is over the {args.budget:.2f}s budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""Per-worker memory of the API server: `uvicorn --workers` versus `app.serve`.
+
+Starts the server both ways, waits for the workers to finish loading, then reads each
+process's RSS, PSS and USS from /proc/<pid>/smaps_rollup (Linux only):
+
+    uv run python -m app.benchmarks.memory --workers 4
+
+RSS counts shared pages in full for every process, PSS splits them between the processes that
+share them and USS is what a process holds alone. The total PSS is the memory the server
+really uses. With app.serve the model and embeddings are loaded in the parent and shared, so
+per-worker USS and the total PSS should drop well below the uvicorn numbers.
+"""
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import IO, Dict, List
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+
+def _children(pid: int) -> List[int]:
+    children: List[int] = []
+    for task in Path(f"/proc/{pid}/task").iterdir():
+        children.extend(int(child) for child in (task / "children").read_text().split())
+    return children
+
+
+def _cmdline(pid: int) -> str:
+    return Path(f"/proc/{pid}/cmdline").read_bytes().replace(b"\0", b" ").decode().strip()
+
+
+def memory_kb(pid: int) -> Dict[str, int]:
+    """RSS, PSS and USS of a process in kB."""
+    fields: Dict[str, int] = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value = line.split(":", 1)
+        fields[name] = int(value.split()[0])
+    return {
+        "rss": fields["Rss"],
+        "pss": fields["Pss"],
+        "uss": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def _tail(log: IO[bytes], size: int = 4000) -> str:
+    log.seek(0)
+    return log.read().decode(errors="replace")[-size:]
+
+
+def _wait_ready(server: subprocess.Popen, log: IO[bytes], port: int, timeout: float) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(
+                f"Server exited with {server.returncode} before starting:\n{_tail(log)}"
+            )
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1):
+                return
+        except OSError:
+            time.sleep(0.5)
+    raise TimeoutError(f"Server on port {port} did not start within {timeout:.0f}s:\n{_tail(log)}")
+
+
+def sample(command: List[str], port: int, settle: float, timeout: float) -> List[Dict[str, int]]:
+    """Start a server and return the memory of its supervisor and worker processes, in order.
+
+    Raises:
+        RuntimeError: If the server exits before it answers, with the end of its output
+        TimeoutError: If the server does not answer within timeout seconds
+    """
+    env = {**os.environ, "OCR_WARMUP_ON_STARTUP": "false"}
+    # A file rather than a pipe, so a chatty server never blocks on a full pipe buffer
+    with tempfile.TemporaryFile() as log:
+        server = subprocess.Popen(
+            command, cwd=BACKEND_DIR, env=env, stdout=log, stderr=subprocess.STDOUT
+        )
+        try:
+            _wait_ready(server, log, port, timeout)
+            # The first worker answering does not mean the others finished their lifespan
+            time.sleep(settle)
+            processes = [server.pid] + [
+                pid for pid in _children(server.pid) if "resource_tracker" not in _cmdline(pid)
+            ]
+            return [memory_kb(pid) for pid in processes]
+        finally:
+            server.send_signal(signal.SIGTERM)
+            try:
+                server.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                server.kill()
+
+
+def measure(command: List[str], port: int, settle: float, timeout: float) -> None:
+    """Start a server, print the memory of the supervisor and its workers, then stop it."""
+    usages = sample(command, port, settle, timeout)
+    print(f"\n{' '.join(command)}")
+    print(f"{'process':<14}{'RSS MB':>10}{'PSS MB':>10}{'USS MB':>10}")
+    for index, usage in enumerate(usages):
+        label = "supervisor" if index == 0 else f"worker {index}"
+        print(
+            f"{label:<14}{usage['rss'] / 1024:>10.0f}{usage['pss'] / 1024:>10.0f}"
+            f"{usage['uss'] / 1024:>10.0f}"
+        )
+    total_pss = sum(usage["pss"] for usage in usages)
+    print(f"{'total PSS':<14}{'':>10}{total_pss / 1024:>10.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure per-worker server memory")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--settle", type=float, default=20.0, help="Seconds to wait for workers")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Seconds to wait for startup")
+    args = parser.parse_args()
+
+    if not Path("/proc/self/smaps_rollup").exists():
+        sys.exit("Memory measurement needs /proc/<pid>/smaps_rollup (Linux)")
+
+    workers, port = str(args.workers), str(args.port)
+    measure(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", port, "--workers", workers],
+        args.port,
+        args.settle,
+        args.timeout,
+    )
+    measure(
+        [sys.executable, "-m", "app.serve", "--port", port, "--workers", workers],
+        args.port,
+        args.settle,
+        args.timeout,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Microbenchmark for catalog and search response serialization.
+
+Compares the response_model path (validate the returned models against the response model,
+dump them to JSON-compatible Python, then json.dumps as JSONResponse does) with the
+pre-serialized CatalogJSON path the routes use:
+
+    uv run python -m app.benchmarks.serialization
+"""
+
+import argparse
+import json
+import random
+import timeit
+from typing import Any, Callable, List, Tuple
+
+from pydantic import TypeAdapter
+
+from ..api.catalog_json import CatalogJSON
+from ..schemas.parameters import Parameter, ScoredParameter
+from ..schemas.principles import ContradictionMatrix, Principle, ScoredPrinciple
+from ..services.principles import get_matrix
+from ..utils import get_parameters, get_principles
+
+
+def response_model_path(adapter: TypeAdapter, content: Any) -> bytes:
+    """What FastAPI does with a returned model and a response_model."""
+    value = adapter.validate_python(content, from_attributes=True)
+    data = adapter.dump_python(value, mode="json")
+    return json.dumps(
+        data, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _time(func: Callable[[], bytes], number: int) -> float:
+    """Best of five runs, in microseconds per call."""
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark catalog response serialization")
+    parser.add_argument("--number", type=int, default=2000, help="Calls per measurement")
+    parser.add_argument("--hits", type=int, default=5, help="Results per search response")
+    args = parser.parse_args()
+
+    principles, parameters, matrix = get_principles(), get_parameters(), get_matrix()
+    catalog = CatalogJSON(principles, parameters, matrix)
+    principle_hits: List[Tuple[Principle, float]] = [
+        (p, random.random()) for p in random.sample(principles, args.hits)
+    ]
+    parameter_hits: List[Tuple[Parameter, float]] = [
+        (p, random.random()) for p in random.sample(parameters, args.hits)
+    ]
+
+    principle_list = TypeAdapter(List[Principle])
+    parameter_list = TypeAdapter(List[Parameter])
+    matrix_model = TypeAdapter(ContradictionMatrix)
+    scored_principles = TypeAdapter(List[ScoredPrinciple])
+    scored_parameters = TypeAdapter(List[ScoredParameter])
+    cases = {
+        "GET /principles/": (
+            lambda: response_model_path(principle_list, principles),
+            lambda: catalog.all_principles,
+        ),
+        "GET /parameters/": (
+            lambda: response_model_path(parameter_list, parameters),
+            lambda: catalog.all_parameters,
+        ),
+        "GET /principles/matrix/table": (
+            lambda: response_model_path(matrix_model, ContradictionMatrix(cells=matrix)),
+            lambda: catalog.matrix,
+        ),
+        "GET /principles/search": (
+            lambda: response_model_path(
+                scored_principles,
+                [ScoredPrinciple(principle=p, score=s) for p, s in principle_hits],
+            ),
+            lambda: catalog.scored_principles(principle_hits),
+        ),
+        "GET /parameters/search": (
+            lambda: response_model_path(
+                scored_parameters,
+                [ScoredParameter(parameter=p, score=s) for p, s in parameter_hits],
+            ),
+            lambda: catalog.scored_parameters(parameter_hits),
+        ),
+    }
+
+    print(f"{'route':<30}{'response_model':>16}{'pre-serialized':>16}{'speedup':>10}")
+    for route, (current, fast) in cases.items():
+        # Both paths must produce the same document
+        assert json.loads(current()) == json.loads(fast()), route
+        current_us, fast_us = _time(current, args.number), _time(fast, args.number)
+        print(f"{route:<30}{current_us:>14.1f}us{fast_us:>14.1f}us{current_us / fast_us:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+import hashlib
+import logging
+import os
+import threading
+import uuid
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO, List, Optional
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def sha256_stream(stream: BinaryIO) -> str:
+    """Hash a binary stream in chunks, restoring its position afterwards."""
+    position = stream.tell()
+    digest = hashlib.sha256()
+    while chunk := stream.read(HASH_CHUNK_SIZE):
+        digest.update(chunk)
+    stream.seek(position)
+    return digest.hexdigest()
+
+
+def sha256_file(path: Path) -> str:
+    with open(path, "rb") as f:
+        return sha256_stream(f)
+
+
+def cache_key(*parts: str) -> str:
+    """Derive a cache key from the parts that identify an artifact."""
+    return sha256_bytes("\x1f".join(parts).encode("utf-8"))
+
+
+class DiskCache:
+    """Size-capped cache of blobs on local disk with least-recently-used eviction.
+
+    Recency is tracked through file modification times, so it survives restarts and is
+    shared by every worker process using the same directory.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._size = sum(path.stat().st_size for path in self._entries())
+        logger.info(f"Disk cache at {directory} holds {self._size} bytes (max={max_bytes})")
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def _entries(self) -> List[Path]:
+        return [
+            path
+            for path in self.directory.glob("*/*")
+            if path.is_file() and not path.name.endswith(".tmp")
+        ]
+
+    def get(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return data
+
+    def set(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / f"{key}.{uuid.uuid4().hex}.tmp"
+        tmp_path.write_bytes(data)
+        with self._lock:
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            self._size += len(data) - previous
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Other processes may share the directory, so start from what is actually on disk
+        entries = []
+        for path in self._entries():
+            try:
+                entries.append((path.stat(), path))
+            except FileNotFoundError:
+                continue
+        self._size = sum(stat.st_size for stat, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        evicted = 0
+        for stat, path in sorted(entries, key=lambda entry: entry[0].st_mtime):
+            if self._size <= target:
+                break
+            path.unlink(missing_ok=True)
+            self._size -= stat.st_size
+            evicted += 1
+        logger.info(f"Evicted {evicted} entries from disk cache at {self.directory}")
+
+
+@lru_cache()
+def get_patent_cache() -> DiskCache:
+    return DiskCache(settings.PATENT_CACHE_DIR, settings.PATENT_CACHE_MAX_BYTES)
@@ -5,6 +5,10 @@ from typing import Literal
 from pydantic import Field, computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Top-level package name; "app" unless the backend is loaded under another name
+# (the MCP server's in-process transport)
+_PACKAGE = __package__.rpartition(".")[0]
+
 
 class LLMProviderSettings(BaseSettings):
     """Base settings for LLM providers."""
@@ -65,12 +69,94 @@ class Settings(BaseSettings):
     API_V1_STR: str = "/api/v1"
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
     PROJECT_NAME: str = ""
+    # API routers to mount; the modules (and their dependencies) of the others are never imported
+    ENABLED_ROUTERS: list[
+        Literal["utils", "principles", "parameters", "contradictions", "patents"]
+    ] = ["utils", "principles", "parameters", "contradictions", "patents"]
+    # Load the embedding model, catalog, LLM clients and OCR converter after the port opens
+    # instead of before; /utils/readiness/ reports their progress
+    WARMUP_IN_BACKGROUND: bool = False
+    # Prometheus metrics at /metrics, collected per process (each worker reports its own)
+    METRICS_ENABLED: bool = True
+    # Requests sending this value in the X-Profile header are profiled; unset disables profiling
+    PROFILE_TOKEN: str | None = None
+    PROFILE_DIR: Path = Path("data/profiles")
 
     DEFAULT_MODEL: str = "gpt-4.1-mini"
     DEFAULT_PROVIDER: str = "openai"
 
     EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
 
+    # Token budgeting (context and output windows per model, matched by longest prefix)
+    DEFAULT_CONTEXT_TOKENS: int = 128_000
+    DEFAULT_OUTPUT_TOKENS: int = 8_192
+    MAX_INPUT_TOKENS: int = 32_000
+    MODEL_CONTEXT_TOKENS: dict[str, int] = {
+        "gpt-4.1": 1_047_576,
+        "gpt-4o": 128_000,
+        "gpt-5": 400_000,
+        "claude": 200_000,
+        "llama-3": 131_072,
+    }
+    MODEL_OUTPUT_TOKENS: dict[str, int] = {
+        "gpt-4.1": 32_768,
+        "gpt-4o": 16_384,
+        "gpt-5": 128_000,
+        "claude": 8_192,
+        "llama-3": 8_192,
+    }
+    # Completion cap sent per task; the model's output window above is still reserved in context
+    TASK_MAX_TOKENS: dict[str, int] = {
+        "extract_tc": 4_096,
+        "patent_content": 16_384,
+        "patent_tc": 4_096,
+    }
+    # OpenAI models that reject max_tokens and take the cap as max_completion_tokens
+    MAX_COMPLETION_TOKENS_MODELS: list[str] = ["gpt-5", "o1", "o3", "o4"]
+
+    # Uploads
+    MAX_UPLOAD_BYTES: int = 50 * 1024 * 1024
+
+    # OCR settings
+    OCR_IMAGE_SCALE: float = 2.0
+    OCR_RENDER_PAGES: list[int] = [1]  # rendered at OCR_IMAGE_SCALE; the first is the title page
+    OCR_MAX_PAGES: int | None = None
+    OCR_TEXT_LAYER_FAST_PATH: bool = True  # skip OCR on pages with an embedded text layer
+    OCR_MIN_TEXT_CHARS: int = 100
+    OCR_CONVERTER_POOL_SIZE: int = 1
+    OCR_WARMUP_ON_STARTUP: bool = False
+    OCR_PROCESS_WORKERS: int = 0  # OCR process pool size; 0 runs OCR in the request thread
+    OCR_MAX_QUEUE_DEPTH: int = 8
+    OCR_PAGE_PARALLEL: bool = False  # split large scans into page ranges across the workers
+    OCR_PAGES_PER_TASK: int = 4
+
+    # Rendered page images sent to the vision model (title page) or kept in OCROutput; the
+    # defaults keep full-resolution color PNG, e.g. 1600, "jpeg" and grayscale shrink them
+    PAGE_IMAGE_MAX_EDGE: int | None = None  # downscale the long edge to this many pixels
+    PAGE_IMAGE_FORMAT: Literal["png", "jpeg", "webp"] = "png"
+    PAGE_IMAGE_QUALITY: int = 80  # JPEG and WebP only
+    PAGE_IMAGE_GRAYSCALE: bool = False
+    TITLEPAGE_CROP: bool = False  # crop the title page to its printed area
+    TITLEPAGE_CROP_HEIGHT: float = 1.0  # keep this top fraction of it, e.g. 0.6 to skip drawings
+
+    # Patent artifact cache (OCR output and LLM results, keyed by content hash)
+    PATENT_CACHE_ENABLED: bool = True
+    PATENT_CACHE_DIR: Path = Path("data/cache/patents")
+    PATENT_CACHE_MAX_BYTES: int = 1024 * 1024 * 1024
+
+    # Patent PDF downloads (pooled client; responses revalidated via the patent cache)
+    PATENT_FETCH_MAX_BYTES: int = 50 * 1024 * 1024
+    PATENT_FETCH_TIMEOUT: float = 60.0
+    PATENT_FETCH_CONNECT_TIMEOUT: float = 10.0
+    PATENT_FETCH_MAX_CONNECTIONS: int = 10
+    PATENT_FETCH_MAX_KEEPALIVE_CONNECTIONS: int = 5
+
+    # Patent job queue
+    PATENT_JOBS_DIR: Path = Path("data/jobs")
+    PATENT_JOB_WORKERS: int = 2
+    PATENT_JOB_RETENTION_HOURS: int = 72
+    PATENT_JOB_LEASE_SECONDS: int = 60  # a running job is requeued this long after its worker dies
+
     # LLM Provider settings
     openai: OpenAISettings = OpenAISettings()
     ollama: OllamaSettings = OllamaSettings()
@@ -83,17 +169,22 @@ class Settings(BaseSettings):
     @computed_field
     @property
     def TEMPLATES_DIR(self) -> Path:
-        return Path(pkg_resources.files("app.prompts").joinpath("templates"))
+        return Path(pkg_resources.files(f"{_PACKAGE}.prompts").joinpath("templates"))
 
     @computed_field
     @property
     def PARAMETERS_FILE_PATH(self) -> Path:
-        return Path(pkg_resources.files("app.data").joinpath("parameters.json"))
+        return Path(pkg_resources.files(f"{_PACKAGE}.data").joinpath("parameters.json"))
 
     @computed_field
     @property
     def PRINCIPLES_FILE_PATH(self) -> Path:
-        return Path(pkg_resources.files("app.data").joinpath("principles.json"))
+        return Path(pkg_resources.files(f"{_PACKAGE}.data").joinpath("principles.json"))
+
+    @computed_field
+    @property
+    def MATRIX_FILE_PATH(self) -> Path:
+        return Path(pkg_resources.files(f"{_PACKAGE}.data").joinpath("matrix_values.csv"))
 
 
 settings = Settings()
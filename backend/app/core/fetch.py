@@ -0,0 +1,206 @@
+import asyncio
+import json
+import logging
+import threading
+from functools import lru_cache
+from io import BytesIO
+from pathlib import PurePosixPath
+from typing import TYPE_CHECKING, Any, Coroutine, Optional
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+from .cache import DiskCache, cache_key, get_patent_cache, sha256_bytes
+from .config import settings
+
+if TYPE_CHECKING:
+    import httpx
+    from docling.document_converter import DocumentStream
+
+logger = logging.getLogger(__name__)
+
+
+class FetchError(RuntimeError):
+    """Raised when a patent PDF cannot be downloaded or exceeds PATENT_FETCH_MAX_BYTES."""
+
+
+class FetchedPDF(BaseModel):
+    url: str
+    name: str
+    content: bytes
+    sha256: str
+    # True when the server answered 304 and the cached copy was reused
+    revalidated: bool = False
+
+    def as_stream(self) -> "DocumentStream":
+        from docling.document_converter import DocumentStream
+
+        return DocumentStream(name=self.name, stream=BytesIO(self.content))
+
+
+def is_url(source: object) -> bool:
+    return isinstance(source, str) and source.startswith(("http://", "https://"))
+
+
+def _file_name(url: str) -> str:
+    return PurePosixPath(urlparse(url).path).name or "document.pdf"
+
+
+class PDFFetcher:
+    """Downloads patent PDFs through one pooled async HTTP client.
+
+    The client lives on a dedicated event loop thread, so synchronous callers (routes running
+    in the threadpool, background jobs, the OCR fallback) all share its connection pool.
+    Downloads are stored in the disk cache together with their ETag/Last-Modified validators
+    and revalidated with a conditional GET, so an unchanged PDF costs a 304.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[DiskCache],
+        max_bytes: int,
+        timeout: "httpx.Timeout",
+        limits: "httpx.Limits",
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        self.cache = cache
+        self.max_bytes = max_bytes
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="pdf-fetcher", daemon=True
+        )
+        self._thread.start()
+        self._client = self._run(self._create_client(timeout, limits, transport))
+
+    async def _create_client(
+        self,
+        timeout: "httpx.Timeout",
+        limits: "httpx.Limits",
+        transport: Optional["httpx.AsyncBaseTransport"],
+    ) -> "httpx.AsyncClient":
+        # Imported with the first fetcher; httpx takes a noticeable part of the app import time
+        import httpx
+
+        return httpx.AsyncClient(
+            timeout=timeout, limits=limits, transport=transport, follow_redirects=True
+        )
+
+    def _run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    # ------------------------------------------
+    # Cache entries
+    # ------------------------------------------
+
+    def _load_cached(self, url: str) -> Optional[tuple[dict, bytes]]:
+        if self.cache is None:
+            return None
+        meta = self.cache.get(cache_key("download-meta", url))
+        if meta is None:
+            return None
+        validators = json.loads(meta)
+        # The body may have been evicted independently of its metadata
+        content = self.cache.get(cache_key("download", validators["sha256"]))
+        if content is None:
+            return None
+        return validators, content
+
+    def _store(self, url: str, response: "httpx.Response", content: bytes, sha256: str) -> None:
+        if self.cache is None:
+            return
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        self.cache.set(cache_key("download", sha256), content)
+        validators = {"etag": etag, "last_modified": last_modified, "sha256": sha256}
+        self.cache.set(cache_key("download-meta", url), json.dumps(validators).encode("utf-8"))
+
+    # ------------------------------------------
+    # Download
+    # ------------------------------------------
+
+    async def _fetch(self, url: str) -> FetchedPDF:
+        import httpx
+
+        cached = await asyncio.to_thread(self._load_cached, url)
+        headers = {}
+        if cached is not None:
+            validators, _ = cached
+            if validators["etag"]:
+                headers["If-None-Match"] = validators["etag"]
+            if validators["last_modified"]:
+                headers["If-Modified-Since"] = validators["last_modified"]
+
+        try:
+            async with self._client.stream("GET", url, headers=headers) as response:
+                if response.status_code == httpx.codes.NOT_MODIFIED and cached is not None:
+                    validators, content = cached
+                    logger.info(f"Patent PDF not modified, using cached copy of {url}")
+                    return FetchedPDF(
+                        url=url,
+                        name=_file_name(url),
+                        content=content,
+                        sha256=validators["sha256"],
+                        revalidated=True,
+                    )
+                response.raise_for_status()
+
+                declared = response.headers.get("Content-Length")
+                if declared is not None and int(declared) > self.max_bytes:
+                    raise FetchError(
+                        f"Patent PDF at {url} is {declared} bytes, limit is {self.max_bytes}"
+                    )
+                chunks = []
+                size = 0
+                async for chunk in response.aiter_bytes():
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise FetchError(f"Patent PDF at {url} exceeds {self.max_bytes} bytes")
+                    chunks.append(chunk)
+        except httpx.HTTPError as e:
+            raise FetchError(f"Failed to download patent PDF from {url}: {e}") from e
+
+        content = b"".join(chunks)
+        sha256 = sha256_bytes(content)
+        await asyncio.to_thread(self._store, url, response, content, sha256)
+        logger.info(f"Downloaded {size} bytes from {url}")
+        return FetchedPDF(url=url, name=_file_name(url), content=content, sha256=sha256)
+
+    def fetch(self, url: str) -> FetchedPDF:
+        """Download a PDF, reusing the cached copy when the server reports it unchanged.
+
+        Raises:
+            FetchError: If the request fails or the PDF exceeds max_bytes
+        """
+        return self._run(self._fetch(url))
+
+    def close(self) -> None:
+        self._run(self._client.aclose())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@lru_cache()
+def get_pdf_fetcher() -> PDFFetcher:
+    import httpx
+
+    return PDFFetcher(
+        cache=get_patent_cache() if settings.PATENT_CACHE_ENABLED else None,
+        max_bytes=settings.PATENT_FETCH_MAX_BYTES,
+        timeout=httpx.Timeout(
+            settings.PATENT_FETCH_TIMEOUT, connect=settings.PATENT_FETCH_CONNECT_TIMEOUT
+        ),
+        limits=httpx.Limits(
+            max_connections=settings.PATENT_FETCH_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.PATENT_FETCH_MAX_KEEPALIVE_CONNECTIONS,
+        ),
+    )
+
+
+def close_pdf_fetcher() -> None:
+    if get_pdf_fetcher.cache_info().currsize:
+        logger.info("Closing patent PDF fetcher")
+        get_pdf_fetcher().close()
+        get_pdf_fetcher.cache_clear()
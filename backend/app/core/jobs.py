@@ -0,0 +1,232 @@
+import logging
+import sqlite3
+import threading
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, List, Optional
+
+from ..schemas.jobs import JobStatus, PatentJob
+from ..schemas.patents import PatentDocument
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    source TEXT NOT NULL,
+    input_path TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    error TEXT,
+    result TEXT,
+    owner TEXT,
+    lease_expires_at TEXT,
+    source_hash TEXT
+)
+"""
+
+# Columns added after the first release, created on stores opened by older versions
+_ADDED_COLUMNS = {"owner": "TEXT", "lease_expires_at": "TEXT", "source_hash": "TEXT"}
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobStore:
+    """SQLite-backed persistence for patent jobs.
+
+    A single connection is shared between threads and serialized with a lock; jobs are
+    written a handful of times each, so contention is negligible.
+
+    Several server processes may share one store. A process runs a job only after claiming
+    it, which atomically moves it from queued to running under its owner id with a lease.
+    The owner renews the lease while it works; running jobs whose lease expired (their
+    process died) are put back in the queue.
+    """
+
+    def __init__(self, db_path: Path):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+            for name, column_type in _ADDED_COLUMNS.items():
+                if name not in columns:
+                    self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {column_type}")
+        logger.info(f"Job store opened at {db_path}")
+
+    def _row_to_job(self, row: sqlite3.Row) -> PatentJob:
+        return PatentJob(
+            id=row["id"],
+            status=JobStatus(row["status"]),
+            stage=row["stage"],
+            progress=row["progress"],
+            source=row["source"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+            error=row["error"],
+            result=PatentDocument.model_validate_json(row["result"]) if row["result"] else None,
+        )
+
+    def create(
+        self,
+        job_id: str,
+        source: str,
+        input_path: Optional[Path] = None,
+        source_hash: Optional[str] = None,
+    ) -> PatentJob:
+        now = _now().isoformat()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, stage, progress, source, input_path, source_hash, "
+                "created_at, updated_at) VALUES (?, ?, ?, 0, ?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    JobStatus.QUEUED.value,
+                    "queued",
+                    source,
+                    str(input_path) if input_path else None,
+                    source_hash,
+                    now,
+                    now,
+                ),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> PatentJob:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Job with id {job_id} not found")
+        return self._row_to_job(row)
+
+    def get_input(self, job_id: str) -> tuple[str, Optional[Path], Optional[str]]:
+        """Return the job source, the path of its stored input file and its SHA-256, if any."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT source, input_path, source_hash FROM jobs WHERE id = ?", (job_id,)
+            ).fetchone()
+        if row is None:
+            raise ValueError(f"Job with id {job_id} not found")
+        input_path = Path(row["input_path"]) if row["input_path"] else None
+        return row["source"], input_path, row["source_hash"]
+
+    def update(
+        self,
+        job_id: str,
+        *,
+        status: Optional[JobStatus] = None,
+        stage: Optional[str] = None,
+        progress: Optional[float] = None,
+        error: Optional[str] = None,
+        result: Optional[PatentDocument] = None,
+        owner: Optional[str] = None,
+    ) -> bool:
+        """Update a job; with an owner, only while that owner still holds the job.
+
+        Returns:
+            Whether the job was updated
+        """
+        fields: dict[str, Any] = {"updated_at": _now().isoformat()}
+        if status is not None:
+            fields["status"] = status.value
+        if stage is not None:
+            fields["stage"] = stage
+        if progress is not None:
+            fields["progress"] = progress
+        if error is not None:
+            fields["error"] = error
+        if result is not None:
+            fields["result"] = result.model_dump_json()
+
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        query = f"UPDATE jobs SET {assignments} WHERE id = ?"
+        params = [*fields.values(), job_id]
+        if owner is not None:
+            query += " AND owner = ? AND status = ?"
+            params += [owner, JobStatus.RUNNING.value]
+        with self._lock:
+            return self._conn.execute(query, params).rowcount > 0
+
+    # ------------------------------------------
+    # Claims and leases
+    # ------------------------------------------
+
+    def claim(self, job_id: str, owner: str, lease: timedelta) -> bool:
+        """Take a queued job for the owner; False if another process already took it."""
+        now = _now()
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE jobs SET status = ?, owner = ?, lease_expires_at = ?, updated_at = ? "
+                "WHERE id = ? AND status = ? RETURNING id",
+                (
+                    JobStatus.RUNNING.value,
+                    owner,
+                    (now + lease).isoformat(),
+                    now.isoformat(),
+                    job_id,
+                    JobStatus.QUEUED.value,
+                ),
+            ).fetchone()
+        return row is not None
+
+    def renew_leases(self, owner: str, lease: timedelta) -> None:
+        """Extend the leases of every job the owner is running."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ? WHERE owner = ? AND status = ?",
+                ((_now() + lease).isoformat(), owner, JobStatus.RUNNING.value),
+            )
+
+    def requeue_expired(self) -> List[str]:
+        """Put running jobs whose owner stopped renewing the lease back in the queue.
+
+        Returns:
+            Ids of the requeued jobs
+        """
+        now = _now().isoformat()
+        with self._lock:
+            rows = self._conn.execute(
+                "UPDATE jobs SET status = ?, stage = ?, progress = 0, owner = NULL, "
+                "lease_expires_at = NULL, updated_at = ? "
+                "WHERE status = ? AND (lease_expires_at IS NULL OR lease_expires_at < ?) "
+                "RETURNING id",
+                (JobStatus.QUEUED.value, "queued", now, JobStatus.RUNNING.value, now),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def list_queued(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status = ? ORDER BY created_at",
+                (JobStatus.QUEUED.value,),
+            ).fetchall()
+        return [row["id"] for row in rows]
+
+    def purge(self, retention: timedelta) -> List[Path]:
+        """Delete finished jobs older than the retention period.
+
+        Returns:
+            Input files that belonged to the deleted jobs
+        """
+        cutoff = (_now() - retention).isoformat()
+        finished = (JobStatus.SUCCEEDED.value, JobStatus.FAILED.value, cutoff)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT input_path FROM jobs WHERE status IN (?, ?) AND updated_at < ?", finished
+            ).fetchall()
+            self._conn.execute(
+                "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?", finished
+            )
+        return [Path(row["input_path"]) for row in rows if row["input_path"]]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -1,10 +1,10 @@
 import logging
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Callable, Optional, Protocol, Type
+from typing import TYPE_CHECKING, Any, Callable, Optional, Protocol, Type
 
-import instructor
-from anthropic import Anthropic
-from openai import OpenAI
+from prometheus_client import Counter, Histogram
 from pydantic import BaseModel
 
 from ..utils import (
@@ -16,12 +16,53 @@ from ..utils import (
 )
 from .config import settings
 
+# Provider SDKs are imported when a client is first needed
+if TYPE_CHECKING:
+    from anthropic import Anthropic
+    from openai import OpenAI
+
 logger = logging.getLogger(__name__)
 
 
 type LLMClient = OpenAI | Anthropic
 type CompletionFunc = Callable[[LLMClient, dict], str]
 
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "LLM completion latency, including schema validation retries",
+    ["provider", "operation", "outcome"],
+    buckets=(0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0),
+)
+LLM_RETRIES = Counter(
+    "llm_retries_total",
+    "Structured completions rejected by schema validation, re-asked up to max_retries",
+    ["provider"],
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens reported in the usage of completions",
+    ["provider", "model", "kind"],
+)
+
+
+def _record_usage(provider: str, model: str, usage: Any) -> None:
+    """Count the tokens of an OpenAI (prompt/completion) or Anthropic (input/output) usage."""
+    if usage is None:
+        return
+    prompt = getattr(usage, "prompt_tokens", None) or getattr(usage, "input_tokens", 0)
+    completion = getattr(usage, "completion_tokens", None) or getattr(usage, "output_tokens", 0)
+    LLM_TOKENS.labels(provider, model, "prompt").inc(prompt or 0)
+    LLM_TOKENS.labels(provider, model, "completion").inc(completion or 0)
+
+
+def _output_limit(model: str, provider: str, max_tokens: int | None) -> dict[str, int]:
+    """The completion cap under the parameter the model accepts; nothing when uncapped."""
+    if max_tokens is None:
+        return {}
+    if provider == "openai" and model.startswith(tuple(settings.MAX_COMPLETION_TOKENS_MODELS)):
+        return {"max_completion_tokens": max_tokens}
+    return {"max_tokens": max_tokens}
+
 
 class ChatModelProtocol(Protocol):
     def build_messages(
@@ -41,12 +82,16 @@ class ChatModelProtocol(Protocol):
 # ------------------------------------------------------------------------------
 
 
-def chatter(client: LLMClient) -> CompletionFunc:
+def chatter(client: LLMClient, provider: str) -> CompletionFunc:
+    from anthropic import Anthropic
+    from openai import OpenAI
+
     def get_openai_completion(client: OpenAI, completion_params: dict) -> str:
         try:
             logger.info(f"Calling OpenAI API with model: {completion_params.get('model')}")
             completion = client.chat.completions.create(**completion_params)
             logger.info("OpenAI API call successful")
+            _record_usage(provider, completion_params["model"], completion.usage)
             return completion.choices[0].message.content or ""
         except Exception as e:
             logger.error(f"OpenAI completion failed: {e}")
@@ -64,6 +109,7 @@ def chatter(client: LLMClient) -> CompletionFunc:
             logger.info(f"Calling Anthropic API with model: {params.get('model')}")
             completion = client.messages.create(messages=messages, **params)
             logger.info("Anthropic API call successful")
+            _record_usage(provider, params["model"], completion.usage)
             return completion.content[0].text
         except Exception as e:
             logger.error(f"Anthropic completion failed: {e}")
@@ -83,7 +129,12 @@ def chatter(client: LLMClient) -> CompletionFunc:
 # ------------------------------------------------------------------------------
 
 
+# One client per provider, so that its HTTP connection pool is reused between calls
+@lru_cache()
 def get_client(provider: str) -> LLMClient:
+    from anthropic import Anthropic
+    from openai import OpenAI
+
     provider_settings = getattr(settings, provider)
 
     client_initializers = {
@@ -104,6 +155,13 @@ def get_client(provider: str) -> LLMClient:
     raise ValueError(f"Unsupported LLM provider: {provider}")
 
 
+def warm_up_client(provider: str) -> None:
+    """Import the SDKs used for completions and build the provider's client."""
+    import instructor  # noqa: F401
+
+    get_client(provider)
+
+
 def build_messages(
     provider: str,
     text: str,
@@ -155,12 +213,19 @@ def chat(messages: list[dict], model: str, provider: str, **kwargs) -> str:
         "model": model,
         "temperature": kwargs.get("temperature", provider_settings.temperature),
         "top_p": kwargs.get("top_p", provider_settings.top_p),
-        "max_tokens": kwargs.get("max_tokens", provider_settings.max_tokens),
         "messages": messages,
+        **_output_limit(model, provider, kwargs.get("max_tokens", provider_settings.max_tokens)),
     }
 
-    completion_func = chatter(client)
-    return completion_func(client, completion_params)
+    completion_func = chatter(client, provider)
+    outcome = "error"
+    start = time.perf_counter()
+    try:
+        content = completion_func(client, completion_params)
+        outcome = "ok"
+        return content
+    finally:
+        LLM_LATENCY.labels(provider, "chat", outcome).observe(time.perf_counter() - start)
 
 
 def extract(
@@ -180,10 +245,14 @@ def extract(
         "model": model,
         "temperature": kwargs.get("temperature", provider_settings.temperature),
         "top_p": kwargs.get("top_p", provider_settings.top_p),
-        "max_tokens": kwargs.get("max_tokens", provider_settings.max_tokens),
         "messages": messages,
+        **_output_limit(model, provider, kwargs.get("max_tokens", provider_settings.max_tokens)),
     }
 
+    import instructor
+    from anthropic import Anthropic
+    from openai import OpenAI
+
     if isinstance(client, OpenAI):
         mode = instructor.Mode.TOOLS if provider != "ollama" else instructor.Mode.JSON
         patched_client = instructor.from_openai(client, mode=mode)
@@ -193,7 +262,19 @@ def extract(
         logger.error(f"Unsupported client for patching: {type(client)}")
         raise ValueError(f"Unsupported client for patching: {type(client)}")
 
-    return patched_client.chat.completions.create(response_model=schema, **completion_params)
+    patched_client.on("parse:error", lambda *_: LLM_RETRIES.labels(provider).inc())
+    outcome = "error"
+    start = time.perf_counter()
+    try:
+        result, completion = patched_client.chat.completions.create_with_completion(
+            response_model=schema, **completion_params
+        )
+        outcome = "ok"
+    finally:
+        LLM_LATENCY.labels(provider, "extract", outcome).observe(time.perf_counter() - start)
+    # instructor sums the usage of all attempts into the final completion
+    _record_usage(provider, model, getattr(completion, "usage", None))
+    return result
 
 
 # ------------------------------------------------------------------------------
@@ -0,0 +1,57 @@
+import time
+
+from prometheus_client import Histogram
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# ------------------------------------------
+# Route latency
+# ------------------------------------------
+
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time until the response body is sent, by route template",
+    ["method", "route", "status"],
+)
+
+
+def _route_template(scope: Scope) -> str:
+    """The matched route's path template, e.g. /api/v1/principles/{principle_id}.
+
+    Labelling by template instead of by path keeps the number of series bounded. The route
+    may only know its path below the prefix it was included with, so the prefix is taken
+    from the request path.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    prefix = "/".join(scope["path"].split("/")[: -template.count("/")])
+    return prefix + template
+
+
+class MetricsMiddleware:
+    """Observe the latency and status of every HTTP request in HTTP_LATENCY."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_LATENCY.labels(scope["method"], _route_template(scope), str(status)).observe(
+                time.perf_counter() - start
+            )
@@ -1,29 +1,82 @@
+import json
 import logging
+import threading
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Literal, Optional, Tuple
 
-from docling.datamodel.base_models import InputFormat
-from docling.datamodel.pipeline_options import EasyOcrOptions, PdfPipelineOptions
-from docling.document_converter import DocumentConverter, DocumentStream, PdfFormatOption
-from dotenv import load_dotenv
+from PIL import ImageOps
 from PIL.Image import Image
-from pydantic import BaseModel
+from prometheus_client import Counter, Histogram
+from pydantic import BaseModel, ConfigDict, Field
 
-from ..utils import Base64Image, encode_image
-from .logging import setup_logging
+from ..utils import Base64Image, crop_to_content, encode_image_bytes, to_base64_image
+from .config import settings
+from .fetch import get_pdf_fetcher, is_url
 
-load_dotenv()
-setup_logging()
+if TYPE_CHECKING:
+    # The converter pulls in torch and the layout and OCR models; it is imported on first use
+    from docling.document_converter import DocumentConverter, DocumentStream
 
 logger = logging.getLogger(__name__)
 
+OCR_PAGE_LATENCY = Histogram(
+    "ocr_page_seconds",
+    "OCR conversion time per scanned page, timed per converted page range",
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0),
+)
+OCR_PAGES = Counter(
+    "ocr_pages_total",
+    "Pages extracted, by method: the embedded text layer or OCR",
+    ["method"],
+)
+
+# Bump when a code change alters the OCR output, to invalidate cached results
+OCR_PIPELINE_VERSION = 1
+
+# Called with (pages done, pages total) as the document is processed
+type PageListener = Callable[[int, int], None]
+# (pages, seconds) of one page range, timed around its conversion
+type RangeTiming = Tuple[int, float]
+# Called with the timing of each converted range
+type RangeListener = Callable[[int, float], None]
+# Encoded OCR_RENDER_PAGES: (title page media type, title page, further pages by number)
+type RenderedPages = Tuple[str, bytes, Dict[int, bytes]]
+# A local path, a URL or an uploaded document
+type PDFSource = Path | str | DocumentStream
+
 
 class OCROutput(BaseModel):
+    model_config = ConfigDict(ser_json_bytes="base64", val_json_bytes="base64")
+
     file_name: str
     content: str
-    titlepage: tuple[str, str]  # (media_type, base64_string)
+    # Raw encoded image bytes keep the model compact when sent between processes
+    titlepage_bytes: bytes
+    titlepage_media_type: str = "image/png"
+    # Further pages listed in OCR_RENDER_PAGES, by page number
+    page_images: Dict[int, bytes] = Field(default_factory=dict)
+    # "text" when every page had a usable text layer, "ocr" when none had, else "mixed"
+    extraction_path: Literal["text", "ocr", "mixed"] = "ocr"
+    ocr_pages: List[int] = Field(default_factory=list)
+    # Pages processed and the timing of every OCR'd range, carried back from the workers for
+    # metrics
+    page_count: int = 0
+    ocr_ranges: List[RangeTiming] = Field(default_factory=list)
 
+    @property
+    def titlepage(self) -> Base64Image:
+        return to_base64_image(self.titlepage_media_type, self.titlepage_bytes)
+
+
+def _get_pdf_converter() -> "DocumentConverter":
+    from docling.datamodel.base_models import InputFormat
+    from docling.datamodel.pipeline_options import EasyOcrOptions, PdfPipelineOptions
+    from docling.document_converter import DocumentConverter, PdfFormatOption
 
-def _get_pdf_converter(image_scale: float = 1.5) -> DocumentConverter:
     pipeline_options = PdfPipelineOptions(
         # OCR Options
         do_ocr=True,
@@ -31,9 +84,8 @@ def _get_pdf_converter(image_scale: float = 1.5) -> DocumentConverter:
             lang=["en"],
             force_full_page_ocr=False,
         ),
-        # Image Options
-        images_scale=image_scale,
-        generate_page_images=True,
+        # Image Options (pages we need as images are rendered separately, see render_page_images)
+        generate_page_images=False,
         generate_picture_images=False,
         generate_table_images=False,
         # VLM Options
@@ -49,18 +101,331 @@ def _get_pdf_converter(image_scale: float = 1.5) -> DocumentConverter:
     )
 
 
-def get_pdf_content(source: Path | str | DocumentStream) -> OCROutput:
+class ConverterPool:
+    """A small pool of preloaded converters for a single pipeline configuration.
+
+    Building a converter loads the layout and OCR models, so converters are created lazily
+    (up to ``size``) and reused. Each converter serves one conversion at a time; callers
+    beyond ``size`` wait for a converter to be released.
+    """
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self._idle: List["DocumentConverter"] = []
+        self._created = 0
+        # Signalled when a converter is released or a failed creation frees its slot
+        self._available = threading.Condition()
+
+    def _create(self) -> "DocumentConverter":
+        from docling.datamodel.base_models import InputFormat
+
+        logger.info("Initializing PDF converter")
+        converter = _get_pdf_converter()
+        converter.initialize_pipeline(InputFormat.PDF)
+        logger.info("PDF converter initialized")
+        return converter
+
+    def warm_up(self) -> None:
+        """Preload one converter so the first request does not pay for model loading."""
+        with self.acquire():
+            pass
+
+    def _take(self) -> Optional["DocumentConverter"]:
+        """Take an idle converter, or reserve a slot (None) to create one in."""
+        with self._available:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    return None
+                self._available.wait()
+
+    @contextmanager
+    def acquire(self) -> Iterator["DocumentConverter"]:
+        converter = self._take()
+        if converter is None:
+            try:
+                converter = self._create()
+            except BaseException:
+                # Let a waiter retry the creation instead of waiting for a release
+                with self._available:
+                    self._created -= 1
+                    self._available.notify()
+                raise
+        try:
+            yield converter
+        finally:
+            with self._available:
+                self._idle.append(converter)
+                self._available.notify()
+
+
+@lru_cache()
+def get_converter_pool() -> ConverterPool:
+    return ConverterPool(size=settings.OCR_CONVERTER_POOL_SIZE)
+
+
+def get_ocr_fingerprint() -> str:
+    """Identify the settings that change OCROutput, for use in cache keys."""
+    return json.dumps(
+        {
+            "version": OCR_PIPELINE_VERSION,
+            "image_scale": settings.OCR_IMAGE_SCALE,
+            "render_pages": settings.OCR_RENDER_PAGES,
+            "max_pages": settings.OCR_MAX_PAGES,
+            "text_layer": settings.OCR_TEXT_LAYER_FAST_PATH,
+            "min_text_chars": settings.OCR_MIN_TEXT_CHARS,
+            "image_max_edge": settings.PAGE_IMAGE_MAX_EDGE,
+            "image_format": settings.PAGE_IMAGE_FORMAT,
+            "image_quality": settings.PAGE_IMAGE_QUALITY,
+            "image_grayscale": settings.PAGE_IMAGE_GRAYSCALE,
+            "titlepage_crop": settings.TITLEPAGE_CROP,
+            "titlepage_crop_height": settings.TITLEPAGE_CROP_HEIGHT,
+        },
+        sort_keys=True,
+    )
+
+
+# ------------------------------------------
+# Source handling and page rendering
+# ------------------------------------------
+
+
+def read_pdf_source(source: PDFSource) -> tuple[str, bytes]:
+    """Load the PDF once so that rendering and conversion share the same bytes."""
+    if not isinstance(source, (Path, str)):
+        # Reading a whole BytesIO over bytes hands back those bytes instead of a copy
+        source.stream.seek(0)
+        return source.name, source.stream.read()
+    if is_url(source):
+        return str(source), get_pdf_fetcher().fetch(str(source)).content
+    path = Path(source)
+    return str(source), path.read_bytes()
+
+
+def _has_usable_text(text: str) -> bool:
+    """A text layer is usable when it has enough characters and is not mostly garbage."""
+    stripped = "".join(text.split())
+    if len(stripped) < settings.OCR_MIN_TEXT_CHARS:
+        return False
+    alphanumeric = sum(char.isalnum() for char in stripped)
+    return alphanumeric / len(stripped) >= 0.5
+
+
+def _pdfium_lock() -> "threading.Lock":
+    """The lock docling holds around its own pdfium calls; pdfium is not thread-safe."""
+    # Imported here, like pypdfium2 (which loads numpy), so that importing this module is cheap
+    from docling.utils.locks import pypdfium2_lock
+
+    return pypdfium2_lock
+
+
+def classify_pages(pdf_bytes: bytes) -> Tuple[Dict[int, str], List[int]]:
+    """Split pages into those with an embedded text layer and those that need OCR.
+
+    Returns:
+        Tuple of (text by page number for born-digital pages, page numbers to OCR)
+    """
+    import pypdfium2 as pdfium
+
+    text_pages: Dict[int, str] = {}
+    scanned_pages: List[int] = []
+    with _pdfium_lock():
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            page_count = min(len(pdf), settings.OCR_MAX_PAGES or len(pdf))
+            for page_no in range(1, page_count + 1):
+                if not settings.OCR_TEXT_LAYER_FAST_PATH:
+                    scanned_pages.append(page_no)
+                    continue
+                page = pdf[page_no - 1]
+                textpage = page.get_textpage()
+                text = textpage.get_text_range()
+                textpage.close()
+                page.close()
+                if _has_usable_text(text):
+                    text_pages[page_no] = text.strip()
+                else:
+                    scanned_pages.append(page_no)
+        finally:
+            pdf.close()
+    return text_pages, scanned_pages
+
+
+def page_runs(pages: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted page numbers into contiguous (first, last) ranges."""
+    runs: List[Tuple[int, int]] = []
+    for page_no in pages:
+        if runs and runs[-1][1] == page_no - 1:
+            runs[-1] = (runs[-1][0], page_no)
+        else:
+            runs.append((page_no, page_no))
+    return runs
+
+
+def ocr_page_ranges(
+    name: str,
+    pdf_bytes: bytes,
+    page_ranges: List[Tuple[int, int]],
+    on_range: Optional[RangeListener] = None,
+) -> Dict[int, str]:
+    """Convert page ranges with the OCR pipeline.
+
+    Returns:
+        Markdown by first page number of each range
+    """
+    from docling.document_converter import DocumentStream
+
+    markdown: Dict[int, str] = {}
+    with get_converter_pool().acquire() as converter:
+        for first, last in page_ranges:
+            start = time.perf_counter()
+            conv_res = converter.convert(
+                DocumentStream(name=name, stream=BytesIO(pdf_bytes)), page_range=(first, last)
+            )
+            markdown[first] = conv_res.document.export_to_markdown()
+            if on_range is not None:
+                on_range(last - first + 1, time.perf_counter() - start)
+    return markdown
+
+
+def _render_pages(pdf_bytes: bytes, pages: List[int], scale: float) -> Dict[int, Image]:
+    """Rasterize only the requested (1-based) pages."""
+    import pypdfium2 as pdfium
+
+    images: Dict[int, Image] = {}
+    with _pdfium_lock():
+        pdf = pdfium.PdfDocument(pdf_bytes)
+        try:
+            for page_no in pages:
+                if 1 <= page_no <= len(pdf):
+                    images[page_no] = pdf[page_no - 1].render(scale=scale).to_pil()
+        finally:
+            pdf.close()
+    return images
+
+
+def _encode_page_image(image: Image, is_titlepage: bool) -> Tuple[str, bytes]:
+    """Encode a rendered page, cropped and shrunk as the PAGE_IMAGE_* settings ask.
+
+    By default the page is kept as a full-resolution color PNG. Patent pages are black text on
+    white, so grayscale JPEG/WebP at a bounded resolution keeps them legible at a fraction of
+    that size when the vision calls need to be smaller.
+    """
+    original_size = image.size
+    if is_titlepage and settings.TITLEPAGE_CROP:
+        image = crop_to_content(image)
+        if settings.TITLEPAGE_CROP_HEIGHT < 1.0:
+            height = max(1, int(image.height * settings.TITLEPAGE_CROP_HEIGHT))
+            image = image.crop((0, 0, image.width, height))
+    if settings.PAGE_IMAGE_GRAYSCALE:
+        image = ImageOps.grayscale(image)
+    if settings.PAGE_IMAGE_MAX_EDGE:
+        image.thumbnail((settings.PAGE_IMAGE_MAX_EDGE, settings.PAGE_IMAGE_MAX_EDGE))
+    media_type, data = encode_image_bytes(
+        image, quality=settings.PAGE_IMAGE_QUALITY, format=settings.PAGE_IMAGE_FORMAT
+    )
+    logger.info(
+        f"Encoded page image {original_size[0]}x{original_size[1]} -> "
+        f"{image.width}x{image.height} {media_type}, {len(data)} bytes"
+    )
+    return media_type, data
+
+
+def render_page_images(name: str, pdf_bytes: bytes) -> RenderedPages:
+    """Rasterize and encode the OCR_RENDER_PAGES; the first one that exists is the title page.
+
+    Raises:
+        ValueError: If none of the pages exist
+    """
+    rendered = _render_pages(pdf_bytes, settings.OCR_RENDER_PAGES, settings.OCR_IMAGE_SCALE)
+    if not rendered:
+        raise ValueError(f"None of the pages {settings.OCR_RENDER_PAGES} exist in {name}")
+    title_page_no = next(iter(rendered))
+    encoded = {
+        page_no: _encode_page_image(image, is_titlepage=page_no == title_page_no)
+        for page_no, image in rendered.items()
+    }
+    media_type, titlepage_bytes = encoded.pop(title_page_no)
+    return media_type, titlepage_bytes, {page_no: data for page_no, (_, data) in encoded.items()}
+
+
+def assemble_ocr_output(
+    name: str,
+    text_pages: Dict[int, str],
+    scanned_pages: List[int],
+    ocr_markdown: Dict[int, str],
+    images: RenderedPages,
+    ocr_ranges: List[RangeTiming],
+) -> OCROutput:
+    """Merge text-layer pages, OCR'd ranges and page images into the document's output."""
+    sections = {**text_pages, **ocr_markdown}
+    md_content = "\n\n".join(sections[page_no] for page_no in sorted(sections))
+
+    if not scanned_pages:
+        extraction_path = "text"
+    elif not text_pages:
+        extraction_path = "ocr"
+    else:
+        extraction_path = "mixed"
+
+    media_type, titlepage_bytes, page_images = images
+    logger.info(
+        f"OCR content extraction completed ({extraction_path}, {len(scanned_pages)} OCR pages). "
+        f"Content length: {len(md_content)} characters"
+    )
+    return OCROutput(
+        file_name=name,
+        content=md_content,
+        titlepage_bytes=titlepage_bytes,
+        titlepage_media_type=media_type,
+        page_images=page_images,
+        extraction_path=extraction_path,
+        ocr_pages=scanned_pages,
+        page_count=len(text_pages) + len(scanned_pages),
+        ocr_ranges=ocr_ranges,
+    )
+
+
+def get_pdf_content(source: PDFSource, on_pages: Optional[PageListener] = None) -> OCROutput:
     logger.info(f"Starting PDF content extraction for: {source}")
-    converter: DocumentConverter = _get_pdf_converter(image_scale=2.0)
-    logger.info("PDF converter initialized")
-    name = source if isinstance(source, str) else "external"
+    name, pdf_bytes = read_pdf_source(source)
+
+    # Born-digital pages are read from their text layer; only scanned pages go through OCR.
+    # At most OCR_MAX_PAGES pages are processed and only OCR_RENDER_PAGES are rasterized.
+    text_pages, scanned_pages = classify_pages(pdf_bytes)
+    pages_total = len(text_pages) + len(scanned_pages)
+    pages_done = len(text_pages)
+    if on_pages is not None:
+        on_pages(pages_done, pages_total)
 
-    conv_res = converter.convert(source)
+    ocr_ranges: List[RangeTiming] = []
+
+    def on_range(page_count: int, seconds: float) -> None:
+        nonlocal pages_done
+        ocr_ranges.append((page_count, seconds))
+        pages_done += page_count
+        if on_pages is not None:
+            on_pages(pages_done, pages_total)
+
+    ocr_markdown: Dict[int, str] = {}
+    if scanned_pages:
+        logger.info(f"Running OCR on {len(scanned_pages)} pages without a usable text layer")
+        stream_name = Path(name).name or "document.pdf"
+        ocr_markdown = ocr_page_ranges(stream_name, pdf_bytes, page_runs(scanned_pages), on_range)
     logger.info("PDF conversion completed")
 
-    md_content: str = conv_res.document.export_to_markdown()
-    titlepage_image: Image = list(conv_res.document.pages.values())[0].image.pil_image
-    titlepage: Base64Image = encode_image(titlepage_image)
+    images = render_page_images(name, pdf_bytes)
+    return assemble_ocr_output(name, text_pages, scanned_pages, ocr_markdown, images, ocr_ranges)
+
 
-    logger.info(f"OCR content extraction completed. Content length: {len(md_content)} characters")
-    return OCROutput(file_name=name, content=md_content, titlepage=titlepage)
+def record_ocr_metrics(output: OCROutput) -> None:
+    """Observe a freshly extracted document, in the process that receives the result."""
+    ocr_page_count = len(output.ocr_pages)
+    OCR_PAGES.labels("text").inc(output.page_count - ocr_page_count)
+    OCR_PAGES.labels("ocr").inc(ocr_page_count)
+    # A range is converted in one call, so its pages share the range's time
+    for page_count, seconds in output.ocr_ranges:
+        for _ in range(page_count):
+            OCR_PAGE_LATENCY.observe(seconds / page_count)
@@ -0,0 +1,329 @@
+import logging
+import multiprocessing
+import tempfile
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from multiprocessing.managers import SyncManager
+from pathlib import Path
+from queue import Empty
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import settings
+from .fetch import is_url
+from .logging import setup_logging
+from .ocr import (
+    OCROutput,
+    PageListener,
+    PDFSource,
+    RangeTiming,
+    RenderedPages,
+    assemble_ocr_output,
+    classify_pages,
+    get_converter_pool,
+    get_pdf_content,
+    ocr_page_ranges,
+    page_runs,
+    read_pdf_source,
+    record_ocr_metrics,
+    render_page_images,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class OCRQueueFullError(RuntimeError):
+    """Raised when more OCR jobs are in flight than OCR_MAX_QUEUE_DEPTH allows."""
+
+
+_executor: Optional[ProcessPoolExecutor] = None
+_executor_lock = threading.Lock()
+# Relays page progress out of the workers; only started once a caller asks for progress
+_manager: Optional[SyncManager] = None
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+# Overrides set by configure_ocr_pool
+_workers: Optional[int] = None
+_max_queue_depth: Optional[int] = None
+
+
+# ------------------------------------------
+# Worker process
+# ------------------------------------------
+
+
+def _init_worker() -> None:
+    """Load the converter once per worker process, before any job is accepted."""
+    setup_logging()
+    get_converter_pool().warm_up()
+
+
+def _ping() -> bool:
+    return True
+
+
+def _classify_file(pdf_path: Path) -> Tuple[Dict[int, str], List[int]]:
+    return classify_pages(pdf_path.read_bytes())
+
+
+def _render_file(name: str, pdf_path: Path) -> RenderedPages:
+    return render_page_images(name, pdf_path.read_bytes())
+
+
+def _ocr_file_range(
+    name: str, pdf_path: Path, first: int, last: int
+) -> Tuple[Dict[int, str], List[RangeTiming]]:
+    timings: List[RangeTiming] = []
+    markdown = ocr_page_ranges(
+        name, pdf_path.read_bytes(), [(first, last)], lambda *timing: timings.append(timing)
+    )
+    return markdown, timings
+
+
+class _QueuePageListener:
+    """Picklable page listener that forwards progress to a manager queue."""
+
+    def __init__(self, queue: Any):
+        self.queue = queue
+
+    def __call__(self, pages_done: int, pages_total: int) -> None:
+        self.queue.put((pages_done, pages_total))
+
+
+class _ProgressHighWaterMark:
+    """Page listener that only passes on progress beyond what it already reported.
+
+    A job retried on a restarted pool reports its pages again from the start; those reports
+    are dropped rather than sent twice.
+    """
+
+    def __init__(self, on_pages: PageListener):
+        self.on_pages = on_pages
+        self.reported = -1
+
+    def __call__(self, pages_done: int, pages_total: int) -> None:
+        if pages_done <= self.reported:
+            return
+        self.reported = pages_done
+        self.on_pages(pages_done, pages_total)
+
+
+# ------------------------------------------
+# Executor lifecycle
+# ------------------------------------------
+
+
+def configure_ocr_pool(
+    workers: Optional[int] = None, max_queue_depth: Optional[int] = None
+) -> None:
+    """Size this process's pool and queue instead of OCR_PROCESS_WORKERS / OCR_MAX_QUEUE_DEPTH.
+
+    Must be called before the pool is started; None keeps the setting.
+    """
+    global _workers, _max_queue_depth
+    _workers = workers
+    _max_queue_depth = max_queue_depth
+
+
+def _pool_size() -> int:
+    return settings.OCR_PROCESS_WORKERS if _workers is None else _workers
+
+
+def _queue_depth() -> int:
+    return settings.OCR_MAX_QUEUE_DEPTH if _max_queue_depth is None else _max_queue_depth
+
+
+def _get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info(f"Starting OCR process pool with {_pool_size()} workers")
+            _executor = ProcessPoolExecutor(
+                max_workers=_pool_size(),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        return _executor
+
+
+def _restart_executor(broken: ProcessPoolExecutor) -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is broken:
+            logger.warning("OCR process pool is broken, restarting workers")
+            broken.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+def warm_up_ocr() -> None:
+    """Start the OCR workers (or the in-process converter) ahead of the first request."""
+    if _pool_size() <= 0:
+        get_converter_pool().warm_up()
+        return
+    executor = _get_executor()
+    for future in [executor.submit(_ping) for _ in range(_pool_size())]:
+        future.result()
+
+
+def _get_manager() -> SyncManager:
+    global _manager
+    with _executor_lock:
+        if _manager is None:
+            _manager = multiprocessing.get_context("spawn").Manager()
+        return _manager
+
+
+def shutdown_ocr_pool() -> None:
+    global _executor, _manager
+    with _executor_lock:
+        if _executor is not None:
+            logger.info("Shutting down OCR process pool")
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+        if _manager is not None:
+            _manager.shutdown()
+            _manager = None
+
+
+def _result_with_progress(
+    executor: ProcessPoolExecutor, source: PDFSource, on_pages: PageListener
+) -> OCROutput:
+    """Run a job on the pool, relaying its page progress to on_pages in this thread."""
+    queue = _get_manager().Queue()
+    future: Future = executor.submit(get_pdf_content, source, _QueuePageListener(queue))
+    while not future.done():
+        try:
+            on_pages(*queue.get(timeout=0.2))
+        except Empty:
+            continue
+    while not queue.empty():
+        on_pages(*queue.get_nowait())
+    return future.result()
+
+
+def _split_ranges(
+    page_ranges: List[Tuple[int, int]], pages_per_task: int
+) -> List[Tuple[int, int]]:
+    """Cut page ranges into chunks of at most pages_per_task pages."""
+    chunks: List[Tuple[int, int]] = []
+    for first, last in page_ranges:
+        for start in range(first, last + 1, pages_per_task):
+            chunks.append((start, min(last, start + pages_per_task - 1)))
+    return chunks
+
+
+@contextmanager
+def _worker_file(source: PDFSource) -> Iterator[Tuple[str, Path]]:
+    """A file the workers can read the PDF from, instead of receiving a copy with every task.
+
+    Local files are used as they are; uploads and URLs are written to a temporary file.
+    """
+    if isinstance(source, (Path, str)) and not is_url(source):
+        yield str(source), Path(source)
+        return
+    name, pdf_bytes = read_pdf_source(source)
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+        pdf_file.write(pdf_bytes)
+        pdf_file.flush()
+        yield name, Path(pdf_file.name)
+
+
+def _parallel_pdf_content(
+    executor: ProcessPoolExecutor, source: PDFSource, on_pages: Optional[PageListener]
+) -> OCROutput:
+    """get_pdf_content with its steps spread over the OCR workers as separate tasks.
+
+    Page classification, rendering of the page images and every range of OCR_PAGES_PER_TASK
+    scanned pages run on the workers; this process only merges their results.
+    """
+    with _worker_file(source) as (name, pdf_path):
+        futures: List[Future] = [executor.submit(_render_file, name, pdf_path)]
+        try:
+            text_pages, scanned_pages = executor.submit(_classify_file, pdf_path).result()
+            pages_total = len(text_pages) + len(scanned_pages)
+            pages_done = len(text_pages)
+            if on_pages is not None:
+                on_pages(pages_done, pages_total)
+
+            chunks = _split_ranges(page_runs(scanned_pages), max(1, settings.OCR_PAGES_PER_TASK))
+            logger.info(f"Converting {len(chunks)} page ranges in parallel on the OCR workers")
+            stream_name = Path(name).name or "document.pdf"
+            ranges = [
+                executor.submit(_ocr_file_range, stream_name, pdf_path, first, last)
+                for first, last in chunks
+            ]
+            futures.extend(ranges)
+            ocr_markdown: Dict[int, str] = {}
+            ocr_ranges: List[RangeTiming] = []
+            for future in as_completed(ranges):
+                markdown, timings = future.result()
+                ocr_markdown.update(markdown)
+                ocr_ranges.extend(timings)
+                pages_done += sum(page_count for page_count, _ in timings)
+                if on_pages is not None:
+                    on_pages(pages_done, pages_total)
+            images = futures[0].result()
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+    return assemble_ocr_output(name, text_pages, scanned_pages, ocr_markdown, images, ocr_ranges)
+
+
+def _submit(
+    executor: ProcessPoolExecutor,
+    source: PDFSource,
+    on_pages: Optional[PageListener],
+) -> OCROutput:
+    if settings.OCR_PAGE_PARALLEL:
+        return _parallel_pdf_content(executor, source, on_pages)
+    if on_pages is None:
+        return executor.submit(get_pdf_content, source).result()
+    return _result_with_progress(executor, source, on_pages)
+
+
+# ------------------------------------------
+# Public API
+# ------------------------------------------
+
+
+def run_ocr(source: PDFSource, on_pages: Optional[PageListener] = None) -> OCROutput:
+    """Run get_pdf_content on the OCR process pool.
+
+    Falls back to the calling thread when OCR_PROCESS_WORKERS is 0. With OCR_PAGE_PARALLEL the
+    page classification, the page images and ranges of OCR_PAGES_PER_TASK scanned pages of one
+    document are separate tasks that run concurrently on all workers. A job whose worker crashed
+    is retried once on a freshly started pool. Page progress is passed to on_pages in the
+    calling thread, once per step even when the job is retried.
+
+    Raises:
+        OCRQueueFullError: If OCR_MAX_QUEUE_DEPTH jobs are already queued or running
+    """
+    if _pool_size() <= 0:
+        output = get_pdf_content(source, on_pages)
+        record_ocr_metrics(output)
+        return output
+
+    global _in_flight
+    with _in_flight_lock:
+        if _in_flight >= _queue_depth():
+            raise OCRQueueFullError(f"OCR queue is full ({_queue_depth()} documents in progress)")
+        _in_flight += 1
+
+    if on_pages is not None:
+        on_pages = _ProgressHighWaterMark(on_pages)
+    try:
+        executor = _get_executor()
+        try:
+            output = _submit(executor, source, on_pages)
+        except BrokenProcessPool:
+            _restart_executor(executor)
+            logger.info("Retrying OCR job on the restarted pool")
+            output = _submit(_get_executor(), source, on_pages)
+        # Metrics recorded in the workers would stay there
+        record_ocr_metrics(output)
+        return output
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
@@ -0,0 +1,95 @@
+import contextvars
+import logging
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Called with the stage name right before the stage starts running
+type StageListener = Callable[[str], None]
+# Called with (stage name, result, wall time in seconds) once a stage has finished
+type StageResultListener = Callable[[str, Any, float], None]
+
+
+class Stage:
+    """A pipeline step and the names of the steps whose results it consumes.
+
+    The stage function is called with the dependency results as keyword arguments named
+    after the dependencies.
+    """
+
+    def __init__(self, func: Callable[..., Any], depends_on: Optional[List[str]] = None):
+        self.func = func
+        self.depends_on = depends_on or []
+
+
+def run_stages(
+    stages: Dict[str, Stage],
+    on_start: Optional[StageListener] = None,
+    on_finish: Optional[StageResultListener] = None,
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    """Run a dependency graph of stages, executing independent stages concurrently.
+
+    Args:
+        stages: Stages by name
+        on_start: Optional listener notified when a stage starts
+        on_finish: Optional listener notified with the result of each finished stage
+
+    Returns:
+        Tuple of (results by stage name, wall time in seconds by stage name)
+
+    Raises:
+        ValueError: If a dependency is unknown or the graph has a cycle
+        Exception: The first exception raised by a stage; stages not yet started are cancelled
+    """
+    for name, stage in stages.items():
+        unknown = [dep for dep in stage.depends_on if dep not in stages]
+        if unknown:
+            raise ValueError(f"Stage '{name}' depends on unknown stages: {unknown}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    pending = dict(stages)
+    running: Dict[Future, str] = {}
+
+    def timed(name: str, stage: Stage, kwargs: Dict[str, Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return stage.func(**kwargs)
+        finally:
+            timings[name] = time.perf_counter() - start
+
+    with ThreadPoolExecutor(max_workers=len(stages) or 1, thread_name_prefix="stage") as pool:
+        while pending or running:
+            ready = [
+                name
+                for name, stage in pending.items()
+                if all(dep in results for dep in stage.depends_on)
+            ]
+            if not ready and not running:
+                raise ValueError(f"Stages can never run (cyclic dependencies): {list(pending)}")
+
+            for name in ready:
+                stage = pending.pop(name)
+                if on_start is not None:
+                    on_start(name)
+                kwargs = {dep: results[dep] for dep in stage.depends_on}
+                # Stages run in the caller's context, e.g. its request profile
+                context = contextvars.copy_context()
+                running[pool.submit(context.run, timed, name, stage, kwargs)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    for other in running:
+                        other.cancel()
+                    raise error
+                results[name] = future.result()
+                logger.info(f"Stage '{name}' finished in {timings[name]:.2f}s")
+                if on_finish is not None:
+                    on_finish(name, results[name], timings[name])
+
+    return results, timings
@@ -0,0 +1,201 @@
+import asyncio
+import hmac
+import logging
+import sys
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from types import CodeType
+from typing import Dict, List, Optional, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# sys.monitoring tool slot; 0-2 and 5 are reserved for debuggers, coverage, cProfile and
+# optimizers
+_TOOL_ID = 4
+_events = sys.monitoring.events
+_ENTER_EVENTS = (_events.PY_START, _events.PY_RESUME, _events.PY_THROW)
+_LEAVE_EVENTS = (_events.PY_RETURN, _events.PY_YIELD, _events.PY_UNWIND)
+
+# (thread, task) a frame stack belongs to; tasks of one request may interleave on the loop
+type StackKey = Tuple[int, int]
+
+_session: ContextVar[Optional["ProfileSession"]] = ContextVar("profile_session", default=None)
+_active_sessions = 0
+_active_lock = threading.Lock()
+
+
+def _frame_label(code: CodeType) -> str:
+    return f"{code.co_qualname} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+class ProfileSession:
+    """Deterministic profile of the Python frames that run in one request's context.
+
+    The request's context is copied into the threads that serve it (sync routes, to_thread),
+    so events from other requests, which run without the session in their context, are
+    dropped. Threads and tasks that outlive the request still carry it in their copied
+    context, so the session stops recording once it is closed. The time between two events is
+    charged to the frame stack that was running, which includes the C calls and I/O it waited
+    for; suspended coroutines are not charged.
+    """
+
+    def __init__(self, profile_id: str):
+        self.id = profile_id
+        self.open = True
+        self.stacks: Dict[StackKey, List[CodeType]] = {}
+        self.last: Dict[StackKey, float] = {}
+        # Seconds by (thread, frames...); each thread only touches its own keys
+        self.weights: Dict[Tuple[int | CodeType, ...], float] = defaultdict(float)
+        self.thread_names: Dict[int, str] = {}
+
+    def _advance(self) -> Tuple[StackKey, List[CodeType]]:
+        now = time.perf_counter()
+        try:
+            task = id(asyncio.current_task())
+        except RuntimeError:
+            task = 0
+        thread = threading.get_ident()
+        key = (thread, task)
+        stack = self.stacks.get(key)
+        if stack is None:
+            stack = self.stacks[key] = []
+            self.thread_names[thread] = threading.current_thread().name
+        elif stack:
+            self.weights[(thread, *stack)] += now - self.last[key]
+        self.last[key] = now
+        return key, stack
+
+    def enter(self, code: CodeType) -> None:
+        self._advance()[1].append(code)
+
+    def leave(self, code: CodeType) -> None:
+        # Frames that started before profiling began were never pushed
+        stack = self._advance()[1]
+        if stack and stack[-1] is code:
+            stack.pop()
+
+    def close(self) -> None:
+        self.open = False
+
+    def collapsed(self) -> str:
+        """The profile in the folded format read by flamegraph.pl and speedscope (µs)."""
+        lines = []
+        # A callback that passed the open check just before close() may still add a key
+        for (thread, *codes), seconds in list(self.weights.items()):
+            microseconds = round(seconds * 1e6)
+            if microseconds:
+                frames = [self.thread_names[thread]] + [_frame_label(code) for code in codes]
+                lines.append(f"{';'.join(frames)} {microseconds}")
+        return "\n".join(lines) + "\n"
+
+
+def _on_enter(code: CodeType, offset: int, *args: object) -> None:
+    session = _session.get()
+    if session is not None and session.open:
+        session.enter(code)
+
+
+def _on_leave(code: CodeType, offset: int, *args: object) -> None:
+    session = _session.get()
+    if session is not None and session.open:
+        session.leave(code)
+
+
+def _start_monitoring() -> None:
+    """Turn the events on for the first active session.
+
+    Raises:
+        ValueError: If another tool holds the sys.monitoring slot
+    """
+    global _active_sessions
+    with _active_lock:
+        if _active_sessions == 0:
+            sys.monitoring.use_tool_id(_TOOL_ID, "request-profiler")
+            event_set = 0
+            for event in _ENTER_EVENTS:
+                sys.monitoring.register_callback(_TOOL_ID, event, _on_enter)
+                event_set |= event
+            for event in _LEAVE_EVENTS:
+                sys.monitoring.register_callback(_TOOL_ID, event, _on_leave)
+                event_set |= event
+            sys.monitoring.set_events(_TOOL_ID, event_set)
+        _active_sessions += 1
+
+
+def _stop_monitoring() -> None:
+    """Turn the events off again once the last active session ends."""
+    global _active_sessions
+    with _active_lock:
+        _active_sessions -= 1
+        if _active_sessions == 0:
+            sys.monitoring.set_events(_TOOL_ID, 0)
+            sys.monitoring.free_tool_id(_TOOL_ID)
+
+
+def _write_profile(session: ProfileSession) -> Path:
+    path = settings.PROFILE_DIR / f"{session.id}.collapsed"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(session.collapsed(), encoding="utf-8")
+    return path
+
+
+def _new_profile_id() -> str:
+    return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+class ProfileMiddleware:
+    """Profile requests that send the X-Profile header with the PROFILE_TOKEN value.
+
+    The profile is written to PROFILE_DIR/<id>.collapsed and its id returned in the
+    X-Profile-Id response header. The middleware is only installed when PROFILE_TOKEN is set,
+    and the profiler hooks are only active while a profiled request runs.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.token = (settings.PROFILE_TOKEN or "").encode("utf-8")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = dict(scope["headers"]).get(b"x-profile")
+        if token is None or not hmac.compare_digest(token, self.token):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            _start_monitoring()
+        except ValueError as e:
+            logger.warning(f"Serving {scope['path']} without profiling: {e}")
+            await self.app(scope, receive, send)
+            return
+
+        session = ProfileSession(_new_profile_id())
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [*message.get("headers", []), (b"x-profile-id", session.id.encode())]
+                message = {**message, "headers": headers}
+            await send(message)
+
+        context_token = _session.set(session)
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            session.close()
+            _session.reset(context_token)
+            _stop_monitoring()
+            # Off the event loop; large profiles take a while to fold and write
+            path = await asyncio.to_thread(_write_profile, session)
+            logger.info(f"Profiled {scope['method']} {scope['path']}, written to {path}")
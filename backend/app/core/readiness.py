@@ -0,0 +1,79 @@
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..schemas.health import ComponentState, ComponentStatus, ReadinessReport
+
+logger = logging.getLogger(__name__)
+
+# A component name and the call that loads it
+type WarmUpStep = Tuple[str, Callable[[], object]]
+
+
+class Readiness:
+    """Warm-up state of the components that routes would otherwise load on first use.
+
+    The steps run one after another, in a background thread by default, so that the port
+    opens right away and routes that do not need a component can serve while it loads.
+    """
+
+    def __init__(self):
+        self._components: Dict[str, ComponentStatus] = {}
+        self._lock = threading.Lock()
+
+    def _update(self, name: str, **changes: object) -> None:
+        with self._lock:
+            self._components[name] = self._components[name].model_copy(update=changes)
+
+    def skip(self, name: str) -> None:
+        """Report a component that is loaded on first use instead of at startup."""
+        with self._lock:
+            self._components[name] = ComponentStatus(name=name, state=ComponentState.SKIPPED)
+
+    def state(self, name: str) -> Optional[ComponentState]:
+        with self._lock:
+            component = self._components.get(name)
+        return component.state if component else None
+
+    def warm_up(self, steps: List[WarmUpStep]) -> None:
+        for name, load in steps:
+            self._update(name, state=ComponentState.LOADING)
+            start = time.perf_counter()
+            try:
+                load()
+            except Exception as e:
+                seconds = round(time.perf_counter() - start, 3)
+                logger.error(f"Warm-up of {name} failed after {seconds:.2f}s: {e}")
+                self._update(name, state=ComponentState.FAILED, seconds=seconds, error=str(e))
+            else:
+                seconds = round(time.perf_counter() - start, 3)
+                logger.info(f"Warmed up {name} in {seconds:.2f}s")
+                self._update(name, state=ComponentState.READY, seconds=seconds)
+
+    def start(self, steps: List[WarmUpStep], background: bool) -> None:
+        with self._lock:
+            for name, _ in steps:
+                self._components[name] = ComponentStatus(name=name)
+        if background:
+            threading.Thread(
+                target=self.warm_up, args=(steps,), name="warm-up", daemon=True
+            ).start()
+        else:
+            self.warm_up(steps)
+
+    def report(self) -> ReadinessReport:
+        with self._lock:
+            components = list(self._components.values())
+        return ReadinessReport(
+            ready=all(
+                c.state in (ComponentState.READY, ComponentState.SKIPPED) for c in components
+            ),
+            components=components,
+        )
+
+
+@lru_cache()
+def get_readiness() -> Readiness:
+    return Readiness()
@@ -0,0 +1,219 @@
+import logging
+import math
+import re
+from collections import Counter
+from typing import List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel, Field
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+# Rough average for English technical prose across the supported tokenizers.
+CHARS_PER_TOKEN = 4
+# Overhead added by chat formatting for every message (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+
+type Section = Tuple[Optional[str], str]
+
+_IMAGE_PLACEHOLDER = re.compile(r"<!--\s*image\s*-->", re.IGNORECASE)
+_PAGE_NUMBER_LINE = re.compile(
+    r"^\s*(?:page\s+)?[-–—]?\s*\d{1,4}\s*[-–—]?\s*(?:(?:of|/)\s*\d{1,4})?\s*$", re.IGNORECASE
+)
+_INLINE_WHITESPACE = re.compile(r"[ \t\u00a0\u2000-\u200b]+")
+_BLANK_LINES = re.compile(r"\n{3,}")
+_SUMMARY_HEADING = re.compile(r"^\s*#*\s*(?:BRIEF\s+)?SUMMARY\b.*$", re.IGNORECASE | re.MULTILINE)
+_UPPERCASE_HEADING = re.compile(r"^\s*#*\s*[A-Z][A-Z0-9 ,\-]{5,}\s*$", re.MULTILINE)
+_CLAIMS_HEADING = re.compile(
+    r"^\s*#*\s*(?:CLAIMS|(?:what\s+is|we|i)\s+claim(?:ed)?(?:\s+is)?\s*:?)\s*$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+class TokenBudget(BaseModel):
+    model: str
+    context_tokens: int = Field(..., description="Total context window of the model")
+    output_tokens: int = Field(..., description="Tokens reserved for the completion")
+    input_tokens: int = Field(..., description="Tokens available for the user message")
+    max_tokens: int = Field(..., description="Completion cap to send with the request")
+
+
+class InputTooLongError(ValueError):
+    """Raised when user-provided text does not fit the model's input budget."""
+
+
+class CompactionReport(BaseModel):
+    tokens_before: int
+    tokens_after: int
+    input_tokens: int
+    truncated: List[str] = Field(default_factory=list)
+
+
+# ------------------------------------------
+# Estimation
+# ------------------------------------------
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in a text without loading a tokenizer."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def _lookup(model: str, table: dict[str, int], default: int) -> int:
+    matches = [prefix for prefix in table if model.startswith(prefix)]
+    if not matches:
+        return default
+    return table[max(matches, key=len)]
+
+
+def get_token_budget(
+    model: str,
+    provider: str,
+    system_prompt: str = "",
+    cap_input: bool = True,
+    task: Optional[str] = None,
+) -> TokenBudget:
+    """Resolve context and output budgets for a model.
+
+    The output budget comes from the provider's DEFAULT_MAX_TOKENS when set, otherwise from
+    the per-model table. The input budget is what remains of the context window after the
+    system prompt and the output reservation, capped by MAX_INPUT_TOKENS unless cap_input is
+    off. The completion cap sent with the request is the task's TASK_MAX_TOKENS entry, within
+    the output budget.
+    """
+    provider_settings = getattr(settings, provider)
+    context_tokens = _lookup(model, settings.MODEL_CONTEXT_TOKENS, settings.DEFAULT_CONTEXT_TOKENS)
+    output_tokens = provider_settings.max_tokens or _lookup(
+        model, settings.MODEL_OUTPUT_TOKENS, settings.DEFAULT_OUTPUT_TOKENS
+    )
+    available = (
+        context_tokens
+        - output_tokens
+        - estimate_tokens(system_prompt)
+        - 2 * MESSAGE_OVERHEAD_TOKENS
+    )
+    if cap_input:
+        available = min(available, settings.MAX_INPUT_TOKENS)
+    max_tokens = min(output_tokens, settings.TASK_MAX_TOKENS.get(task or "", output_tokens))
+    return TokenBudget(
+        model=model,
+        context_tokens=context_tokens,
+        output_tokens=output_tokens,
+        input_tokens=max(0, available),
+        max_tokens=max_tokens,
+    )
+
+
+# ------------------------------------------
+# Compaction
+# ------------------------------------------
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces within lines and of blank lines between them."""
+    lines = [_INLINE_WHITESPACE.sub(" ", line).strip() for line in text.splitlines()]
+    return _BLANK_LINES.sub("\n\n", "\n".join(lines)).strip()
+
+
+def strip_ocr_boilerplate(text: str) -> str:
+    """Drop OCR boilerplate: image placeholders, page numbers and running headers/footers
+    repeated across pages. Only meant for OCR output, where such lines carry no content."""
+    text = _IMAGE_PLACEHOLDER.sub("", text)
+    lines = [_INLINE_WHITESPACE.sub(" ", line).strip() for line in text.splitlines()]
+
+    repeated = Counter(line for line in lines if line and len(line) <= 80)
+    boilerplate = {
+        line for line, count in repeated.items() if count >= 3 and not line.startswith("|")
+    }
+
+    kept = [
+        line for line in lines if line not in boilerplate and not _PAGE_NUMBER_LINE.match(line)
+    ]
+    return _BLANK_LINES.sub("\n\n", "\n".join(kept)).strip()
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to fit the token budget, preferring paragraph and sentence boundaries."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    max_chars = max(0, max_tokens * CHARS_PER_TOKEN)
+    cut = text[:max_chars]
+    for separator in ("\n\n", "\n", ". "):
+        boundary = cut.rfind(separator)
+        if boundary >= max_chars // 2:
+            return cut[: boundary + (1 if separator == ". " else 0)].rstrip()
+    return cut.rstrip()
+
+
+def split_description(description: str) -> List[Section]:
+    """Split a patent description into its summary and the remaining description."""
+    match = _SUMMARY_HEADING.search(description)
+    if not match:
+        return [("Description", description)]
+
+    next_heading = _UPPERCASE_HEADING.search(description, match.end())
+    end = next_heading.start() if next_heading else len(description)
+    summary = description[match.end() : end]
+    remainder = description[: match.start()] + description[end:]
+    return [("Summary", summary), ("Description", remainder)]
+
+
+def split_claims(text: str) -> List[Section]:
+    """Split patent text into the description and the claims after it, in document order.
+
+    The claims start at the last claims heading, since the front page may mention them too.
+    """
+    matches = list(_CLAIMS_HEADING.finditer(text))
+    if not matches:
+        return [(None, text)]
+    start = matches[-1]
+    return [("Description", text[: start.start()]), ("Claims", text[start.end() :])]
+
+
+def compact_sections(
+    sections: List[Section], budget: TokenBudget, priority: Sequence[str] = ()
+) -> Tuple[str, CompactionReport]:
+    """Normalize sections and fit them into the input budget, keeping their order.
+
+    Sections whose label is in priority are fitted first, in that order, then the others in
+    the order given. Each one is kept whole while it fits; the first one that does not fit is
+    truncated and every later one is dropped.
+    """
+    tokens_before = sum(estimate_tokens(text) for _, text in sections)
+    remaining = budget.input_tokens
+    truncated: List[str] = []
+    kept: dict[int, str] = {}
+
+    ranked = [i for label in priority for i, section in enumerate(sections) if section[0] == label]
+    ranked += [i for i in range(len(sections)) if i not in ranked]
+    for index in ranked:
+        label, text = sections[index]
+        text = normalize_whitespace(text)
+        if not text:
+            continue
+        prefix = f"{label}: " if label else ""
+        cost = estimate_tokens(prefix + text)
+        if remaining <= estimate_tokens(prefix):
+            truncated.append(label or "text")
+            continue
+        if cost > remaining:
+            text = truncate_to_tokens(text, remaining - estimate_tokens(prefix))
+            truncated.append(label or "text")
+        kept[index] = prefix + text
+        remaining -= estimate_tokens(prefix + text)
+
+    compacted = "\n\n".join(kept[index] for index in sorted(kept))
+    report = CompactionReport(
+        tokens_before=tokens_before,
+        tokens_after=estimate_tokens(compacted),
+        input_tokens=budget.input_tokens,
+        truncated=truncated,
+    )
+    logger.info(
+        f"Input compacted for {budget.model}: {report.tokens_before} -> {report.tokens_after} "
+        f"tokens (budget={budget.input_tokens}, truncated={report.truncated or 'none'})"
+    )
+    return compacted, report
@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Tuple
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Allowance for multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an uploaded file exceeds MAX_UPLOAD_BYTES."""
+
+
+def _too_large(max_bytes: int) -> UploadTooLargeError:
+    return UploadTooLargeError(f"Uploaded file exceeds the limit of {max_bytes} bytes")
+
+
+def copy_upload(file: BinaryIO, destination: BinaryIO, max_bytes: int) -> str:
+    """Copy an upload in fixed-size chunks, enforcing the size limit while hashing it.
+
+    Returns:
+        SHA-256 of the copied content
+
+    Raises:
+        UploadTooLargeError: As soon as more than max_bytes have been read
+    """
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := file.read(UPLOAD_CHUNK_SIZE):
+        size += len(chunk)
+        if size > max_bytes:
+            raise _too_large(max_bytes)
+        digest.update(chunk)
+        destination.write(chunk)
+    return digest.hexdigest()
+
+
+@contextmanager
+def spool_upload(file: BinaryIO, filename: str, max_bytes: int) -> Iterator[Tuple[Path, str]]:
+    """Stream an uploaded PDF to a temporary file the pipeline reads from.
+
+    The upload is read from the start in fixed-size chunks, enforcing the size limit and
+    hashing it on the way, so it is never held in memory as a whole. The file keeps the
+    upload's name and is removed when the block exits.
+
+    Yields:
+        Tuple of (path of the spooled PDF, SHA-256 of the content)
+
+    Raises:
+        UploadTooLargeError: As soon as more than max_bytes have been read
+    """
+    name = Path(filename).name
+    if name in ("", ".", ".."):
+        name = "upload.pdf"
+    file.seek(0)
+    with tempfile.TemporaryDirectory(prefix="upload-") as directory:
+        path = Path(directory) / name
+        with open(path, "wb") as destination:
+            content_hash = copy_upload(file, destination, max_bytes)
+        yield path, content_hash
+
+
+class UploadLimitMiddleware:
+    """Reject request bodies larger than MAX_UPLOAD_BYTES before they are parsed.
+
+    Requests that declare a Content-Length are refused up front; chunked bodies are cut off
+    once the limit is crossed, and whatever response the app made of the aborted body is
+    replaced by the 413.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.max_body_bytes = settings.MAX_UPLOAD_BYTES + MULTIPART_OVERHEAD_BYTES
+
+    async def _reject(self, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 413,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        detail = f'{{"detail":"Request body exceeds {settings.MAX_UPLOAD_BYTES} bytes"}}'
+        await send({"type": "http.response.body", "body": detail.encode("utf-8")})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        content_length = headers.get(b"content-length")
+        if content_length is not None and int(content_length) > self.max_body_bytes:
+            logger.warning(f"Rejecting request body of {int(content_length)} bytes")
+            await self._reject(send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_bytes:
+                    too_large = True
+                    raise _too_large(settings.MAX_UPLOAD_BYTES)
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            # Form parsing wraps the error into a 400; the 413 below replaces that response
+            if too_large and not response_started:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # The app may surface the aborted body as a different error
+            if not too_large:
+                raise
+        if too_large and not response_started:
+            logger.warning("Rejecting chunked request body over the size limit")
+            await self._reject(send)
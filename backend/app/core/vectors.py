@@ -1,21 +1,38 @@
 import logging
+import time
 from functools import lru_cache
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
-import numpy as np
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from prometheus_client import Histogram
 
-from app.core.config import settings
-from app.schemas.parameters import Parameter
-from app.schemas.principles import Principle
-from app.utils import get_parameters, get_principles
+from ..schemas.parameters import Parameter
+from ..schemas.principles import Principle
+from ..utils import get_parameters, get_principles
+from .config import settings
+
+if TYPE_CHECKING:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
 
 logger = logging.getLogger(__name__)
 
+ENCODE_LATENCY = Histogram(
+    "encoder_encode_seconds",
+    "Time of one encoder.encode call",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+ENCODE_BATCH_SIZE = Histogram(
+    "encoder_batch_size",
+    "Texts per encoder.encode call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
 
 @lru_cache()
-def get_encoder() -> SentenceTransformer:
+def get_encoder() -> "SentenceTransformer":
+    # Imported on first use; torch and transformers take seconds to import
+    from sentence_transformers import SentenceTransformer
+
     try:
         encoder = SentenceTransformer(settings.EMBEDDING_MODEL, device="cpu")
         logger.info("Loaded embedding model: %s", settings.EMBEDDING_MODEL)
@@ -30,35 +47,41 @@ class VectorStore:
         self.encoder = get_encoder()
         self.parameters = get_parameters()
         self.principles = get_principles()
-        self.parameter_embeddings = self._compute_embeddings(
-            [p.name for p in self.parameters]
-        )
-        self.principle_embeddings = self._compute_embeddings(
-            [p.name for p in self.principles]
-        )
+        self.parameter_embeddings = self._compute_embeddings([p.name for p in self.parameters])
+        self.principle_embeddings = self._compute_embeddings([p.name for p in self.principles])
         logger.info(
             "Loaded %d parameters and %d principles",
             len(self.parameters),
             len(self.principles),
         )
 
-    def _compute_embeddings(self, texts: List[str]) -> np.ndarray:
-        return self.encoder.encode(texts)
+    def _compute_embeddings(self, texts: List[str]) -> "np.ndarray":
+        start = time.perf_counter()
+        embeddings = self.encoder.encode(texts)
+        ENCODE_LATENCY.observe(time.perf_counter() - start)
+        ENCODE_BATCH_SIZE.observe(len(texts))
+        return embeddings
 
-    def search_parameters(
-        self, query: str, top_k: int = 5
-    ) -> List[Tuple[Parameter, float]]:
-        logger.info(f"Searching parameters with semantic similarity (query='{query}', top_k={top_k})")
-        query_embedding = self.encoder.encode([query])
+    def search_parameters(self, query: str, top_k: int = 5) -> List[Tuple[Parameter, float]]:
+        logger.info(
+            f"Searching parameters with semantic similarity (query='{query}', top_k={top_k})"
+        )
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        query_embedding = self._compute_embeddings([query])
         similarities = cosine_similarity(query_embedding, self.parameter_embeddings)[0]
         top_indices = np.argsort(similarities)[::-1][:top_k]
         return [(self.parameters[i], similarities[i]) for i in top_indices]
 
-    def search_principles(
-        self, query: str, top_k: int = 5
-    ) -> List[Tuple[Principle, float]]:
-        logger.info(f"Searching principles with semantic similarity (query='{query}', top_k={top_k})")
-        query_embedding = self.encoder.encode([query])
+    def search_principles(self, query: str, top_k: int = 5) -> List[Tuple[Principle, float]]:
+        logger.info(
+            f"Searching principles with semantic similarity (query='{query}', top_k={top_k})"
+        )
+        import numpy as np
+        from sklearn.metrics.pairwise import cosine_similarity
+
+        query_embedding = self._compute_embeddings([query])
         similarities = cosine_similarity(query_embedding, self.principle_embeddings)[0]
         top_indices = np.argsort(similarities)[::-1][:top_k]
         return [(self.principles[i], similarities[i]) for i in top_indices]
@@ -0,0 +1,227 @@
+"""Bulk patent ingestion.
+
+Runs the same pipeline as the `/patents/extract-tc/*` routes over a directory of PDFs or a
+manifest of paths and URLs, writing one JSON line per document:
+
+    uv run python -m app.ingest data/patents --output results.jsonl
+
+Completed sources are appended to a checkpoint file, so an interrupted run picks up where it
+stopped when started again with the same output. Failed sources are retried on the next run,
+which replaces their error lines in the output.
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Set
+
+from dotenv import load_dotenv
+
+from .core.config import settings
+from .core.fetch import close_pdf_fetcher, is_url
+from .core.logging import setup_logging
+from .core.ocr_pool import configure_ocr_pool, shutdown_ocr_pool
+from .schemas.patents import PatentDocument
+from .services import patents as patents_service
+
+logger = logging.getLogger(__name__)
+
+PROGRESS_EVERY = 10
+
+
+# ------------------------------------------
+# Inputs and checkpoint
+# ------------------------------------------
+
+
+def discover_sources(input_path: Path) -> List[str]:
+    """List PDFs under a directory, or the entries of a manifest file (one path or URL per line).
+
+    Relative paths in a manifest are resolved against the manifest's directory.
+    """
+    if input_path.is_dir():
+        return [str(path) for path in sorted(input_path.rglob("*.pdf"))]
+
+    sources = []
+    for line in input_path.read_text(encoding="utf-8").splitlines():
+        entry = line.strip()
+        if not entry or entry.startswith("#"):
+            continue
+        sources.append(entry if is_url(entry) else str(input_path.parent / entry))
+    return sources
+
+
+def load_checkpoint(checkpoint_path: Path) -> Set[str]:
+    if not checkpoint_path.exists():
+        return set()
+    return set(checkpoint_path.read_text(encoding="utf-8").splitlines())
+
+
+def drop_failures(output_path: Path, sources: Set[str]) -> None:
+    """Remove the error lines of sources from the output, as they are about to be retried."""
+    if not output_path.exists():
+        return
+    lines = output_path.read_text(encoding="utf-8").splitlines(keepends=True)
+    kept = []
+    for line in lines:
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            kept.append(line)
+            continue
+        if "error" in record and record.get("source") in sources:
+            continue
+        kept.append(line)
+    if len(kept) == len(lines):
+        return
+    tmp_path = output_path.with_name(f"{output_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_text("".join(kept), encoding="utf-8")
+    os.replace(tmp_path, output_path)
+
+
+# ------------------------------------------
+# Throughput report
+# ------------------------------------------
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+def print_report(done: int, failed: int, elapsed: float, timings: Dict[str, List[float]]) -> None:
+    rate = done / elapsed * 60 if elapsed > 0 else 0.0
+    print(f"\nProcessed {done} documents ({failed} failed) in {elapsed:.1f}s: {rate:.2f} docs/min")
+    if not timings:
+        return
+    print(f"{'stage':<16}{'p50':>10}{'p95':>10}{'count':>8}")
+    for stage, values in timings.items():
+        print(
+            f"{stage:<16}{_percentile(values, 0.5):>9.2f}s{_percentile(values, 0.95):>9.2f}s"
+            f"{len(values):>8}"
+        )
+
+
+# ------------------------------------------
+# Ingestion
+# ------------------------------------------
+
+
+def _process(source: str, model: str, provider: str) -> PatentDocument:
+    return patents_service.patent_tc_pipeline(source=source, model=model, provider=provider)
+
+
+def ingest(
+    sources: List[str],
+    output_path: Path,
+    checkpoint_path: Path,
+    model: str,
+    provider: str,
+    concurrency: int,
+) -> None:
+    """Run the patent pipeline over sources, several documents at a time.
+
+    While one document is in OCR (on the OCR process pool) others are in their LLM stages,
+    so OCR workers and provider calls stay busy at the same time.
+    """
+    completed = load_checkpoint(checkpoint_path)
+    pending = [source for source in dict.fromkeys(sources) if source not in completed]
+    drop_failures(output_path, set(pending))
+    logger.info(
+        f"Ingesting {len(pending)} documents ({len(sources) - len(pending)} already done) "
+        f"with concurrency {concurrency}"
+    )
+
+    stage_timings: Dict[str, List[float]] = {}
+    done = failed = 0
+    start = time.perf_counter()
+    executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ingest")
+    try:
+        with (
+            open(output_path, "a", encoding="utf-8") as output,
+            open(checkpoint_path, "a", encoding="utf-8") as checkpoint,
+        ):
+            futures: Dict[Future, str] = {
+                executor.submit(_process, source, model, provider): source for source in pending
+            }
+            for future in as_completed(futures):
+                source = futures[future]
+                try:
+                    document = future.result()
+                except Exception as e:
+                    # Failed sources stay out of the checkpoint and are retried on the next run
+                    logger.error(f"Failed to ingest {source}: {e}")
+                    output.write(json.dumps({"source": source, "error": str(e)}) + "\n")
+                    output.flush()
+                    failed += 1
+                else:
+                    record = {"source": source, "document": document.model_dump(mode="json")}
+                    output.write(json.dumps(record) + "\n")
+                    output.flush()
+                    checkpoint.write(source + "\n")
+                    checkpoint.flush()
+                    for stage, seconds in (document.timings or {}).items():
+                        stage_timings.setdefault(stage, []).append(seconds)
+                done += 1
+                if done % PROGRESS_EVERY == 0:
+                    elapsed = time.perf_counter() - start
+                    logger.info(
+                        f"{done}/{len(pending)} documents, {done / elapsed * 60:.2f} docs/min"
+                    )
+    except KeyboardInterrupt:
+        logger.warning("Interrupted, finished documents are in the checkpoint")
+        raise
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+        print_report(done, failed, time.perf_counter() - start, stage_timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract contradictions from many patent PDFs")
+    parser.add_argument("input", type=Path, help="Directory of PDFs or manifest file")
+    parser.add_argument("--output", type=Path, required=True, help="JSONL file to append to")
+    parser.add_argument(
+        "--checkpoint", type=Path, help="Checkpoint file (default: <output>.checkpoint)"
+    )
+    parser.add_argument("--model", default=settings.DEFAULT_MODEL)
+    parser.add_argument("--provider", default=settings.DEFAULT_PROVIDER)
+    parser.add_argument("--concurrency", type=int, default=4, help="Documents in flight")
+    parser.add_argument(
+        "--ocr-workers",
+        type=int,
+        default=settings.OCR_PROCESS_WORKERS,
+        help="OCR worker processes",
+    )
+    args = parser.parse_args()
+
+    load_dotenv()
+    setup_logging()
+    configure_ocr_pool(
+        workers=args.ocr_workers,
+        # Every document in flight may be waiting for OCR at once
+        max_queue_depth=max(settings.OCR_MAX_QUEUE_DEPTH, args.concurrency),
+    )
+
+    checkpoint_path = args.checkpoint or args.output.with_name(args.output.name + ".checkpoint")
+    try:
+        ingest(
+            discover_sources(args.input),
+            output_path=args.output,
+            checkpoint_path=checkpoint_path,
+            model=args.model,
+            provider=args.provider,
+            concurrency=args.concurrency,
+        )
+    finally:
+        shutdown_ocr_pool()
+        close_pdf_fetcher()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,24 @@
 import logging
 from contextlib import asynccontextmanager
+from typing import List
 
-from fastapi import FastAPI
+from dotenv import load_dotenv
+from fastapi import FastAPI, Response
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from fastapi.routing import APIRoute
 
 from app.api.main import api_router
 
 from .core.config import settings
+from .core.llm import warm_up_client
 from .core.logging import setup_logging
-from .core.vectors import get_vector_store
+from .core.metrics import MetricsMiddleware
+from .core.profiling import ProfileMiddleware
+from .core.readiness import WarmUpStep, get_readiness
+from .core.uploads import UploadLimitMiddleware
 
 PROJECT_NAME = settings.PROJECT_NAME
+load_dotenv()
 setup_logging()
 
 logger = logging.getLogger(__name__)
@@ -21,12 +29,43 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info(f"Starting {settings.PROJECT_NAME}")
     logger.info(f"API version: {settings.API_V1_STR}")
-    logger.info("Initializing vector store and computing embeddings...")
-    get_vector_store()
-    logger.info("Vector store initialized successfully")
+    logger.info(f"Enabled routers: {', '.join(settings.ENABLED_ROUTERS)}")
+    serves_catalog = {"principles", "parameters"} & set(settings.ENABLED_ROUTERS)
+    serves_llm = {"contradictions", "patents"} & set(settings.ENABLED_ROUTERS)
+    serves_patents = "patents" in settings.ENABLED_ROUTERS
+    readiness = get_readiness()
+    # Cheapest first, so that the routes needing only these become usable early
+    steps: List[WarmUpStep] = []
+    if serves_catalog:
+        # Loaded with the catalog routers; the vector store module imports numpy
+        from .api.catalog_json import get_catalog_json
+        from .core.vectors import get_encoder, get_vector_store
+        from .services.principles import get_matrix
+
+        steps += [("matrix", get_matrix), ("catalog", get_catalog_json)]
+    if serves_llm:
+        steps.append(("llm_clients", lambda: warm_up_client(settings.DEFAULT_PROVIDER)))
+    if serves_catalog:
+        steps += [("encoder", get_encoder), ("embeddings", get_vector_store)]
+    if serves_patents:
+        # The patent pipeline (OCR pool, job queue, PDF fetcher) is only loaded when served
+        from .core.fetch import close_pdf_fetcher
+        from .core.ocr_pool import shutdown_ocr_pool, warm_up_ocr
+        from .services.jobs import get_job_manager
+
+        if settings.OCR_WARMUP_ON_STARTUP:
+            steps.append(("ocr_converter", warm_up_ocr))
+        get_job_manager().resume()
+    readiness.start(steps, background=settings.WARMUP_IN_BACKGROUND)
+    if serves_patents and not settings.OCR_WARMUP_ON_STARTUP:
+        readiness.skip("ocr_converter")
     yield
     # Shutdown
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    if serves_patents:
+        get_job_manager().shutdown()
+        shutdown_ocr_pool()
+        close_pdf_fetcher()
 
 
 def custom_generate_unique_id(route: APIRoute) -> str:
@@ -41,9 +80,22 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(UploadLimitMiddleware)
+if settings.PROFILE_TOKEN:
+    app.add_middleware(ProfileMiddleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
 
 @app.get("/", tags=["root"])
 def read_root():
     return "Server is running."
+
+
+if settings.METRICS_ENABLED:
+
+    @app.get("/metrics", include_in_schema=False)
+    def metrics() -> Response:
+        """Prometheus scrape endpoint for the metrics of this process."""
+        return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
@@ -1,12 +1,13 @@
 import logging
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional, cast
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, cast
 
-import frontmatter
-from jinja2 import Environment, FileSystemLoader, StrictUndefined
 from pydantic import BaseModel, Field
 
-from app.core.config import settings
+from ..core.config import settings
+
+if TYPE_CHECKING:
+    from jinja2 import Environment
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +31,8 @@ class PromptModel(TemplateMetadata):
     prompt: str
 
     def compile(self, **kwargs) -> str:
+        from jinja2 import Environment, StrictUndefined
+
         env = Environment(undefined=StrictUndefined, trim_blocks=True, lstrip_blocks=True)
         template = env.from_string(self.prompt)
         content = template.render(**kwargs)
@@ -46,7 +49,10 @@ class TemplateSource(BaseModel):
 # ------------------------------------------
 
 
-def get_env(templates_dir: Optional[Path] = None) -> Environment:
+def get_env(templates_dir: Optional[Path] = None) -> "Environment":
+    # Imported on first use, like frontmatter below; with its YAML parser it slows app startup
+    from jinja2 import Environment, FileSystemLoader, StrictUndefined
+
     if templates_dir is None:
         templates_dir = settings.TEMPLATES_DIR
 
@@ -60,8 +66,10 @@ def get_env(templates_dir: Optional[Path] = None) -> Environment:
     )
 
 
-def load_template_source(template_name: str, env: Environment) -> TemplateSource:
+def load_template_source(template_name: str, env: "Environment") -> TemplateSource:
     """Load and parse a template file with frontmatter metadata."""
+    import frontmatter
+
     logger.info(f"Loading template: {template_name}")
     try:
         if env.loader is None:
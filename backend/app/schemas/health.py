@@ -0,0 +1,25 @@
+from enum import Enum
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ComponentState(str, Enum):
+    PENDING = "pending"
+    LOADING = "loading"
+    READY = "ready"
+    FAILED = "failed"
+    # Not warmed up at startup; loaded by the first request that needs it
+    SKIPPED = "skipped"
+
+
+class ComponentStatus(BaseModel):
+    name: str = Field(..., description="Component warmed up at startup")
+    state: ComponentState = Field(ComponentState.PENDING, description="Warm-up state")
+    seconds: Optional[float] = Field(None, description="Warm-up duration once finished")
+    error: Optional[str] = Field(None, description="Error message if the warm-up failed")
+
+
+class ReadinessReport(BaseModel):
+    ready: bool = Field(..., description="Whether every warmed-up component is ready")
+    components: List[ComponentStatus] = Field(..., description="Components in warm-up order")
@@ -0,0 +1,25 @@
+from datetime import datetime
+from enum import Enum
+
+from pydantic import BaseModel, Field
+
+from .patents import PatentDocument
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+
+class PatentJob(BaseModel):
+    id: str = Field(..., description="Unique job identifier")
+    status: JobStatus = Field(..., description="Lifecycle state of the job")
+    stage: str = Field(..., description="Pipeline stage currently running or last completed")
+    progress: float = Field(0.0, description="Approximate completion (0.0 to 1.0)")
+    source: str = Field(..., description="Uploaded file name or patent URL")
+    created_at: datetime
+    updated_at: datetime
+    error: str | None = Field(None, description="Error message for failed jobs")
+    result: PatentDocument | None = Field(None, description="Pipeline result once succeeded")
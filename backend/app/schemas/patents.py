@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List, Literal
 
 from pydantic import BaseModel, Field
 
@@ -33,7 +33,18 @@ class PatentDocument(BaseModel):
     meta: PatentMeta = Field(..., description="Metadata of the patent document")
     content: PatentContent = Field(..., description="Content of the patent document")
     contradictions: List[PatentContradiction] | None = None
+    timings: Dict[str, float] | None = Field(
+        None, description="Wall time of each pipeline stage in seconds"
+    )
 
 
 class PatentUrlRequest(BaseModel):
     url: str = Field(..., description="URL to the patent PDF document")
+
+
+class PatentPipelineEvent(BaseModel):
+    event: Literal["stage_started", "stage_finished", "ocr_progress", "result", "error"]
+    stage: str | None = Field(None, description="Pipeline stage the event belongs to")
+    elapsed: float = Field(..., description="Seconds since the pipeline started")
+    duration: float | None = Field(None, description="Wall time of a finished stage in seconds")
+    data: Any = Field(None, description="Partial result, OCR progress or the final document")
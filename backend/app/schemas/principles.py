@@ -19,3 +19,10 @@ class ScoredPrinciple(BaseModel):
 
 class Principles(BaseModel):
     principles: List[Principle]
+
+
+class ContradictionMatrix(BaseModel):
+    cells: List[List[List[int]]] = Field(
+        ...,
+        description="Principle IDs for improving parameter i+1 (row) and preserving j+1 (column)",
+    )
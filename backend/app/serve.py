@@ -0,0 +1,192 @@
+"""Multi-worker server that loads the models once and forks workers that share them.
+
+    uv run python -m app.serve --workers 4
+
+`uvicorn --workers N` spawns N fresh interpreters, and each one loads the embedding model and
+computes the catalog embeddings again in its lifespan. Here the parent process loads the
+vector store and the pre-serialized catalog, then forks the workers. Their model weights,
+embeddings and catalog data stay shared copy-on-write pages instead of N private copies, and
+startup does the work once.
+
+The parent computes the embeddings with torch on a single thread. Torch's CPU ops run on a GNU
+OpenMP thread pool, and a child forked from a process whose pool has started hangs in its
+first parallel op, since the pool's threads do not exist in the child. With one thread the
+pool is never started, and each worker starts its own on its first request.
+
+Each worker still runs the app lifespan (OCR pool, jobs, PDF fetcher), which finds the
+vector store already loaded. Workers that exit unexpectedly are forked again from the parent,
+after a growing delay when they keep failing soon after they start. After MAX_FAST_FAILURES
+such failures in a row (e.g. a lifespan that cannot start) the server stops with an error.
+"""
+
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+import uvicorn
+
+from .core.logging import setup_logging
+
+logger = logging.getLogger(__name__)
+
+# Exit status of a worker whose server did not start, as uvicorn uses it
+STARTUP_FAILURE = 3
+# A worker that exits within MIN_UPTIME_SECONDS counts as a fast failure; restarts after fast
+# failures wait RESTART_BACKOFF_SECONDS, doubled per failure up to MAX_RESTART_BACKOFF_SECONDS
+MIN_UPTIME_SECONDS = 10.0
+RESTART_BACKOFF_SECONDS = 1.0
+MAX_RESTART_BACKOFF_SECONDS = 30.0
+MAX_FAST_FAILURES = 5
+
+
+@contextmanager
+def torch_single_threaded() -> Iterator[None]:
+    """Run torch CPU ops on the calling thread only, so forking afterwards stays safe."""
+    import torch
+
+    threads = torch.get_num_threads()
+    torch.set_num_threads(1)
+    try:
+        yield
+    finally:
+        # Only sets the thread count; the pool starts on the next parallel op
+        torch.set_num_threads(threads)
+
+
+def preload() -> None:
+    """Load everything the workers can share read-only."""
+    from .api.catalog_json import get_catalog_json
+    from .core.config import settings
+    from .core.vectors import get_vector_store
+
+    if {"principles", "parameters"} & set(settings.ENABLED_ROUTERS):
+        with torch_single_threaded():
+            get_vector_store()
+        get_catalog_json()
+
+
+def _run_worker(config: uvicorn.Config, sock: socket.socket) -> None:
+    # The parent's handlers only forward signals; uvicorn installs its own for the worker
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    status = 1
+    try:
+        server = uvicorn.Server(config)
+        server.run(sockets=[sock])
+        status = 0 if server.started else STARTUP_FAILURE
+    except SystemExit as e:
+        # uvicorn exits with STARTUP_FAILURE itself when the lifespan fails
+        status = e.code if isinstance(e.code, int) else 1
+    except BaseException:
+        logger.exception(f"Worker {os.getpid()} crashed")
+    finally:
+        # Never return into the parent's code in the forked child
+        os._exit(status)
+
+
+def _fork_worker(config: uvicorn.Config, sock: socket.socket) -> int:
+    pid = os.fork()
+    if pid == 0:
+        _run_worker(config, sock)
+    logger.info(f"Started worker {pid}")
+    return pid
+
+
+def serve(host: str, port: int, workers: int) -> int:
+    """Run the workers until the server is stopped.
+
+    Returns:
+        Exit status for the server: 0 when stopped by a signal, 1 when workers kept failing
+    """
+    # HF tokenizers disable their thread pool after a fork anyway; this avoids the warning
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+
+    from .main import app
+
+    logger.info("Preloading embedding model and catalog before forking workers")
+    preload()
+
+    config = uvicorn.Config(app, host=host, port=port)
+    sock = config.bind_socket()
+    # Keep the garbage collector from writing to (and so un-sharing) the preloaded objects
+    gc.collect()
+    gc.freeze()
+
+    # Start time of each worker, to tell fast failures from workers that ran for a while
+    children: Dict[int, float] = {}
+    for _ in range(workers):
+        children[_fork_worker(config, sock)] = time.monotonic()
+    stopping = threading.Event()
+    fast_failures = 0
+    exit_status = 0
+
+    def stop(signum: int, frame: object) -> None:
+        stopping.set()
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        if pid not in children:
+            continue
+        uptime = time.monotonic() - children.pop(pid)
+        if stopping.is_set():
+            continue
+
+        exit_code = os.waitstatus_to_exitcode(status)
+        fast_failures = fast_failures + 1 if uptime < MIN_UPTIME_SECONDS else 0
+        reason = "did not start" if exit_code == STARTUP_FAILURE else f"exited with {exit_code}"
+        if fast_failures >= MAX_FAST_FAILURES:
+            logger.error(f"Worker {pid} {reason}; {fast_failures} fast failures, stopping")
+            exit_status = 1
+            stop(signal.SIGTERM, None)
+            continue
+
+        delay = 0.0
+        if fast_failures:
+            delay = min(
+                RESTART_BACKOFF_SECONDS * 2 ** (fast_failures - 1), MAX_RESTART_BACKOFF_SECONDS
+            )
+        logger.warning(f"Worker {pid} {reason} after {uptime:.1f}s, restarting in {delay:.1f}s")
+        # Returns early when the server is stopped while waiting
+        if not stopping.wait(delay):
+            children[_fork_worker(config, sock)] = time.monotonic()
+
+    sock.close()
+    logger.info("All workers stopped")
+    return exit_status
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the API with preloaded, shared models")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    if not hasattr(os, "fork"):
+        sys.exit("app.serve needs os.fork; use uvicorn --workers on this platform")
+
+    setup_logging()
+    sys.exit(serve(args.host, args.port, args.workers))
+
+
+if __name__ == "__main__":
+    main()
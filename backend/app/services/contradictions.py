@@ -1,29 +1,40 @@
 import logging
 
-from dotenv import load_dotenv
-
-from app.core.llm import build_messages, extract
-from app.prompts import get_prompt
-from app.schemas.contradictions import TCModels, TContradictions, TechnicalContradiction
+from ..core.llm import build_messages, extract
+from ..core.tokens import InputTooLongError, compact_sections, get_token_budget
+from ..prompts import get_prompt
+from ..schemas.contradictions import TCModels, TContradictions, TechnicalContradiction
 
 logger = logging.getLogger(__name__)
 
-load_dotenv()
-
 
 def extract_tc(text: str, model: str, provider: str) -> TContradictions:
-    """Extract technical contradictions from text description with full TRIZ analysis."""
+    """Extract technical contradictions from text description with full TRIZ analysis.
+
+    Raises:
+        InputTooLongError: If the text does not fit the input budget once whitespace is
+            normalized; the user's text is never cut silently
+    """
     prompt = get_prompt("extract_tc_from_text")
+    system_prompt = prompt.compile()
+    budget = get_token_budget(model, provider, system_prompt, task="extract_tc")
+    text, report = compact_sections([(None, text)], budget)
+    if report.truncated:
+        raise InputTooLongError(
+            f"Text is about {report.tokens_before} tokens, "
+            f"the limit for {model} is {budget.input_tokens}"
+        )
     messages = build_messages(
         provider=provider,
         text=text,
-        system_prompt=prompt.compile(),
+        system_prompt=system_prompt,
     )
     result: TCModels = extract(
         messages,
         TCModels,
         model=model,
         provider=provider,
+        max_tokens=budget.max_tokens,
     )
 
     technical_contradictions = []
@@ -0,0 +1,202 @@
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import BinaryIO
+
+from ..core.config import settings
+from ..core.jobs import JobStore
+from ..core.uploads import copy_upload
+from ..schemas.jobs import JobStatus, PatentJob
+from . import patents as patents_service
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs past their retention are deleted this often by each process
+PURGE_INTERVAL_SECONDS = 600.0
+
+
+class JobLeaseLostError(RuntimeError):
+    """Raised in a running job once another process has taken it over."""
+
+
+class PatentJobManager:
+    """Runs patent pipelines in the background and tracks them in the job store.
+
+    Uploaded files are copied into the jobs directory so that queued and interrupted jobs
+    can be resumed after a restart. Server workers share the store: each job is claimed by
+    one process, whose lease is renewed in the background, and jobs of a process that died
+    are requeued once their lease expires.
+    """
+
+    def __init__(self, jobs_dir: Path, workers: int, retention: timedelta, lease: timedelta):
+        self.jobs_dir = jobs_dir
+        self.uploads_dir = jobs_dir / "uploads"
+        self.uploads_dir.mkdir(parents=True, exist_ok=True)
+        self.retention = retention
+        self.lease = lease
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.store = JobStore(jobs_dir / "jobs.sqlite")
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="patent-job")
+        self._stopped = threading.Event()
+        # Jobs waiting in or running on this process's executor
+        self._pending: set[str] = set()
+        self._pending_lock = threading.Lock()
+        self._lease_thread: threading.Thread | None = None
+
+    # ------------------------------------------
+    # Submission
+    # ------------------------------------------
+
+    def submit_upload(self, file: BinaryIO, filename: str) -> PatentJob:
+        job_id = str(uuid.uuid4())
+        input_path = self.uploads_dir / f"{job_id}.pdf"
+        try:
+            with open(input_path, "wb") as f:
+                content_hash = copy_upload(file, f, settings.MAX_UPLOAD_BYTES)
+        except Exception:
+            input_path.unlink(missing_ok=True)
+            raise
+        return self._submit(
+            job_id, source=filename, input_path=input_path, source_hash=content_hash
+        )
+
+    def submit_url(self, url: str) -> PatentJob:
+        return self._submit(str(uuid.uuid4()), source=url)
+
+    def _submit(
+        self,
+        job_id: str,
+        source: str,
+        input_path: Path | None = None,
+        source_hash: str | None = None,
+    ) -> PatentJob:
+        job = self.store.create(
+            job_id, source=source, input_path=input_path, source_hash=source_hash
+        )
+        self._enqueue(job_id)
+        logger.info(f"Queued patent job {job_id} for {source}")
+        return job
+
+    def get(self, job_id: str) -> PatentJob:
+        return self.store.get(job_id)
+
+    # ------------------------------------------
+    # Execution
+    # ------------------------------------------
+
+    def _enqueue(self, job_id: str) -> None:
+        with self._pending_lock:
+            if job_id in self._pending:
+                return
+            self._pending.add(job_id)
+        self._executor.submit(self._run, job_id)
+
+    def _run(self, job_id: str) -> None:
+        try:
+            self._run_claimed(job_id)
+        finally:
+            with self._pending_lock:
+                self._pending.discard(job_id)
+
+    def _run_claimed(self, job_id: str) -> None:
+        if not self.store.claim(job_id, self.owner, self.lease):
+            logger.info(f"Patent job {job_id} was already taken by another worker")
+            return
+        source, input_path, source_hash = self.store.get_input(job_id)
+
+        def on_stage(stage: str, progress: float) -> None:
+            if not self.store.update(job_id, stage=stage, progress=progress, owner=self.owner):
+                raise JobLeaseLostError(f"Patent job {job_id} was taken over by another worker")
+
+        try:
+            result = patents_service.patent_tc_pipeline(
+                source=input_path or source,
+                model=settings.DEFAULT_MODEL,
+                provider=settings.DEFAULT_PROVIDER,
+                on_stage=on_stage,
+                source_hash=source_hash,
+            )
+            finished = self.store.update(
+                job_id,
+                status=JobStatus.SUCCEEDED,
+                stage="done",
+                progress=1.0,
+                result=result,
+                owner=self.owner,
+            )
+        except JobLeaseLostError as e:
+            # The new owner runs the job and cleans up its input file
+            logger.warning(str(e))
+            return
+        except Exception as e:
+            logger.error(f"Patent job {job_id} failed: {str(e)}")
+            finished = self.store.update(
+                job_id, status=JobStatus.FAILED, error=str(e), owner=self.owner
+            )
+        else:
+            if finished:
+                logger.info(f"Patent job {job_id} succeeded")
+        if not finished:
+            logger.warning(f"Patent job {job_id} was taken over before it finished here")
+        elif input_path is not None:
+            input_path.unlink(missing_ok=True)
+
+    def resume(self) -> None:
+        """Pick up queued jobs and those whose worker died, then keep our leases alive.
+
+        The same background thread deletes expired jobs every PURGE_INTERVAL_SECONDS.
+        """
+        self.purge_expired()
+        self._requeue_and_submit()
+        if self._lease_thread is None:
+            self._lease_thread = threading.Thread(
+                target=self._maintain_leases, name="patent-job-leases", daemon=True
+            )
+            self._lease_thread.start()
+
+    def _requeue_and_submit(self) -> None:
+        requeued = self.store.requeue_expired()
+        if requeued:
+            logger.info(f"Requeued {len(requeued)} patent jobs whose worker stopped")
+        # Claims are atomic, so a job queued by several workers still runs only once
+        for job_id in self.store.list_queued():
+            self._enqueue(job_id)
+
+    def _maintain_leases(self) -> None:
+        interval = self.lease.total_seconds() / 3
+        last_purge = time.monotonic()
+        while not self._stopped.wait(interval):
+            try:
+                self.store.renew_leases(self.owner, self.lease)
+                self._requeue_and_submit()
+                if time.monotonic() - last_purge >= PURGE_INTERVAL_SECONDS:
+                    last_purge = time.monotonic()
+                    self.purge_expired()
+            except Exception as e:
+                logger.error(f"Patent job lease maintenance failed: {e}")
+
+    def purge_expired(self) -> None:
+        for input_path in self.store.purge(self.retention):
+            input_path.unlink(missing_ok=True)
+
+    def shutdown(self) -> None:
+        # Running jobs stay marked as running and are requeued once their lease expires
+        self._stopped.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+@lru_cache()
+def get_job_manager() -> PatentJobManager:
+    return PatentJobManager(
+        jobs_dir=settings.PATENT_JOBS_DIR,
+        workers=settings.PATENT_JOB_WORKERS,
+        retention=timedelta(hours=settings.PATENT_JOB_RETENTION_HOURS),
+        lease=timedelta(seconds=settings.PATENT_JOB_LEASE_SECONDS),
+    )
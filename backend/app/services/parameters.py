@@ -1,13 +1,13 @@
 from typing import List, Tuple
 
-from app.core.vectors import get_vector_store
-from app.schemas.parameters import Parameter
+from ..core.vectors import get_vector_store
+from ..schemas.parameters import Parameter
+from ..utils import get_parameters
 
 
 def get_all_parameters() -> List[Parameter]:
     """Get all TRIZ parameters."""
-    vector_store = get_vector_store()
-    return vector_store.parameters
+    return get_parameters()
 
 
 def search_parameters(query: str, top_k: int = 5) -> List[Tuple[Parameter, float]]:
@@ -18,8 +18,7 @@ def search_parameters(query: str, top_k: int = 5) -> List[Tuple[Parameter, float
 
 def get_parameter_by_id(parameter_id: int) -> Parameter:
     """Get a specific TRIZ parameter by ID."""
-    vector_store = get_vector_store()
-    parameter = next((p for p in vector_store.parameters if p.id == parameter_id), None)
+    parameter = next((p for p in get_parameters() if p.id == parameter_id), None)
     if not parameter:
         raise ValueError(f"Parameter with id {parameter_id} not found")
-    return parameter
\ No newline at end of file
+    return parameter
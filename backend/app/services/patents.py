@@ -1,33 +1,159 @@
 import logging
+import time
 from pathlib import Path
-from typing import List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from dotenv import load_dotenv
+from prometheus_client import Counter
+from pydantic import TypeAdapter
 
+from ..core.cache import cache_key, get_patent_cache, sha256_bytes, sha256_file, sha256_stream
 from ..core.config import settings
+from ..core.fetch import FetchedPDF, get_pdf_fetcher, is_url
 from ..core.llm import build_messages, extract
-from ..core.logging import setup_logging
-from ..core.ocr import DocumentStream, OCROutput, get_pdf_content
+from ..core.ocr import OCROutput, PageListener, PDFSource, get_ocr_fingerprint
+from ..core.ocr_pool import run_ocr
+from ..core.pipeline import Stage, run_stages
+from ..core.tokens import (
+    compact_sections,
+    get_token_budget,
+    split_claims,
+    split_description,
+    strip_ocr_boilerplate,
+)
 from ..prompts.prompt_manager import get_prompt
 from ..schemas.patents import (
     PatentContent,
     PatentContradiction,
     PatentDocument,
     PatentMeta,
+    PatentPipelineEvent,
 )
 from ..utils import Base64Image
 
-load_dotenv()
-setup_logging()
-
 logger = logging.getLogger(__name__)
-type PatentInput = Path | str | DocumentStream
+
+type PatentInput = PDFSource
+# Called with (stage, progress) when a pipeline stage starts
+type StageCallback = Callable[[str, float], None]
+# Called with every progress event of a pipeline run, see PatentPipelineEvent
+type PipelineListener = Callable[[PatentPipelineEvent], None]
+
+PATENT_CACHE_LOOKUPS = Counter(
+    "patent_cache_lookups_total",
+    "Patent artifact cache lookups by layer and result (hit or miss)",
+    ["layer", "result"],
+)
+
+_OCR_ADAPTER = TypeAdapter(OCROutput)
+_META_ADAPTER = TypeAdapter(PatentMeta)
+_CONTENT_ADAPTER = TypeAdapter(PatentContent)
+_CONTRADICTIONS_ADAPTER = TypeAdapter(List[PatentContradiction])
+
+PIPELINE_STAGES: dict[str, float] = {
+    "fetch": 0.0,
+    "ocr": 0.05,
+    "metadata": 0.5,
+    "content": 0.5,
+    "contradictions": 0.8,
+}
 
 # ------------------------------------------
 # Helper functions
 # ------------------------------------------
 
 
+def _report_stage(on_stage: Optional[StageCallback], stage: str) -> None:
+    if on_stage is not None:
+        on_stage(stage, PIPELINE_STAGES[stage])
+
+
+def _stage_summary(result: Any) -> Any:
+    """Partial result sent with a stage_finished event, without bulky image data."""
+    if isinstance(result, FetchedPDF):
+        return {"bytes": len(result.content), "revalidated": result.revalidated}
+    if isinstance(result, OCROutput):
+        return {
+            "extraction_path": result.extraction_path,
+            "ocr_pages": result.ocr_pages,
+            "characters": len(result.content),
+            # Encoded size of what the metadata stage sends to the vision model
+            "titlepage_bytes": len(result.titlepage_bytes),
+            "titlepage_media_type": result.titlepage_media_type,
+        }
+    if isinstance(result, list):
+        return [item.model_dump(mode="json") for item in result]
+    return result.model_dump(mode="json")
+
+
+class _EventEmitter:
+    """Turns pipeline callbacks into PatentPipelineEvents timed from the start of the run."""
+
+    def __init__(self, listener: PipelineListener):
+        self.listener = listener
+        self.start = time.perf_counter()
+
+    def emit(
+        self,
+        event: str,
+        stage: Optional[str] = None,
+        duration: Optional[float] = None,
+        data: Any = None,
+    ) -> None:
+        self.listener(
+            PatentPipelineEvent(
+                event=event,
+                stage=stage,
+                elapsed=time.perf_counter() - self.start,
+                duration=duration,
+                data=data,
+            )
+        )
+
+    def on_pages(self, pages_done: int, pages_total: int) -> None:
+        progress = {"pages_done": pages_done, "pages_total": pages_total}
+        self.emit("ocr_progress", "ocr", data=progress)
+
+
+# ------------------------------------------
+# Artifact cache
+# ------------------------------------------
+
+
+def _source_fingerprint(source: PatentInput) -> str:
+    """Identify the PDF behind a local source by the SHA-256 of its bytes."""
+    if not isinstance(source, (Path, str)):
+        return sha256_stream(source.stream)
+    return sha256_file(Path(source))
+
+
+def _prompt_key(name: str) -> str:
+    return f"{name}:v{get_prompt(name).version}"
+
+
+def _cached[T](
+    layer: str, key: Optional[str], adapter: TypeAdapter[T], compute: Callable[[], T]
+) -> T:
+    """Return a cached artifact for the layer, computing and storing it on a miss."""
+    if not settings.PATENT_CACHE_ENABLED or key is None:
+        return compute()
+    cache = get_patent_cache()
+    entry_key = cache_key(layer, key)
+    data = cache.get(entry_key)
+    if data is not None:
+        logger.info(f"Patent cache hit for {layer}")
+        PATENT_CACHE_LOOKUPS.labels(layer, "hit").inc()
+        return adapter.validate_json(data)
+    PATENT_CACHE_LOOKUPS.labels(layer, "miss").inc()
+    result = compute()
+    cache.set(entry_key, adapter.dump_json(result))
+    return result
+
+
+# ------------------------------------------
+# Extraction stages
+# ------------------------------------------
+
+
 def _get_patent_metadata(titlepage: Base64Image, model: str, provider: str) -> PatentMeta:
     logger.info("Starting patent metadata extraction from title page image")
     prompt = get_prompt("PatentMetaParser")
@@ -56,10 +182,19 @@ def _get_patent_content(ocr_source: str, model: str, provider: str) -> PatentCon
     logger.info("Starting patent content extraction from OCR text")
     prompt = get_prompt("PatentContentParser")
     logger.info(f"Using prompt: {prompt.name}, version: {prompt.version}")
+    system_prompt = prompt.compile()
+    # The OCR text may use the whole context window; when it does not fit, the claims are kept
+    # and the description is cut
+    budget = get_token_budget(
+        model, provider, system_prompt, cap_input=False, task="patent_content"
+    )
+    ocr_text, _ = compact_sections(
+        split_claims(strip_ocr_boilerplate(ocr_source)), budget, priority=["Claims"]
+    )
     messages = build_messages(
         provider=provider,
-        text=f"Extract the patent content from this text: \n\n{ocr_source}",
-        system_prompt=prompt.compile(),
+        text=f"Extract the patent content from this text: \n\n{ocr_text}",
+        system_prompt=system_prompt,
     )
     try:
         response = extract(
@@ -67,6 +202,7 @@ def _get_patent_content(ocr_source: str, model: str, provider: str) -> PatentCon
             messages=messages,
             schema=PatentContent,
             provider=provider,
+            max_tokens=budget.max_tokens,
         )
         logger.info("Patent content extraction completed successfully")
         return response
@@ -80,35 +216,173 @@ def _get_patent_content(ocr_source: str, model: str, provider: str) -> PatentCon
 # ------------------------------------------
 
 
-def parse_patent_data(source: PatentInput) -> PatentDocument:
+def _build_stages(
+    source: PatentInput,
+    model: str,
+    provider: str,
+    with_contradictions: bool,
+    source_hash: Optional[str] = None,
+    on_pages: Optional[PageListener] = None,
+) -> Dict[str, Stage]:
+    """Build the patent pipeline graph.
+
+    URL sources are downloaded first by the shared fetcher. Metadata (vision on the title page)
+    and content (OCR text) only depend on the OCR output, so they run concurrently;
+    contradictions wait for both. Every stage is cached under a key
+    derived from its inputs, so changing a model or prompt only recomputes the stages after it.
+    """
+    parse_model = settings.DEFAULT_MODEL
+    parse_provider = settings.DEFAULT_PROVIDER
+    logger.info(f"Using LLM model: {parse_model} from provider: {parse_provider}")
+
+    def fetch_stage() -> FetchedPDF:
+        return get_pdf_fetcher().fetch(str(source))
+
+    def ocr_stage(fetch: Optional[FetchedPDF] = None) -> OCROutput:
+        if fetch is not None:
+            ocr_source, source_key = fetch.as_stream(), fetch.sha256
+        else:
+            ocr_source, source_key = source, source_hash or _source_fingerprint(source)
+        key = cache_key(source_key, get_ocr_fingerprint())
+        return _cached("ocr", key, _OCR_ADAPTER, lambda: run_ocr(ocr_source, on_pages))
+
+    def metadata_stage(ocr: OCROutput) -> PatentMeta:
+        key = cache_key(
+            sha256_bytes(ocr.titlepage_bytes),
+            ocr.titlepage_media_type,
+            parse_model,
+            parse_provider,
+            _prompt_key("PatentMetaParser"),
+        )
+        return _cached(
+            "metadata",
+            key,
+            _META_ADAPTER,
+            lambda: _get_patent_metadata(
+                ocr.titlepage, model=parse_model, provider=parse_provider
+            ),
+        )
+
+    def content_stage(ocr: OCROutput) -> PatentContent:
+        key = cache_key(
+            sha256_bytes(ocr.content.encode("utf-8")),
+            parse_model,
+            parse_provider,
+            _prompt_key("PatentContentParser"),
+        )
+        return _cached(
+            "content",
+            key,
+            _CONTENT_ADAPTER,
+            lambda: _get_patent_content(ocr.content, model=parse_model, provider=parse_provider),
+        )
+
+    def contradictions_stage(
+        metadata: PatentMeta, content: PatentContent
+    ) -> List[PatentContradiction]:
+        key = cache_key(
+            metadata.model_dump_json(),
+            content.model_dump_json(),
+            model,
+            provider,
+            _prompt_key("extract_tc_from_text"),
+            str(settings.MAX_INPUT_TOKENS),
+        )
+        return _cached(
+            "contradictions",
+            key,
+            _CONTRADICTIONS_ADAPTER,
+            lambda: extract_patent_tc(
+                PatentDocument(meta=metadata, content=content), model=model, provider=provider
+            ),
+        )
+
+    stages: Dict[str, Stage] = {}
+    if is_url(source):
+        stages["fetch"] = Stage(fetch_stage)
+        stages["ocr"] = Stage(ocr_stage, depends_on=["fetch"])
+    else:
+        stages["ocr"] = Stage(ocr_stage)
+    stages["metadata"] = Stage(metadata_stage, depends_on=["ocr"])
+    stages["content"] = Stage(content_stage, depends_on=["ocr"])
+    if with_contradictions:
+        stages["contradictions"] = Stage(contradictions_stage, depends_on=["metadata", "content"])
+    return stages
+
+
+def _run_pipeline(
+    stages: Dict[str, Stage],
+    on_stage: Optional[StageCallback],
+    emitter: Optional[_EventEmitter],
+) -> Tuple[Dict[str, Any], Dict[str, float]]:
+    def on_start(stage: str) -> None:
+        _report_stage(on_stage, stage)
+        if emitter is not None:
+            emitter.emit("stage_started", stage)
+
+    def on_finish(stage: str, result: Any, seconds: float) -> None:
+        if emitter is not None:
+            emitter.emit("stage_finished", stage, seconds, _stage_summary(result))
+
+    try:
+        results, timings = run_stages(stages, on_start=on_start, on_finish=on_finish)
+    except Exception as e:
+        if emitter is not None:
+            emitter.emit("error", data=str(e))
+        raise
+    logger.info(
+        "Patent pipeline stage timings: "
+        + ", ".join(f"{stage}={seconds:.2f}s" for stage, seconds in timings.items())
+    )
+    return results, timings
+
+
+def parse_patent_data(
+    source: PatentInput,
+    on_stage: Optional[StageCallback] = None,
+    source_hash: Optional[str] = None,
+    on_event: Optional[PipelineListener] = None,
+) -> PatentDocument:
     logger.info(f"Starting patent data extraction pipeline for: {source}")
-    ocr_output: OCROutput = get_pdf_content(source)
-    model = settings.DEFAULT_MODEL
-    provider = settings.DEFAULT_PROVIDER
-    logger.info(f"Using LLM model: {model} from provider: {provider}")
-    metadata = _get_patent_metadata(ocr_output.titlepage, model=model, provider=provider)
-    patent_content = _get_patent_content(ocr_output.content, model=model, provider=provider)
+    emitter = _EventEmitter(on_event) if on_event is not None else None
+    stages = _build_stages(
+        source,
+        settings.DEFAULT_MODEL,
+        settings.DEFAULT_PROVIDER,
+        with_contradictions=False,
+        source_hash=source_hash,
+        on_pages=emitter.on_pages if emitter is not None else None,
+    )
+    results, timings = _run_pipeline(stages, on_stage, emitter)
+    metadata: PatentMeta = results["metadata"]
     logger.info(f"Patent data extraction completed. Patent: {metadata.patent_no}")
-    return PatentDocument(meta=metadata, content=patent_content)
+    document = PatentDocument(meta=metadata, content=results["content"], timings=timings)
+    if emitter is not None:
+        emitter.emit("result", data=document.model_dump(mode="json"))
+    return document
 
 
 def extract_patent_tc(
     source: PatentDocument, model: str, provider: str
 ) -> List[PatentContradiction]:
     """Extract technical contradictions from patent content."""
-
-    # Build patent content as multiline string for the prompt
-    patent_text = f"""
-    Title: {source.meta.title}\n
-    Abstract: {source.meta.abstract}\n
-    Description: {source.content.description}\n
-    """
-
     prompt = get_prompt("extract_tc_from_text")
+    system_prompt = prompt.compile()
+    budget = get_token_budget(model, provider, system_prompt, task="patent_tc")
+
+    # Sections in priority order: whatever does not fit the budget is cut from the end
+    patent_text, _ = compact_sections(
+        [
+            ("Title", source.meta.title),
+            ("Abstract", source.meta.abstract),
+            *split_description(source.content.description),
+        ],
+        budget,
+    )
     messages = build_messages(
         provider=provider,
         text=patent_text,
-        system_prompt=prompt.compile(),
+        system_prompt=system_prompt,
     )
     try:
         response = extract(
@@ -116,6 +390,7 @@ def extract_patent_tc(
             messages=messages,
             schema=List[PatentContradiction],
             provider=provider,
+            max_tokens=budget.max_tokens,
         )
         logger.info("Patent TC extraction completed successfully")
         return response
@@ -124,14 +399,39 @@ def extract_patent_tc(
         raise RuntimeError(f"TC extraction failed: {e}")
 
 
-def patent_tc_pipeline(source: PatentInput, model: str, provider: str) -> PatentDocument:
-    """Complete pipeline to extract technical contradictions from a patent source."""
+def patent_tc_pipeline(
+    source: PatentInput,
+    model: str,
+    provider: str,
+    on_stage: Optional[StageCallback] = None,
+    source_hash: Optional[str] = None,
+    on_event: Optional[PipelineListener] = None,
+) -> PatentDocument:
+    """Complete pipeline to extract technical contradictions from a patent source.
+
+    Pass source_hash when the SHA-256 of the PDF is already known to skip hashing it again.
+    on_event receives stage start/finish events with partial results, OCR page progress and
+    finally the result or the error.
+    """
     logger.info(f"Starting patent TC extraction pipeline for source: {source}")
-    patent_doc = parse_patent_data(source)
-    patent_tc = extract_patent_tc(patent_doc, model=model, provider=provider)
-    logger.info(f"Patent TC extraction pipeline completed for patent: {patent_doc.meta.patent_no}")
-    return PatentDocument(
-        meta=patent_doc.meta,
-        content=patent_doc.content,
-        contradictions=patent_tc,
+    emitter = _EventEmitter(on_event) if on_event is not None else None
+    stages = _build_stages(
+        source,
+        model,
+        provider,
+        with_contradictions=True,
+        source_hash=source_hash,
+        on_pages=emitter.on_pages if emitter is not None else None,
+    )
+    results, timings = _run_pipeline(stages, on_stage, emitter)
+    metadata: PatentMeta = results["metadata"]
+    logger.info(f"Patent TC extraction pipeline completed for patent: {metadata.patent_no}")
+    document = PatentDocument(
+        meta=metadata,
+        content=results["content"],
+        contradictions=results["contradictions"],
+        timings=timings,
     )
+    if emitter is not None:
+        emitter.emit("result", data=document.model_dump(mode="json"))
+    return document
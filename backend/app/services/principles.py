@@ -2,23 +2,26 @@ import csv
 import logging
 import random
 from functools import lru_cache
-from importlib import resources as pkg_resources
 from itertools import product
-from typing import List, Set, Tuple
+from typing import TYPE_CHECKING, List, Set, Tuple
 
-import numpy as np
+from ..core.config import settings
+from ..core.vectors import get_vector_store
+from ..schemas.principles import Principle
+from ..utils import get_principles
 
-from app.core.vectors import get_vector_store
-from app.schemas.principles import Principle
+if TYPE_CHECKING:
+    import numpy as np
 
 logger = logging.getLogger(__name__)
 
 
 @lru_cache()
-def _load_matrix() -> np.ndarray:
+def _load_matrix() -> "np.ndarray":
     """Load the TRIZ contradiction matrix from CSV file."""
-    matrix_path = pkg_resources.files("app.data") / "matrix_values.csv"
-    with open(matrix_path, "r", encoding="utf-8") as f:
+    import numpy as np
+
+    with open(settings.MATRIX_FILE_PATH, "r", encoding="utf-8") as f:
         reader = csv.reader(f, delimiter=";")
         matrix_data = list(reader)
 
@@ -37,7 +40,6 @@ def get_principles_from_matrix(
         raise ValueError("All parameter IDs must be positive integers")
 
     matrix = _load_matrix()
-    vector_store = get_vector_store()
 
     row_indices = [i - 1 for i in improving_parameters]
     col_indices = [i - 1 for i in preserving_parameters]
@@ -60,13 +62,28 @@ def get_principles_from_matrix(
                     continue
 
     sorted_principle_ids = sorted(principle_ids)
-    return [p for p in vector_store.principles if p.id in sorted_principle_ids]
+    return [p for p in get_principles() if p.id in sorted_principle_ids]
+
+
+def _parse_cell(cell_value: str) -> List[int]:
+    principle_ids = []
+    for p in (cell_value or "").split(","):
+        try:
+            principle_ids.append(int(p.strip()))
+        except ValueError:
+            continue
+    return principle_ids
+
+
+def get_matrix() -> List[List[List[int]]]:
+    """Get the whole TRIZ contradiction matrix as principle IDs per cell."""
+    matrix = _load_matrix()
+    return [[_parse_cell(cell) for cell in row] for row in matrix]
 
 
 def get_all_principles() -> List[Principle]:
     """Get all TRIZ inventive principles."""
-    vector_store = get_vector_store()
-    return vector_store.principles
+    return get_principles()
 
 
 def search_principles(query: str, top_k: int = 5) -> List[Tuple[Principle, float]]:
@@ -77,8 +94,7 @@ def search_principles(query: str, top_k: int = 5) -> List[Tuple[Principle, float
 
 def get_principle_by_id(principle_id: int) -> Principle:
     """Get a specific TRIZ inventive principle by ID."""
-    vector_store = get_vector_store()
-    principle = next((p for p in vector_store.principles if p.id == principle_id), None)
+    principle = next((p for p in get_principles() if p.id == principle_id), None)
     if not principle:
         raise ValueError(f"Principle with id {principle_id} not found")
     return principle
@@ -86,9 +102,8 @@ def get_principle_by_id(principle_id: int) -> Principle:
 
 def get_principle_by_name(principle_name: str) -> Principle:
     """Get a specific TRIZ inventive principle by name."""
-    vector_store = get_vector_store()
     principle = next(
-        (p for p in vector_store.principles if p.name.lower() == principle_name.lower()), None
+        (p for p in get_principles() if p.name.lower() == principle_name.lower()), None
     )
     if not principle:
         raise ValueError(f"Principle with name '{principle_name}' not found")
@@ -97,8 +112,7 @@ def get_principle_by_name(principle_name: str) -> Principle:
 
 def get_random_principles(count: int = 5) -> List[Principle]:
     """Get a specified number of random TRIZ inventive principles."""
-    vector_store = get_vector_store()
-    all_principles = vector_store.principles
+    all_principles = get_principles()
 
     if count >= len(all_principles):
         return all_principles
@@ -1,10 +1,12 @@
 import base64
+import hashlib
 import json
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Literal
 
-from PIL import Image
+from PIL import Image, ImageOps
 
 from .core.config import settings
 from .schemas.parameters import Parameter
@@ -12,6 +14,13 @@ from .schemas.principles import Principle
 
 type MessageRole = Literal["system", "user", "assistant"]
 type Base64Image = tuple[str, str]
+type ImageFormat = Literal["png", "jpeg", "webp"]
+
+IMAGE_MEDIA_TYPES: Dict[str, str] = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+}
 
 
 def load_json_data(file_path: str) -> dict:
@@ -19,16 +28,31 @@ def load_json_data(file_path: str) -> dict:
         return json.load(f)
 
 
+@lru_cache()
 def get_parameters() -> List[Parameter]:
     parameters_data = load_json_data(str(settings.PARAMETERS_FILE_PATH))
     return [Parameter(**p) for p in parameters_data["parameters"]]
 
 
+@lru_cache()
 def get_principles() -> List[Principle]:
     principles_data = load_json_data(str(settings.PRINCIPLES_FILE_PATH))
     return [Principle(**p) for p in principles_data]
 
 
+@lru_cache()
+def get_catalog_etag() -> str:
+    """ETag for the catalog routes, derived from the parameter, principle and matrix files."""
+    digest = hashlib.sha256()
+    for path in (
+        settings.PARAMETERS_FILE_PATH,
+        settings.PRINCIPLES_FILE_PATH,
+        settings.MATRIX_FILE_PATH,
+    ):
+        digest.update(path.read_bytes())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
 # LLM utility functions
 def load_image(image_path: Path, max_size: tuple[int, int] = (1024, 1024)) -> Image.Image:
     """Load an image from path and resize it.
@@ -45,20 +69,71 @@ def load_image(image_path: Path, max_size: tuple[int, int] = (1024, 1024)) -> Im
     return img
 
 
+def crop_to_content(image: Image.Image, threshold: int = 245, padding: int = 16) -> Image.Image:
+    """Crop away the blank margins around the dark content of a scanned page.
+
+    Args:
+        image: PIL Image object
+        threshold: Gray level above which a pixel counts as background
+        padding: Margin in pixels kept around the content
+
+    Returns:
+        Cropped image, or the original image if it has no content
+    """
+    mask = ImageOps.grayscale(image).point(lambda value: 255 if value < threshold else 0)
+    bbox = mask.getbbox()
+    if bbox is None:
+        return image
+    left, top, right, bottom = bbox
+    return image.crop(
+        (
+            max(0, left - padding),
+            max(0, top - padding),
+            min(image.width, right + padding),
+            min(image.height, bottom + padding),
+        )
+    )
+
+
+def encode_image_bytes(
+    image: Image.Image, quality: int = 85, format: ImageFormat = "png"
+) -> tuple[str, bytes]:
+    """Encode a PIL Image to PNG, JPEG or WebP bytes.
+
+    Args:
+        image: PIL Image object
+        quality: Quality setting for JPEG and WebP (ignored by PNG)
+        format: Output format
+
+    Returns:
+        Tuple of (media_type, image_bytes)
+    """
+    buffer = BytesIO()
+    if format == "png":
+        image.save(buffer, format="PNG", optimize=True)
+    else:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        image.save(buffer, format=format.upper(), quality=quality)
+    return (IMAGE_MEDIA_TYPES[format], buffer.getvalue())
+
+
+def to_base64_image(media_type: str, data: bytes) -> Base64Image:
+    """Wrap raw image bytes as a (media_type, base64_string) tuple."""
+    return (media_type, base64.b64encode(data).decode("utf-8"))
+
+
 def encode_image(image: Image.Image, quality: int = 85) -> Base64Image:
     """Encode a PIL Image to base64 PNG.
 
     Args:
         image: PIL Image object
-        quality: Quality setting for PNG optimization
+        quality: Unused by PNG, kept for compatibility
 
     Returns:
         Tuple of (media_type, base64_string)
     """
-    buffer = BytesIO()
-    image.save(buffer, format="PNG", quality=quality, optimize=True)
-    base64_string = base64.b64encode(buffer.getvalue()).decode("utf-8")
-    return ("image/png", base64_string)
+    return to_base64_image(*encode_image_bytes(image, quality))
 
 
 def format_openai_image_content(text: str, image: tuple[str, str]) -> List[Dict[str, Any]]:
@@ -0,0 +1,102 @@
+from typing import AsyncIterator, Callable, Iterator, List, Optional
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.cache import DiskCache
+from app.core.fetch import FetchError, PDFFetcher
+
+URL = "https://patents.example.com/US1234567.pdf"
+PDF = b"%PDF-1.4\n" + b"0" * 1000
+
+type Handler = Callable[[httpx.Request], httpx.Response]
+
+
+@pytest.fixture
+def make_fetcher() -> Iterator[Callable[..., PDFFetcher]]:
+    fetchers: List[PDFFetcher] = []
+
+    def make(
+        handler: Handler, cache: Optional[DiskCache] = None, max_bytes: int = 64 * 1024
+    ) -> PDFFetcher:
+        fetcher = PDFFetcher(
+            cache=cache,
+            max_bytes=max_bytes,
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(),
+            transport=httpx.MockTransport(handler),
+        )
+        fetchers.append(fetcher)
+        return fetcher
+
+    yield make
+    for fetcher in fetchers:
+        fetcher.close()
+
+
+def test_unchanged_pdf_is_revalidated_and_reused(tmp_path, make_fetcher):
+    requests: List[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=PDF, headers={"ETag": '"v1"'})
+
+    fetcher = make_fetcher(handler, cache=DiskCache(tmp_path, max_bytes=1024 * 1024))
+    first = fetcher.fetch(URL)
+    second = fetcher.fetch(URL)
+
+    assert not first.revalidated
+    assert second.revalidated
+    assert second.content == PDF
+    assert second.sha256 == first.sha256
+    assert second.name == "US1234567.pdf"
+    assert requests[1].headers["If-None-Match"] == '"v1"'
+
+
+def test_declared_size_over_the_limit_is_refused(make_fetcher):
+    fetcher = make_fetcher(lambda request: httpx.Response(200, content=PDF), max_bytes=100)
+
+    with pytest.raises(FetchError, match="limit is 100"):
+        fetcher.fetch(URL)
+
+
+def test_streamed_download_is_aborted_at_the_limit(make_fetcher):
+    sent: List[int] = []
+
+    async def chunks() -> AsyncIterator[bytes]:
+        for index in range(100):
+            sent.append(index)
+            yield b"0" * 1024
+
+    # A streamed body has no Content-Length, so the limit is enforced while reading
+    fetcher = make_fetcher(
+        lambda request: httpx.Response(200, content=chunks()), max_bytes=10 * 1024
+    )
+
+    with pytest.raises(FetchError, match="exceeds 10240 bytes"):
+        fetcher.fetch(URL)
+    assert len(sent) < 100
+
+
+def test_upstream_failure_maps_to_502(monkeypatch, make_fetcher):
+    from app.api.routes import patents as patents_routes
+    from app.core.config import settings
+    from app.services import patents as patents_service
+
+    fetcher = make_fetcher(lambda request: httpx.Response(404))
+    with pytest.raises(FetchError, match="404"):
+        fetcher.fetch(URL)
+
+    monkeypatch.setattr(settings, "PATENT_CACHE_ENABLED", False)
+    monkeypatch.setattr(patents_service, "get_pdf_fetcher", lambda: fetcher)
+    app = FastAPI()
+    app.include_router(patents_routes.router)
+
+    response = TestClient(app).post("/patents/extract-tc/from-url", json={"url": URL})
+
+    assert response.status_code == 502
+    assert "404" in response.json()["detail"]
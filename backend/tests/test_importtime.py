@@ -0,0 +1,12 @@
+import os
+
+from app.benchmarks.importtime import BUDGET_SECONDS, HEAVY_MODULES, measure
+
+
+def test_app_imports_within_budget_without_heavy_modules(monkeypatch):
+    # FastAPI needs a title; the import itself does not depend on the configured one
+    monkeypatch.setenv("PROJECT_NAME", os.environ.get("PROJECT_NAME", "Import time test"))
+    cumulative = measure("app.main")
+
+    assert [module for module in HEAVY_MODULES if module in cumulative] == []
+    assert cumulative["app.main"] / 1e6 < BUDGET_SECONDS
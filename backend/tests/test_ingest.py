@@ -0,0 +1,28 @@
+import json
+from types import SimpleNamespace
+
+from app import ingest
+
+
+def test_rerun_replaces_failure_records(monkeypatch, tmp_path):
+    output = tmp_path / "results.jsonl"
+    checkpoint = tmp_path / "results.jsonl.checkpoint"
+
+    def fail(source, model, provider):
+        raise RuntimeError(f"cannot read {source}")
+
+    monkeypatch.setattr(ingest, "_process", fail)
+    for _ in range(2):
+        ingest.ingest(["a.pdf", "b.pdf"], output, checkpoint, "model", "provider", concurrency=2)
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["source"] for record in records) == ["a.pdf", "b.pdf"]
+    assert all("error" in record for record in records)
+
+    document = SimpleNamespace(model_dump=lambda mode: {"title": "ok"}, timings=None)
+    monkeypatch.setattr(ingest, "_process", lambda source, model, provider: document)
+    ingest.ingest(["a.pdf", "b.pdf"], output, checkpoint, "model", "provider", concurrency=2)
+
+    records = [json.loads(line) for line in output.read_text().splitlines()]
+    assert sorted(record["source"] for record in records) == ["a.pdf", "b.pdf"]
+    assert all(record["document"] == {"title": "ok"} for record in records)
@@ -0,0 +1,56 @@
+import hashlib
+import io
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.schemas.jobs import JobStatus
+from app.services import jobs as jobs_service
+
+
+@pytest.fixture
+def manager(tmp_path):
+    manager = jobs_service.PatentJobManager(
+        jobs_dir=tmp_path, workers=1, retention=timedelta(0), lease=timedelta(seconds=0.3)
+    )
+    yield manager
+    manager.shutdown()
+    manager.store.close()
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.02)
+
+
+def test_upload_job_passes_the_upload_hash_to_the_pipeline(manager, monkeypatch):
+    calls = []
+
+    def pipeline(**kwargs):
+        calls.append(kwargs)
+        raise RuntimeError("OCR failed")
+
+    monkeypatch.setattr(jobs_service.patents_service, "patent_tc_pipeline", pipeline)
+    content = b"%PDF-1.4 upload"
+
+    job = manager.submit_upload(io.BytesIO(content), "patent.pdf")
+    _wait_for(lambda: manager.get(job.id).status == JobStatus.FAILED)
+
+    assert calls[0]["source_hash"] == hashlib.sha256(content).hexdigest()
+    assert manager.get(job.id).error == "OCR failed"
+
+
+def test_expired_jobs_are_purged_in_the_background(manager, monkeypatch):
+    monkeypatch.setattr(jobs_service, "PURGE_INTERVAL_SECONDS", 0.0)
+    manager.resume()
+    input_path = manager.uploads_dir / "finished.pdf"
+    input_path.write_bytes(b"%PDF")
+    manager.store.create("finished", source="patent.pdf", input_path=input_path)
+    manager.store.update("finished", status=JobStatus.SUCCEEDED)
+
+    _wait_for(lambda: not input_path.exists())
+    with pytest.raises(ValueError):
+        manager.get("finished")
@@ -0,0 +1,43 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from app.benchmarks.memory import sample
+
+WORKERS = 2
+
+pytestmark = [
+    pytest.mark.skipif(
+        not Path("/proc/self/smaps_rollup").exists() or not hasattr(os, "fork"),
+        reason="needs /proc/<pid>/smaps_rollup and os.fork (Linux)",
+    ),
+    # Loads the models in several servers
+    pytest.mark.slow,
+]
+
+
+def _workers(command: list[str], port: int) -> list[dict[str, int]]:
+    usages = sample(command, port, settle=10.0, timeout=300.0)
+    assert len(usages) == WORKERS + 1
+    return usages[1:]
+
+
+def test_forked_workers_share_the_preloaded_models():
+    port = 8766
+    uvicorn_workers = _workers(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)]
+        + ["--workers", str(WORKERS)],
+        port,
+    )
+    shared_workers = _workers(
+        [sys.executable, "-m", "app.serve", "--port", str(port), "--workers", str(WORKERS)],
+        port,
+    )
+
+    # Each uvicorn worker loads the models into its own private memory; forked workers map
+    # the parent's copy, so more of their RSS is shared and less of it private
+    for worker in shared_workers:
+        assert worker["rss"] - worker["uss"] > worker["uss"]
+    assert max(w["uss"] for w in shared_workers) < min(w["uss"] for w in uvicorn_workers)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+
+from app.core.metrics import MetricsMiddleware
+
+router = APIRouter(prefix="/items")
+
+
+@router.get("/{item_id}")
+def read_item(item_id: int) -> int:
+    return item_id
+
+
+def _count(route: str, status: str) -> float:
+    labels = {"method": "GET", "route": route, "status": status}
+    return REGISTRY.get_sample_value("http_request_duration_seconds_count", labels) or 0.0
+
+
+def test_requests_are_observed_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+    before = _count("/api/items/{item_id}", "200")
+
+    assert client.get("/api/items/1").status_code == 200
+    assert client.get("/api/items/2").status_code == 200
+    assert client.get("/missing").status_code == 404
+
+    assert _count("/api/items/{item_id}", "200") == before + 2
+    assert _count("unmatched", "404") >= 1
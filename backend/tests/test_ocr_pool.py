@@ -0,0 +1,42 @@
+from concurrent.futures.process import BrokenProcessPool
+
+from app.core import ocr_pool
+
+
+def test_retry_after_broken_pool_does_not_repeat_progress(monkeypatch):
+    monkeypatch.setattr(ocr_pool.settings, "OCR_PROCESS_WORKERS", 2)
+    monkeypatch.setattr(ocr_pool, "_get_executor", lambda: object())
+    monkeypatch.setattr(ocr_pool, "_restart_executor", lambda executor: None)
+    monkeypatch.setattr(ocr_pool, "record_ocr_metrics", lambda output: None)
+    attempts = []
+
+    def submit(executor, source, on_pages):
+        attempts.append(executor)
+        on_pages(0, 3)
+        on_pages(1, 3)
+        if len(attempts) == 1:
+            raise BrokenProcessPool("worker died")
+        on_pages(2, 3)
+        on_pages(3, 3)
+        return "output"
+
+    monkeypatch.setattr(ocr_pool, "_submit", submit)
+    progress = []
+
+    assert ocr_pool.run_ocr("patent.pdf", lambda *pages: progress.append(pages)) == "output"
+    assert len(attempts) == 2
+    assert progress == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+
+def test_configure_ocr_pool_leaves_settings_alone(monkeypatch):
+    monkeypatch.setattr(ocr_pool, "_workers", None)
+    monkeypatch.setattr(ocr_pool, "_max_queue_depth", None)
+    workers = ocr_pool.settings.OCR_PROCESS_WORKERS
+    depth = ocr_pool.settings.OCR_MAX_QUEUE_DEPTH
+
+    ocr_pool.configure_ocr_pool(workers=workers + 3, max_queue_depth=depth + 5)
+
+    assert ocr_pool._pool_size() == workers + 3
+    assert ocr_pool._queue_depth() == depth + 5
+    assert ocr_pool.settings.OCR_PROCESS_WORKERS == workers
+    assert ocr_pool.settings.OCR_MAX_QUEUE_DEPTH == depth
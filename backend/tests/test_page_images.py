@@ -0,0 +1,39 @@
+from PIL import Image
+
+from app.core import ocr
+from app.core.ocr import OCROutput
+from app.services.patents import _stage_summary
+
+
+def _page() -> Image.Image:
+    page = Image.new("RGB", (400, 600), "white")
+    page.paste((200, 0, 0), (40, 40, 360, 120))
+    return page
+
+
+def test_page_images_default_to_full_resolution_color_png():
+    media_type, data = ocr._encode_page_image(_page(), is_titlepage=True)
+    assert media_type == "image/png"
+    with Image.open(ocr.BytesIO(data)) as image:
+        assert image.size == (400, 600)
+        assert image.mode == "RGB"
+
+
+def test_page_images_shrink_when_configured(monkeypatch):
+    monkeypatch.setattr(ocr.settings, "PAGE_IMAGE_MAX_EDGE", 176)
+    monkeypatch.setattr(ocr.settings, "PAGE_IMAGE_FORMAT", "jpeg")
+    monkeypatch.setattr(ocr.settings, "PAGE_IMAGE_GRAYSCALE", True)
+    monkeypatch.setattr(ocr.settings, "TITLEPAGE_CROP", True)
+    media_type, data = ocr._encode_page_image(_page(), is_titlepage=True)
+    assert media_type == "image/jpeg"
+    with Image.open(ocr.BytesIO(data)) as image:
+        # Cropped to the printed block plus padding (352x112), halved and made grayscale
+        assert image.size == (176, 56)
+        assert image.mode == "L"
+
+
+def test_ocr_stage_summary_reports_the_encoded_title_page_size():
+    output = OCROutput(file_name="patent.pdf", content="text", titlepage_bytes=b"x" * 1234)
+    summary = _stage_summary(output)
+    assert summary["titlepage_bytes"] == 1234
+    assert summary["titlepage_media_type"] == "image/png"
@@ -0,0 +1,71 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.routes import patents as patents_routes
+from app.schemas.patents import PatentPipelineEvent
+from app.services import patents as patents_service
+
+PDF = b"%PDF-1.4\n" + b"0" * 5000
+
+
+def _events(body: str) -> List[Dict[str, Any]]:
+    events = []
+    for block in body.strip().split("\n\n"):
+        name, data = block.split("\n")
+        events.append({"event": name.removeprefix("event: "), **json.loads(data[6:])})
+    return events
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.include_router(patents_routes.router)
+    return TestClient(app)
+
+
+def test_upload_stream_runs_the_pipeline_on_the_spooled_upload(monkeypatch, client):
+    seen: Dict[str, Any] = {}
+
+    def pipeline(source: Path, model: str, provider: str, source_hash: str, on_event) -> None:
+        seen["content"] = source.read_bytes()
+        seen["source"] = source
+        on_event(PatentPipelineEvent(event="stage_started", stage="ocr", elapsed=0.0))
+        on_event(PatentPipelineEvent(event="result", elapsed=0.1, data={"ok": True}))
+
+    monkeypatch.setattr(patents_service, "patent_tc_pipeline", pipeline)
+
+    response = client.post(
+        "/patents/extract-tc/upload/stream",
+        files={"file": ("US1234567.pdf", PDF, "application/pdf")},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = _events(response.text)
+    assert [event["event"] for event in events] == ["stage_started", "result"]
+    assert events[-1]["data"] == {"ok": True}
+    assert seen["content"] == PDF
+    assert seen["source"].name == "US1234567.pdf"
+    # The spooled copy is removed once the pipeline is done
+    assert not seen["source"].exists()
+
+
+def test_upload_stream_reports_pipeline_failures_as_an_error_event(monkeypatch, client):
+    def pipeline(**kwargs: Any) -> None:
+        raise RuntimeError("OCR failed")
+
+    monkeypatch.setattr(patents_service, "patent_tc_pipeline", pipeline)
+
+    response = client.post(
+        "/patents/extract-tc/upload/stream",
+        files={"file": ("US1234567.pdf", PDF, "application/pdf")},
+    )
+
+    events = _events(response.text)
+    assert [event["event"] for event in events] == ["error"]
+    assert events[0]["data"] == "OCR failed"
@@ -0,0 +1,86 @@
+import asyncio
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from app.core import profiling
+
+
+def profiled_work() -> None:
+    _spin()
+
+
+def unprofiled_work() -> None:
+    _spin()
+
+
+def unprofiled_sync_work() -> None:
+    _spin()
+
+
+def _spin(seconds: float = 0.02) -> None:
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        pass
+
+
+app = FastAPI()
+app.add_middleware(profiling.ProfileMiddleware)
+
+
+@app.get("/profiled")
+async def profiled() -> None:
+    for _ in range(5):
+        profiled_work()
+        await asyncio.sleep(0.01)
+
+
+@app.get("/async")
+async def unprofiled_async() -> None:
+    for _ in range(5):
+        unprofiled_work()
+        await asyncio.sleep(0.01)
+
+
+@app.get("/sync")
+def unprofiled_sync() -> None:
+    for _ in range(5):
+        unprofiled_sync_work()
+
+
+async def _requests() -> list[httpx.Response]:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await asyncio.gather(
+            client.get("/profiled", headers={"X-Profile": "secret"}),
+            *[client.get(path) for path in ("/async", "/sync") * 3],
+        )
+
+
+def test_profile_only_holds_the_profiled_request(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling.settings, "PROFILE_TOKEN", "secret")
+    monkeypatch.setattr(profiling.settings, "PROFILE_DIR", tmp_path)
+
+    responses = asyncio.run(_requests())
+
+    assert all(response.status_code == 200 for response in responses)
+    profile_id = responses[0].headers["X-Profile-Id"]
+    profile = (tmp_path / f"{profile_id}.collapsed").read_text()
+    assert "profiled_work" in profile
+    assert "unprofiled_work" not in profile
+    assert "unprofiled_sync_work" not in profile
+
+
+def test_closed_session_stops_recording():
+    session = profiling.ProfileSession("test")
+    token = profiling._session.set(session)
+    try:
+        profiling._on_enter(profiled_work.__code__, 0)
+        session.close()
+        profiling._on_enter(unprofiled_work.__code__, 0)
+    finally:
+        profiling._session.reset(token)
+    assert [code.co_name for stack in session.stacks.values() for code in stack] == [
+        "profiled_work"
+    ]
@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+pytest.importorskip("torch")
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+
+# Runs parallel torch ops in the parent the way preload() does, then again in a forked child
+FORK_AFTER_TORCH = textwrap.dedent(
+    """
+    import os
+    import torch
+    from app.serve import torch_single_threaded
+
+    torch.set_num_threads(4)
+    matrix = torch.randn(512, 512)
+    with torch_single_threaded():
+        for _ in range(5):
+            matrix @ matrix
+    assert torch.get_num_threads() == 4
+
+    pid = os.fork()
+    if pid == 0:
+        for _ in range(5):
+            matrix @ matrix
+        os._exit(0)
+    _, status = os.waitpid(pid, 0)
+    raise SystemExit(os.waitstatus_to_exitcode(status))
+    """
+)
+
+
+def test_workers_forked_after_preload_can_run_torch():
+    result = subprocess.run(
+        [sys.executable, "-c", FORK_AFTER_TORCH],
+        cwd=os.path.dirname(os.path.dirname(__file__)),
+        capture_output=True,
+        timeout=120,
+    )
+    assert result.returncode == 0, result.stderr.decode()
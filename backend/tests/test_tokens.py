@@ -0,0 +1,98 @@
+import pytest
+
+from app.core.tokens import (
+    CHARS_PER_TOKEN,
+    InputTooLongError,
+    TokenBudget,
+    compact_sections,
+    estimate_tokens,
+    get_token_budget,
+    split_claims,
+    split_description,
+    truncate_to_tokens,
+)
+from app.services.contradictions import extract_tc
+
+
+def _budget(input_tokens: int) -> TokenBudget:
+    return TokenBudget(
+        model="test", context_tokens=0, output_tokens=0, input_tokens=input_tokens, max_tokens=0
+    )
+
+
+def test_truncate_to_tokens_keeps_text_within_budget():
+    assert truncate_to_tokens("short text", 10) == "short text"
+
+
+def test_truncate_to_tokens_cuts_at_a_paragraph_boundary():
+    text = "a" * 30 + "\n\n" + "b" * 30
+    assert truncate_to_tokens(text, 10) == "a" * 30
+
+
+def test_truncate_to_tokens_cuts_at_a_sentence_boundary():
+    text = "First sentence here. Second sentence is a lot longer than the first one."
+    assert truncate_to_tokens(text, 8) == "First sentence here."
+
+
+def test_truncate_to_tokens_cuts_hard_without_a_late_boundary():
+    assert truncate_to_tokens("x" * 100, 5) == "x" * 5 * CHARS_PER_TOKEN
+
+
+def test_split_description_moves_the_summary_out():
+    description = (
+        "FIELD\nWidgets.\nSUMMARY OF THE INVENTION\nA better widget.\nDETAILED DESCRIPTION\nMore."
+    )
+    assert split_description(description) == [
+        ("Summary", "\nA better widget.\n"),
+        ("Description", "FIELD\nWidgets.\nDETAILED DESCRIPTION\nMore."),
+    ]
+
+
+def test_split_description_without_summary():
+    assert split_description("Only a description.") == [("Description", "Only a description.")]
+
+
+def test_split_claims_keeps_document_order():
+    text = "Abstract mentions the claims.\nCLAIMS\nBody text.\nWhat is claimed is:\n1. A widget."
+    assert split_claims(text) == [
+        ("Description", "Abstract mentions the claims.\nCLAIMS\nBody text.\n"),
+        ("Claims", "\n1. A widget."),
+    ]
+
+
+def test_compact_sections_keeps_everything_within_budget():
+    text, report = compact_sections(
+        [("Title", "A  widget"), (None, "Body\n\n\n\ntext")], _budget(100)
+    )
+    assert text == "Title: A widget\n\nBody\n\ntext"
+    assert report.truncated == []
+
+
+def test_compact_sections_truncates_and_drops_from_the_end():
+    sections = [("Title", "Widget"), ("Abstract", "word " * 40), ("Description", "more")]
+    text, report = compact_sections(sections, _budget(20))
+    assert text.startswith("Title: Widget\n\nAbstract: word")
+    assert "Description" not in text
+    assert estimate_tokens(text) <= 20
+    assert report.truncated == ["Abstract", "Description"]
+
+
+def test_compact_sections_fits_priority_sections_first_in_document_order():
+    sections = [("Description", "long description " * 20), ("Claims", "1. A widget.")]
+    text, report = compact_sections(sections, _budget(30), priority=["Claims"])
+    assert text.startswith("Description: long description")
+    assert text.endswith("\n\nClaims: 1. A widget.")
+    assert report.truncated == ["Description"]
+
+
+def test_task_cap_is_sent_while_the_output_window_stays_reserved():
+    budget = get_token_budget("gpt-5", "openai", cap_input=False, task="extract_tc")
+    assert budget.output_tokens == 128_000
+    assert budget.max_tokens == 4_096
+    assert budget.input_tokens < budget.context_tokens - budget.output_tokens
+
+
+def test_extract_tc_rejects_text_over_the_input_budget(monkeypatch):
+    monkeypatch.setattr("app.core.tokens.settings.MAX_INPUT_TOKENS", 10)
+    with pytest.raises(InputTooLongError):
+        extract_tc("word " * 100, model="gpt-4.1-mini", provider="openai")
@@ -0,0 +1,121 @@
+import hashlib
+from io import BytesIO
+from typing import Iterator
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.uploads import (
+    MULTIPART_OVERHEAD_BYTES,
+    UPLOAD_CHUNK_SIZE,
+    UploadLimitMiddleware,
+    UploadTooLargeError,
+    spool_upload,
+)
+
+PDF = b"%PDF-1.4\n" + bytes(range(256)) * 10_000
+
+
+class _CountingReader(BytesIO):
+    """Records the size of every read, to check that the upload is consumed in chunks."""
+
+    def __init__(self, data: bytes):
+        super().__init__(data)
+        self.reads: list[int] = []
+
+    def read(self, size: int | None = -1) -> bytes:
+        self.reads.append(-1 if size is None else size)
+        return super().read(size)
+
+
+def test_spool_upload_streams_to_a_named_file_and_hashes_it():
+    upload = _CountingReader(PDF)
+    upload.seek(100)
+
+    with spool_upload(upload, "US1234567.pdf", max_bytes=len(PDF)) as (path, content_hash):
+        assert path.name == "US1234567.pdf"
+        assert path.read_bytes() == PDF
+        assert content_hash == hashlib.sha256(PDF).hexdigest()
+
+    assert not path.exists()
+    assert upload.reads and all(size == UPLOAD_CHUNK_SIZE for size in upload.reads)
+
+
+def test_spool_upload_keeps_the_file_inside_its_directory():
+    with spool_upload(BytesIO(PDF), "..", max_bytes=len(PDF)) as (path, _):
+        assert path.name == "upload.pdf"
+
+
+def test_spool_upload_rejects_oversize_uploads_and_cleans_up(tmp_path, monkeypatch):
+    monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+    with pytest.raises(UploadTooLargeError):
+        with spool_upload(BytesIO(PDF), "big.pdf", max_bytes=len(PDF) - 1):
+            pass
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.fixture
+def client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(settings, "MAX_UPLOAD_BYTES", 100_000)
+    app = FastAPI()
+    app.add_middleware(UploadLimitMiddleware)
+
+    @app.post("/upload")
+    async def upload(request: Request) -> dict[str, int]:
+        form = await request.form()
+        return {"size": len(await form["file"].read())}
+
+    return TestClient(app)
+
+
+def _multipart(content: bytes) -> bytes:
+    return (
+        b"--boundary\r\n"
+        b'Content-Disposition: form-data; name="file"; filename="a.pdf"\r\n'
+        b"Content-Type: application/pdf\r\n\r\n" + content + b"\r\n--boundary--\r\n"
+    )
+
+
+def _chunked(body: bytes) -> Iterator[bytes]:
+    for start in range(0, len(body), 8192):
+        yield body[start : start + 8192]
+
+
+def test_upload_within_the_limit_passes(client):
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 90_000)})
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 90_000}
+
+
+def test_declared_body_over_the_limit_is_refused_with_413(client):
+    response = client.post("/upload", files={"file": ("a.pdf", b"x" * 200_000)})
+
+    assert response.status_code == 413
+
+
+def test_chunked_body_over_the_limit_is_refused_with_413(client):
+    body = _multipart(b"x" * (100_000 + MULTIPART_OVERHEAD_BYTES + 1))
+    response = client.post(
+        "/upload",
+        content=_chunked(body),
+        headers={"content-type": "multipart/form-data; boundary=boundary"},
+    )
+
+    assert response.status_code == 413
+    assert "100000" in response.json()["detail"]
+
+
+def test_chunked_body_within_the_limit_passes(client):
+    response = client.post(
+        "/upload",
+        content=_chunked(_multipart(b"x" * 50_000)),
+        headers={"content-type": "multipart/form-data; boundary=boundary"},
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {"size": 50_000}
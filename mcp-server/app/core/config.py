@@ -1,3 +1,6 @@
+from pathlib import Path
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -11,6 +14,16 @@ class Settings(BaseSettings):
         extra="ignore",
     )
 
+    BACKEND_TRANSPORT: Literal["http", "inprocess"] = Field(
+        default="http",
+        description="Reach the backend over HTTP, or import its service layer into this process",
+    )
+
+    BACKEND_APP_DIR: Path = Field(
+        default=Path(__file__).resolve().parents[3] / "backend" / "app",
+        description="Backend `app` package directory, used by the inprocess transport",
+    )
+
     API_BASE_URL: str = Field(
         default="http://localhost:8000",
         description="Base URL for the backend API",
@@ -26,5 +39,87 @@ class Settings(BaseSettings):
         description="Port to run the MCP server on",
     )
 
+    HTTP_TIMEOUT: float = Field(
+        default=30.0,
+        description="Default timeout in seconds for backend requests",
+    )
+
+    HTTP_CONNECT_TIMEOUT: float = Field(
+        default=5.0,
+        description="Timeout in seconds for opening a connection to the backend",
+    )
+
+    HTTP_ENDPOINT_TIMEOUTS: dict[str, float] = Field(
+        default={
+            "/api/v1/parameters/search": 10.0,
+            "/api/v1/principles/search": 10.0,
+            "/api/v1/contradictions/extract-tc": 120.0,
+        },
+        description="Timeouts in seconds by endpoint path prefix (longest match wins)",
+    )
+
+    HTTP_MAX_CONNECTIONS: int = Field(
+        default=20,
+        description="Maximum number of concurrent connections to the backend",
+    )
+
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(
+        default=10,
+        description="Maximum number of idle connections kept open to the backend",
+    )
+
+    HTTP_KEEPALIVE_EXPIRY: float = Field(
+        default=30.0,
+        description="Seconds an idle backend connection is kept open",
+    )
+
+    HTTP2: bool = Field(
+        default=False,
+        description="Use HTTP/2 for backend requests (requires the h2 package)",
+    )
+
+    HTTP_RETRIES: int = Field(
+        default=2,
+        description="Retries for idempotent requests that could not connect or got a 502-504",
+    )
+
+    HTTP_RETRY_BACKOFF: float = Field(
+        default=0.2,
+        description="Base delay in seconds for jittered exponential retry backoff",
+    )
+
+    HTTP_RETRY_BACKOFF_MAX: float = Field(
+        default=2.0,
+        description="Maximum delay in seconds between retries",
+    )
+
+    TOOL_DEADLINE: float = Field(
+        default=30.0,
+        description="Seconds a tool call may take, including retries",
+    )
+
+    TOOL_DEADLINES: dict[str, float] = Field(
+        default={
+            "formulate_tc": 150.0,
+            "get_principles_for_problem": 150.0,
+        },
+        description="Deadlines in seconds for tools that need longer than TOOL_DEADLINE",
+    )
+
+    BREAKER_FAILURE_THRESHOLD: int = Field(
+        default=5,
+        description="Consecutive backend failures that open the circuit breaker",
+    )
+
+    BREAKER_RESET_SECONDS: float = Field(
+        default=30.0,
+        description="Seconds the circuit breaker fails fast before probing the backend again",
+    )
+
+    CATALOG_REVALIDATE_SECONDS: float = Field(
+        default=300.0,
+        description="Seconds the cached TRIZ catalog is used before it is revalidated",
+    )
+
 
 settings = Settings()
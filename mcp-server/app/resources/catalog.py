@@ -0,0 +1,159 @@
+"""In-process cache of the static TRIZ catalog: principles, parameters and the matrix."""
+
+import asyncio
+import json
+import logging
+import random
+import time
+from itertools import product
+from typing import Any
+
+from app.core.config import settings
+from app.utils.http import make_conditional_request
+
+logger = logging.getLogger(__name__)
+
+PRINCIPLES_ENDPOINT = "/api/v1/principles/"
+PARAMETERS_ENDPOINT = "/api/v1/parameters/"
+MATRIX_ENDPOINT = "/api/v1/principles/matrix/table"
+
+
+class CatalogCache:
+    """Principles, parameters and contradiction matrix, loaded once from the backend.
+
+    Lookups are served from memory. The catalog is revalidated with conditional requests
+    (If-None-Match) at most every CATALOG_REVALIDATE_SECONDS, which costs a 304 while the
+    backend catalog is unchanged. If revalidation fails, the cached copy keeps being used.
+    """
+
+    def __init__(self, revalidate_seconds: float):
+        self.revalidate_seconds = revalidate_seconds
+        self.principles: dict[int, dict[str, Any]] = {}
+        self.parameters: dict[int, dict[str, Any]] = {}
+        self.matrix: list[list[list[int]]] = []
+        self._etags: dict[str, str | None] = {}
+        self._checked_at: float | None = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.revalidate_seconds
+        )
+
+    async def _revalidate(self, endpoint: str) -> Any:
+        data, etag = await make_conditional_request(endpoint, self._etags.get(endpoint))
+        self._etags[endpoint] = etag
+        return data
+
+    async def ensure_fresh(self) -> "CatalogCache":
+        """Load the catalog on first use and revalidate it once it is older than the TTL."""
+        if self._is_fresh():
+            return self
+        async with self._lock:
+            if self._is_fresh():
+                return self
+            try:
+                principles, parameters, matrix = await asyncio.gather(
+                    self._revalidate(PRINCIPLES_ENDPOINT),
+                    self._revalidate(PARAMETERS_ENDPOINT),
+                    self._revalidate(MATRIX_ENDPOINT),
+                )
+            except Exception as e:
+                if self._checked_at is None:
+                    raise
+                logger.warning(f"Catalog revalidation failed, using cached copy: {e}")
+                self._checked_at = time.monotonic()
+                return self
+
+            if principles is not None:
+                self.principles = {principle["id"]: principle for principle in principles}
+            if parameters is not None:
+                self.parameters = {parameter["id"]: parameter for parameter in parameters}
+            if matrix is not None:
+                self.matrix = matrix["cells"]
+            if principles is not None or parameters is not None or matrix is not None:
+                logger.info(
+                    f"Loaded TRIZ catalog ({len(self.principles)} principles, "
+                    f"{len(self.parameters)} parameters)"
+                )
+            self._checked_at = time.monotonic()
+        return self
+
+    # ------------------------------------------
+    # Lookups
+    # ------------------------------------------
+
+    def get_principle(self, principle_id: int) -> dict[str, Any] | None:
+        return self.principles.get(principle_id)
+
+    def get_parameter(self, parameter_id: int) -> dict[str, Any] | None:
+        return self.parameters.get(parameter_id)
+
+    def random_principles(self, count: int) -> list[dict[str, Any]]:
+        principles = list(self.principles.values())
+        if count >= len(principles):
+            return principles
+        return random.sample(principles, count)
+
+    def matrix_cell(self, improving: int, preserving: int) -> list[int]:
+        """Principle IDs for one improving/preserving parameter pair (empty on the diagonal)."""
+        row, col = improving - 1, preserving - 1
+        if row == col or row >= len(self.matrix) or col >= len(self.matrix[row]):
+            return []
+        return self.matrix[row][col]
+
+    def principles_from_matrix(
+        self, improving_params: list[int], preserving_params: list[int]
+    ) -> list[dict[str, Any]]:
+        """Look up principles for every improving/preserving pair, like the backend does."""
+        if not all(x > 0 for x in improving_params + preserving_params):
+            raise ValueError("All parameter IDs must be positive integers")
+
+        principle_ids: set[int] = set()
+        for improving, preserving in product(improving_params, preserving_params):
+            principle_ids.update(self.matrix_cell(improving, preserving))
+
+        return [self.principles[pid] for pid in sorted(principle_ids) if pid in self.principles]
+
+
+_catalog = CatalogCache(revalidate_seconds=settings.CATALOG_REVALIDATE_SECONDS)
+
+
+async def get_catalog() -> CatalogCache:
+    """Return the shared catalog, loading or revalidating it if needed."""
+    return await _catalog.ensure_fresh()
+
+
+# ------------------------------------------
+# Resource contents
+# ------------------------------------------
+
+
+async def read_principles() -> str:
+    catalog = await get_catalog()
+    return json.dumps(list(catalog.principles.values()), ensure_ascii=False)
+
+
+async def read_principle(principle_id: int) -> str:
+    principle = (await get_catalog()).get_principle(principle_id)
+    if principle is None:
+        raise ValueError(f"Principle with ID {principle_id} not found")
+    return json.dumps(principle, ensure_ascii=False)
+
+
+async def read_parameters() -> str:
+    catalog = await get_catalog()
+    return json.dumps(list(catalog.parameters.values()), ensure_ascii=False)
+
+
+async def read_parameter(parameter_id: int) -> str:
+    parameter = (await get_catalog()).get_parameter(parameter_id)
+    if parameter is None:
+        raise ValueError(f"Parameter with ID {parameter_id} not found")
+    return json.dumps(parameter, ensure_ascii=False)
+
+
+async def read_matrix() -> str:
+    catalog = await get_catalog()
+    return json.dumps({"cells": catalog.matrix})
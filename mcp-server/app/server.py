@@ -1,15 +1,38 @@
 import logging
+from contextlib import asynccontextmanager
 
+import uvicorn
 from mcp.server.fastmcp import FastMCP
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
 
 from .core.config import settings
 from .core.logging import setup_logging
+from .resources import catalog as catalog_resources
 from .tools import contradictions as contradiction_tools
+from .tools import pipeline as pipeline_tools
+from .utils.http import http_client_lifespan
+from .utils.resilience import backend_status
 
 setup_logging()
 logger = logging.getLogger(__name__)
 
 
+def create_app(mcp: FastMCP) -> Starlette:
+    """Build the streamable HTTP app, tying the shared backend client to its lifespan."""
+    app = mcp.streamable_http_app()
+    session_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        async with http_client_lifespan(), session_lifespan(app):
+            yield
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
 def main() -> None:
     """Main entry point for the TRIZ Contradictions MCP server."""
     mcp = FastMCP(
@@ -32,6 +55,8 @@ def main() -> None:
         """
         return await contradiction_tools.formulate_tc(description)
 
+    pipeline_tools.register(mcp)
+
     @mcp.tool()
     async def get_ips_by_matrix(improving_params: list[int], preserving_params: list[int]) -> str:
         """Get Inventive Principles from TRIZ Contradiction Matrix.
@@ -108,10 +133,42 @@ def main() -> None:
         """
         return await contradiction_tools.get_parameter_by_id(parameter_id)
 
+    # Register resources
+    @mcp.resource("triz://principles", mime_type="application/json")
+    async def principles() -> str:
+        """All 40 TRIZ Inventive Principles with their rules, hints and examples."""
+        return await catalog_resources.read_principles()
+
+    @mcp.resource("triz://principles/{principle_id}", mime_type="application/json")
+    async def principle(principle_id: int) -> str:
+        """A single TRIZ Inventive Principle by ID (1-40)."""
+        return await catalog_resources.read_principle(principle_id)
+
+    @mcp.resource("triz://parameters", mime_type="application/json")
+    async def parameters() -> str:
+        """All 39 TRIZ Parameters with their descriptions and examples."""
+        return await catalog_resources.read_parameters()
+
+    @mcp.resource("triz://parameters/{parameter_id}", mime_type="application/json")
+    async def parameter(parameter_id: int) -> str:
+        """A single TRIZ Parameter by ID (1-39)."""
+        return await catalog_resources.read_parameter(parameter_id)
+
+    @mcp.resource("triz://matrix", mime_type="application/json")
+    async def matrix() -> str:
+        """The TRIZ contradiction matrix, indexed [improving - 1][preserving - 1]."""
+        return await catalog_resources.read_matrix()
+
+    # Monitoring
+    @mcp.custom_route("/health", methods=["GET"])
+    async def health(request: Request) -> JSONResponse:
+        """Circuit breaker state and backend latency per endpoint."""
+        return JSONResponse(backend_status())
+
     # Run the server
     logger.info("🚀 Starting traicon MCP Server...")
     try:
-        mcp.run(transport="streamable-http")
+        uvicorn.run(create_app(mcp), host=settings.HOST, port=settings.PORT)
     except KeyboardInterrupt:
         logger.info("🛑 TRAICon MCP Server shutting down...")
     except Exception as e:
@@ -1,8 +1,11 @@
 """Tools for interacting with the Contradictions API."""
 
+from app.resources.catalog import get_catalog
 from app.utils.http import make_request
+from app.utils.resilience import with_deadline
 
 
+@with_deadline("formulate_tc")
 async def formulate_tc(description: str) -> str:
     """Formulate Technical Contradiction from problem description.
 
@@ -47,6 +50,7 @@ async def formulate_tc(description: str) -> str:
         return f"Error formulating technical contradiction: {str(e)}"
 
 
+@with_deadline("get_ips_by_matrix")
 async def get_ips_by_matrix(improving_params: list[int], preserving_params: list[int]) -> str:
     """Get Inventive Principles from TRIZ contradiction matrix.
 
@@ -61,12 +65,8 @@ async def get_ips_by_matrix(improving_params: list[int], preserving_params: list
         Formatted string with Inventive Principles and their descriptions
     """
     try:
-        # Build query parameters
-        payload = {"improving": improving_params, "preserving": preserving_params}
-
-        data = await make_request(
-            method="GET", endpoint="/api/v1/principles/matrix", params=payload
-        )
+        catalog = await get_catalog()
+        data = catalog.principles_from_matrix(improving_params, preserving_params)
 
         if not data or len(data) == 0:
             return "No Inventive Principles found for the given parameter combination."
@@ -102,6 +102,7 @@ async def get_ips_by_matrix(improving_params: list[int], preserving_params: list
         return f"Error retrieving Inventive Principles: {str(e)}"
 
 
+@with_deadline("search_parameter")
 async def search_parameter(query: str, limit: int = 5) -> str:
     """Search for matching TRIZ parameters using semantic similarity.
 
@@ -145,6 +146,7 @@ async def search_parameter(query: str, limit: int = 5) -> str:
         return f"Error searching parameters: {str(e)}"
 
 
+@with_deadline("search_principle")
 async def search_principle(query: str, limit: int = 5) -> str:
     """Search for Inventive Principles using semantic similarity.
 
@@ -205,6 +207,7 @@ async def search_principle(query: str, limit: int = 5) -> str:
         return f"Error searching principles: {str(e)}"
 
 
+@with_deadline("get_principle_by_id")
 async def get_principle_by_id(principle_id: int) -> str:
     """Get a specific Inventive Principle by ID.
 
@@ -218,10 +221,7 @@ async def get_principle_by_id(principle_id: int) -> str:
         Formatted string with complete principle information
     """
     try:
-        data = await make_request(
-            method="GET",
-            endpoint=f"/api/v1/principles/{principle_id}",
-        )
+        data = (await get_catalog()).get_principle(principle_id)
 
         if not data:
             return f"Principle with ID {principle_id} not found."
@@ -253,6 +253,7 @@ async def get_principle_by_id(principle_id: int) -> str:
         return f"Error retrieving principle: {str(e)}"
 
 
+@with_deadline("get_parameter_by_id")
 async def get_parameter_by_id(parameter_id: int) -> str:
     """Get a specific TRIZ Parameter by ID.
 
@@ -266,10 +267,7 @@ async def get_parameter_by_id(parameter_id: int) -> str:
         Formatted string with complete parameter information
     """
     try:
-        data = await make_request(
-            method="GET",
-            endpoint=f"/api/v1/parameters/{parameter_id}",
-        )
+        data = (await get_catalog()).get_parameter(parameter_id)
 
         if not data:
             return f"Parameter with ID {parameter_id} not found."
@@ -289,6 +287,7 @@ async def get_parameter_by_id(parameter_id: int) -> str:
         return f"Error retrieving parameter: {str(e)}"
 
 
+@with_deadline("get_random_principles")
 async def get_random_principles(limit: int = 5) -> str:
     """Get random Inventive Principles for inspiration.
 
@@ -306,9 +305,7 @@ async def get_random_principles(limit: int = 5) -> str:
         if limit < 1 or limit > 40:
             return "Error: limit must be between 1 and 40"
 
-        data = await make_request(
-            method="GET", endpoint="/api/v1/principles/random", params={"limit": limit}
-        )
+        data = (await get_catalog()).random_principles(limit)
 
         if not data or len(data) == 0:
             return "No principles returned."
@@ -0,0 +1,141 @@
+"""Composite tool running the whole contradiction-to-principles chain server-side."""
+
+import asyncio
+from itertools import product
+from typing import Any
+
+from mcp.server.fastmcp import FastMCP
+
+from app.resources.catalog import CatalogCache, get_catalog
+from app.utils.http import make_request
+from app.utils.resilience import with_deadline
+
+
+async def _search_parameters(query: str, limit: int) -> list[dict[str, Any]]:
+    return await make_request(
+        method="GET", endpoint="/api/v1/parameters/search", params={"q": query, "limit": limit}
+    )
+
+
+def _rank_principles(
+    catalog: CatalogCache,
+    improving: list[dict[str, Any]],
+    preserving: list[dict[str, Any]],
+) -> list[tuple[dict[str, Any], float, int]]:
+    """Rank matrix principles over all matched parameter pairs.
+
+    A principle scores the product of both parameters' similarities for every matrix cell it
+    appears in, so principles backed by several likely pairs rank first.
+
+    Returns:
+        List of (principle, score, number of cells) tuples, best first
+    """
+    scores: dict[int, float] = {}
+    cells: dict[int, int] = {}
+    for imp, pres in product(improving, preserving):
+        weight = imp["score"] * pres["score"]
+        for principle_id in catalog.matrix_cell(imp["parameter"]["id"], pres["parameter"]["id"]):
+            scores[principle_id] = scores.get(principle_id, 0.0) + weight
+            cells[principle_id] = cells.get(principle_id, 0) + 1
+
+    ranked = sorted(scores, key=lambda principle_id: (-scores[principle_id], principle_id))
+    return [
+        (catalog.principles[principle_id], scores[principle_id], cells[principle_id])
+        for principle_id in ranked
+        if principle_id in catalog.principles
+    ]
+
+
+def _format_matches(matches: list[dict[str, Any]]) -> str:
+    if not matches:
+        return "no matching parameter"
+    return ", ".join(
+        f"{match['parameter']['name']} (ID: {match['parameter']['id']}, {match['score']:.0%})"
+        for match in matches
+    )
+
+
+@with_deadline("get_principles_for_problem")
+async def get_principles_for_problem(
+    description: str, parameter_matches: int = 2, limit: int = 5
+) -> str:
+    """Formulate contradictions and find ranked Inventive Principles in one call.
+
+    Runs the whole chain server-side: extracts technical contradictions from the
+    description, matches both effects of each to TRIZ parameters (concurrently) and
+    ranks principles from the contradiction matrix. Use this instead of calling the
+    formulate, parameter search and matrix tools one after another.
+
+    Args:
+        description: Problem description text
+        parameter_matches: TRIZ parameters matched per effect (1-5, default: 2)
+        limit: Maximum number of principles per contradiction (1-40, default: 5)
+
+    Returns:
+        Formatted string with each contradiction, its matched parameters and ranked principles
+    """
+    try:
+        # Validate limits
+        if parameter_matches < 1 or parameter_matches > 5:
+            return "Error: parameter_matches must be between 1 and 5"
+        if limit < 1 or limit > 40:
+            return "Error: limit must be between 1 and 40"
+
+        data = await make_request(
+            method="POST",
+            endpoint="/api/v1/contradictions/extract-tc",
+            json_data={"description": description},
+        )
+        contradictions = data.get("contradictions", [])
+        if not contradictions:
+            return "No technical contradictions found in the description."
+
+        # One search per distinct effect, all in flight at once, alongside the catalog load
+        queries = list(
+            dict.fromkeys(
+                effect
+                for tc in contradictions
+                for effect in (tc["positive_effect"], tc["negative_effect"])
+            )
+        )
+        catalog, *results = await asyncio.gather(
+            get_catalog(), *(_search_parameters(query, parameter_matches) for query in queries)
+        )
+        matches = dict(zip(queries, results))
+
+        sections = []
+        for idx, tc in enumerate(contradictions, 1):
+            improving = matches[tc["positive_effect"]]
+            preserving = matches[tc["negative_effect"]]
+
+            result = f"--- Technical Contradiction #{idx} ---\n"
+            result += f"UUID: {tc['uuid']}\n\n"
+            result += f"AP (Action Parameter): {tc['action']}\n"
+            result += f"EP1 (Positive Effect): {tc['positive_effect']}\n"
+            result += f"   Improving: {_format_matches(improving)}\n"
+            result += f"EP2 (Negative Effect): {tc['negative_effect']}\n"
+            result += f"   Preserving: {_format_matches(preserving)}\n\n"
+
+            ranked = _rank_principles(catalog, improving, preserving)[:limit]
+            if not ranked:
+                result += "No Inventive Principles found for the matched parameters.\n"
+            else:
+                result += "Recommended Inventive Principles:\n"
+                for i, (principle, score, cells) in enumerate(ranked, 1):
+                    result += (
+                        f"{i}. {principle['name']} (ID: {principle['id']}) - "
+                        f"Score: {score:.2f}, in {cells} matrix cell(s)\n"
+                    )
+                    result += f"   {principle['description']}\n"
+
+            sections.append(result.strip())
+
+        return "\n\n".join(sections)
+
+    except Exception as e:
+        return f"Error finding principles for problem: {str(e)}"
+
+
+def register(mcp: FastMCP) -> None:
+    """Register get_principles_for_problem as a tool under its own name and docstring."""
+    mcp.add_tool(get_principles_for_problem)
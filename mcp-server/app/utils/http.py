@@ -1,43 +1,242 @@
 """HTTP utility functions for API requests."""
 
-from typing import Any
+import asyncio
+import importlib.util
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
 
 import httpx
 
 from app.core.config import settings
+from app.utils import inprocess
+from app.utils.resilience import (
+    IDEMPOTENT_METHODS,
+    backoff_delay,
+    breaker,
+    get_stats,
+    remaining_time,
+)
+
+logger = logging.getLogger(__name__)
+
+_client: httpx.AsyncClient | None = None
+
+# Failures worth retrying: the request never reached the backend, or a proxy reported it down
+_RETRY_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout)
+_RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+def _create_client() -> httpx.AsyncClient:
+    http2 = settings.HTTP2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("HTTP2 is enabled but the h2 package is not installed, using HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        base_url=settings.API_BASE_URL,
+        timeout=httpx.Timeout(settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        http2=http2,
+    )
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the shared backend client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = _create_client()
+    return _client
+
+
+async def close_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+@asynccontextmanager
+async def http_client_lifespan() -> AsyncIterator[httpx.AsyncClient]:
+    """Own the shared backend client for the lifetime of the server.
+
+    With the inprocess transport the backend service layer is loaded and warmed up instead.
+    """
+    if settings.BACKEND_TRANSPORT == "inprocess":
+        await asyncio.to_thread(inprocess.warm_up)
+        logger.info("Backend service layer ready in-process")
+    client = get_client()
+    logger.info(f"Backend client ready for {settings.API_BASE_URL}")
+    try:
+        yield client
+    finally:
+        await close_client()
+        logger.info("Backend client closed")
+
+
+def get_timeout(endpoint: str) -> float:
+    """Timeout for an endpoint, from the longest matching prefix in HTTP_ENDPOINT_TIMEOUTS."""
+    matches = [prefix for prefix in settings.HTTP_ENDPOINT_TIMEOUTS if endpoint.startswith(prefix)]
+    if not matches:
+        return settings.HTTP_TIMEOUT
+    return settings.HTTP_ENDPOINT_TIMEOUTS[max(matches, key=len)]
+
+
+async def _send(
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    json_data: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float | None = None,
+) -> httpx.Response:
+    """Send a request through the circuit breaker, retrying idempotent methods on failure.
+
+    Only connection failures and 502/503/504 responses are retried, with jittered backoff and
+    never past the calling tool's deadline. Connection failures and 5xx responses other than
+    501 count as breaker failures. Timeouts are not retried, so an overloaded backend
+    is not sent more work.
+    """
+    retries = settings.HTTP_RETRIES if method.upper() in IDEMPOTENT_METHODS else 0
+    stats = get_stats(endpoint)
+
+    attempt = 0
+    while True:
+        breaker.before_call()
+        read_timeout = timeout if timeout is not None else get_timeout(endpoint)
+        remaining = remaining_time()
+        if remaining is not None:
+            read_timeout = max(0.1, min(read_timeout, remaining))
+
+        start = time.perf_counter()
+        try:
+            response = await get_client().request(
+                method=method,
+                url=endpoint,
+                params=params,
+                json=json_data,
+                headers=headers,
+                timeout=httpx.Timeout(read_timeout, connect=settings.HTTP_CONNECT_TIMEOUT),
+            )
+        except asyncio.CancelledError:
+            stats.record(time.perf_counter() - start, ok=False)
+            # Running out the tool's deadline counts against the backend like a timeout
+            remaining = remaining_time()
+            if remaining is not None and remaining <= 0:
+                breaker.record_failure()
+            raise
+        except httpx.TransportError as e:
+            stats.record(time.perf_counter() - start, ok=False)
+            breaker.record_failure()
+            retryable = isinstance(e, _RETRY_ERRORS)
+            error: httpx.TransportError | None = e
+        else:
+            stats.record(time.perf_counter() - start, ok=not response.is_server_error)
+            # 501 says the backend lacks the feature, not that it is unhealthy
+            if response.is_server_error and response.status_code != 501:
+                breaker.record_failure()
+            else:
+                breaker.record_success()
+            if response.status_code not in _RETRY_STATUSES:
+                return response
+            retryable = True
+            error = None
+
+        delay = backoff_delay(attempt + 1)
+        remaining = remaining_time()
+        if not retryable or attempt == retries or (remaining is not None and delay >= remaining):
+            if error is not None:
+                raise error
+            return response
+        attempt += 1
+        stats.retries += 1
+        logger.info(f"Retrying {method} {endpoint} in {delay:.2f}s (attempt {attempt + 1})")
+        await asyncio.sleep(delay)
 
 
 async def make_request(
-    method: str, endpoint: str, params: dict[str, Any] | None = None, json_data: dict[str, Any] | None = None
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    json_data: dict[str, Any] | None = None,
+    timeout: float | None = None,
 ) -> dict[str, Any]:
     """Make an HTTP request to the backend API.
 
+    Requests share one pooled client, so connections to the backend are kept alive between
+    tool calls. Idempotent requests are retried on connection failures, and all requests fail
+    fast while the circuit breaker is open. With BACKEND_TRANSPORT set to "inprocess" the
+    backend service layer is called directly instead.
+
     Args:
         method: HTTP method (GET, POST, etc.)
         endpoint: API endpoint path (will be appended to base URL)
         params: Query parameters
         json_data: JSON body for POST requests
+        timeout: Read timeout in seconds (default: from HTTP_ENDPOINT_TIMEOUTS)
 
     Returns:
         Response data as dictionary
 
     Raises:
         Exception: If the request fails
+        CircuitOpenError: If the backend is considered unavailable
     """
+    if settings.BACKEND_TRANSPORT == "inprocess":
+        return await inprocess.request(method, endpoint, params, json_data)
+
     url = f"{settings.API_BASE_URL}{endpoint}"
 
     try:
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                params=params,
-                json=json_data,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await _send(
+            method, endpoint, params=params, json_data=json_data, timeout=timeout
+        )
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        raise Exception(
+            f"API request failed with status {e.response.status_code}: {e.response.text}"
+        )
+    except httpx.TimeoutException:
+        raise Exception(f"Request to {url} timed out")
+    except httpx.RequestError as e:
+        raise Exception(f"Request to {url} failed: {str(e)}")
+
+
+async def make_conditional_request(endpoint: str, etag: str | None) -> tuple[Any, str | None]:
+    """GET an endpoint, revalidating a cached copy with If-None-Match.
+
+    Args:
+        endpoint: API endpoint path (will be appended to base URL)
+        etag: ETag of the cached copy, if any
+
+    Returns:
+        Tuple of (response data, or None when the cached copy is still current; new ETag)
+
+    Raises:
+        Exception: If the request fails
+    """
+    if settings.BACKEND_TRANSPORT == "inprocess":
+        return await inprocess.conditional_request(endpoint, etag)
+
+    url = f"{settings.API_BASE_URL}{endpoint}"
+    headers = {"If-None-Match": etag} if etag else {}
+
+    try:
+        response = await _send("GET", endpoint, headers=headers)
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            return None, etag
+        response.raise_for_status()
+        return response.json(), response.headers.get("ETag")
     except httpx.HTTPStatusError as e:
-        raise Exception(f"API request failed with status {e.response.status_code}: {e.response.text}")
+        raise Exception(
+            f"API request failed with status {e.response.status_code}: {e.response.text}"
+        )
     except httpx.TimeoutException:
         raise Exception(f"Request to {url} timed out")
     except httpx.RequestError as e:
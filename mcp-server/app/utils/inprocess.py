@@ -0,0 +1,155 @@
+"""In-process transport: call the backend service layer directly instead of over HTTP.
+
+Used when BACKEND_TRANSPORT is "inprocess" and the backend runs in the same container. Both
+projects name their top-level package `app`, so the backend package is imported from
+BACKEND_APP_DIR under the name `traicon_backend`. The backend's dependencies must be installed
+in the MCP server's environment.
+
+Requests are dispatched by the same method and endpoint as the HTTP API and return the same
+JSON-shaped data, so tools work unchanged with either transport.
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import logging
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from types import ModuleType
+from typing import Any
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+BACKEND_PACKAGE = "traicon_backend"
+
+_BY_ID = re.compile(r"^/api/v1/(principles|parameters)/(\d+)$")
+
+
+@dataclass(frozen=True)
+class Backend:
+    config: ModuleType
+    utils: ModuleType
+    principles: ModuleType
+    parameters: ModuleType
+    contradictions: ModuleType
+
+
+@lru_cache
+def load_backend() -> Backend:
+    """Import the backend package and its service modules once per process."""
+    app_dir = settings.BACKEND_APP_DIR
+    spec = importlib.util.spec_from_file_location(
+        BACKEND_PACKAGE, app_dir / "__init__.py", submodule_search_locations=[str(app_dir)]
+    )
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Backend package not found in {app_dir}")
+    package = importlib.util.module_from_spec(spec)
+    sys.modules[BACKEND_PACKAGE] = package
+    spec.loader.exec_module(package)
+    logger.info(f"Loaded backend service layer from {app_dir}")
+
+    def load(name: str) -> ModuleType:
+        return importlib.import_module(f"{BACKEND_PACKAGE}.{name}")
+
+    return Backend(
+        config=load("core.config"),
+        utils=load("utils"),
+        principles=load("services.principles"),
+        parameters=load("services.parameters"),
+        contradictions=load("services.contradictions"),
+    )
+
+
+def warm_up() -> None:
+    """Load the backend and build its vector store before the first tool call."""
+    backend = load_backend()
+    importlib.import_module(f"{BACKEND_PACKAGE}.core.vectors").get_vector_store()
+    backend.utils.get_catalog_etag()
+
+
+# ------------------------------------------
+# Dispatch
+# ------------------------------------------
+
+
+def _dump(models: list) -> list[dict[str, Any]]:
+    return [model.model_dump() for model in models]
+
+
+def _scored(key: str, results: list) -> list[dict[str, Any]]:
+    return [{key: model.model_dump(), "score": float(score)} for model, score in results]
+
+
+def _handle(
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None,
+    json_data: dict[str, Any] | None,
+) -> Any:
+    backend = load_backend()
+    params = params or {}
+    match method, endpoint:
+        case "GET", "/api/v1/principles/":
+            return _dump(backend.principles.get_all_principles())
+        case "GET", "/api/v1/parameters/":
+            return _dump(backend.parameters.get_all_parameters())
+        case "GET", "/api/v1/principles/matrix/table":
+            return {"cells": backend.principles.get_matrix()}
+        case "GET", "/api/v1/principles/matrix":
+            return _dump(
+                backend.principles.get_principles_from_matrix(
+                    params["improving"], params["preserving"]
+                )
+            )
+        case "GET", "/api/v1/principles/search":
+            results = backend.principles.search_principles(params["q"], params.get("limit", 1))
+            return _scored("principle", results)
+        case "GET", "/api/v1/parameters/search":
+            results = backend.parameters.search_parameters(params["q"], params.get("limit", 1))
+            return _scored("parameter", results)
+        case "GET", "/api/v1/principles/random":
+            return _dump(backend.principles.get_random_principles(params.get("limit", 5)))
+        case "POST", "/api/v1/contradictions/extract-tc":
+            backend_settings = backend.config.settings
+            return backend.contradictions.extract_tc(
+                json_data["description"],
+                model=backend_settings.DEFAULT_MODEL,
+                provider=backend_settings.DEFAULT_PROVIDER,
+            ).model_dump()
+
+    if method == "GET" and (match := _BY_ID.match(endpoint)):
+        kind, item_id = match.group(1), int(match.group(2))
+        if kind == "principles":
+            return backend.principles.get_principle_by_id(item_id).model_dump()
+        return backend.parameters.get_parameter_by_id(item_id).model_dump()
+
+    raise ValueError(f"No in-process handler for {method} {endpoint}")
+
+
+async def request(
+    method: str,
+    endpoint: str,
+    params: dict[str, Any] | None = None,
+    json_data: dict[str, Any] | None = None,
+) -> Any:
+    """Run a backend request in a worker thread, as the HTTP API would.
+
+    Raises:
+        Exception: If the service call fails
+    """
+    try:
+        return await asyncio.to_thread(_handle, method, endpoint, params, json_data)
+    except Exception as e:
+        raise Exception(f"In-process request {method} {endpoint} failed: {str(e)}") from e
+
+
+async def conditional_request(endpoint: str, etag: str | None) -> tuple[Any, str | None]:
+    """Like make_conditional_request, using the backend's catalog ETag."""
+    current = await asyncio.to_thread(lambda: load_backend().utils.get_catalog_etag())
+    if etag == current:
+        return None, etag
+    return await request("GET", endpoint), current
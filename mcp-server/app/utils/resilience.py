@@ -0,0 +1,195 @@
+"""Deadlines, retry backoff, circuit breaker and latency stats for backend calls."""
+
+import asyncio
+import functools
+import logging
+import math
+import random
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# Event loop time by which the current tool call must finish, set by with_deadline
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the backend while the circuit breaker is open."""
+
+
+# ------------------------------------------
+# Deadlines
+# ------------------------------------------
+
+
+def remaining_time() -> float | None:
+    """Seconds left before the current tool call's deadline, or None without a deadline."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - asyncio.get_running_loop().time()
+
+
+def with_deadline(
+    tool: str,
+) -> Callable[[Callable[..., Awaitable[str]]], Callable[..., Awaitable[str]]]:
+    """Bound a tool, including all its retries, by its TOOL_DEADLINES entry."""
+
+    def decorator(func: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> str:
+            seconds = settings.TOOL_DEADLINES.get(tool, settings.TOOL_DEADLINE)
+            token = _deadline.set(asyncio.get_running_loop().time() + seconds)
+            try:
+                async with asyncio.timeout(seconds):
+                    return await func(*args, **kwargs)
+            except TimeoutError:
+                logger.warning(f"Tool {tool} exceeded its {seconds:.0f}s deadline")
+                return (
+                    f"Error: {tool} did not finish within {seconds:.0f} seconds, try again later"
+                )
+            finally:
+                _deadline.reset(token)
+
+        return wrapper
+
+    return decorator
+
+
+def backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff before retry number attempt (starting at 1)."""
+    ceiling = settings.HTTP_RETRY_BACKOFF * 2 ** (attempt - 1)
+    return random.uniform(0, min(settings.HTTP_RETRY_BACKOFF_MAX, ceiling))
+
+
+# ------------------------------------------
+# Circuit breaker
+# ------------------------------------------
+
+
+class CircuitBreaker:
+    """Fails fast after consecutive backend failures, probing again after a cool-down.
+
+    closed: calls go through. open: calls fail immediately until reset_seconds have passed.
+    half_open: one probe call is let through; its outcome closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at: float | None = None
+        # Start of the half-open probe in flight; a probe that never reports back (cancelled
+        # by its deadline) is replaced after reset_seconds
+        self._probe_started: float | None = None
+
+    def before_call(self) -> None:
+        """Raises CircuitOpenError unless a call may go to the backend now."""
+        if self.state == "closed":
+            return
+        now = time.monotonic()
+        waited = now - (self.opened_at or 0.0)
+        if self.state == "open" and waited >= self.reset_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and (
+            self._probe_started is None or now - self._probe_started >= self.reset_seconds
+        ):
+            self._probe_started = now
+            return
+        if self.state == "half_open":
+            # Another call is probing the backend; it is replaced if it never reports back
+            retry_in = (self._probe_started or now) + self.reset_seconds - now
+            waiting_for = "a recovery probe is in flight"
+        else:
+            retry_in = self.reset_seconds - waited
+            waiting_for = "failing fast"
+        raise CircuitOpenError(
+            f"Backend is unavailable ({self.failures} consecutive failures), "
+            f"{waiting_for}; retry in {math.ceil(max(0.0, retry_in))} seconds"
+        )
+
+    def record_success(self) -> None:
+        if self.state != "closed":
+            logger.info("Backend recovered, closing circuit breaker")
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = None
+        self._probe_started = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._probe_started = None
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                logger.warning(f"Opening circuit breaker after {self.failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def status(self) -> dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self.failures}
+
+
+# ------------------------------------------
+# Latency stats
+# ------------------------------------------
+
+
+class EndpointStats:
+    """Call counts and recent latencies for one backend endpoint."""
+
+    def __init__(self, window: int = 200):
+        self.calls = 0
+        self.errors = 0
+        self.retries = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float, ok: bool) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.latencies.append(seconds)
+
+    def _percentile(self, fraction: float) -> float | None:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    def status(self) -> dict[str, Any]:
+        p50, p95 = self._percentile(0.5), self._percentile(0.95)
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+breaker = CircuitBreaker(
+    failure_threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    reset_seconds=settings.BREAKER_RESET_SECONDS,
+)
+_stats: dict[str, EndpointStats] = {}
+
+
+def get_stats(endpoint: str) -> EndpointStats:
+    if endpoint not in _stats:
+        _stats[endpoint] = EndpointStats()
+    return _stats[endpoint]
+
+
+def backend_status() -> dict[str, Any]:
+    """Breaker state and per-endpoint latency, for the /health route."""
+    return {
+        "circuit_breaker": breaker.status(),
+        "endpoints": {endpoint: stats.status() for endpoint, stats in sorted(_stats.items())},
+    }
@@ -1,3 +1,6 @@
+from contextlib import asynccontextmanager
+
+from app.resources import catalog
 from app.tools.contradictions import (
     formulate_tc,
     get_ips_by_matrix,
@@ -5,10 +8,19 @@ from app.tools.contradictions import (
     search_parameter,
     search_principle,
 )
+from app.tools import pipeline
+from app.utils.http import http_client_lifespan
 from mcp.server.fastmcp import FastMCP
 
+
+@asynccontextmanager
+async def lifespan(server: FastMCP):
+    async with http_client_lifespan():
+        yield
+
+
 # Create an MCP server
-mcp = FastMCP("traicon")
+mcp = FastMCP("traicon", lifespan=lifespan)
 
 
 # Register tools
@@ -25,6 +37,9 @@ async def formulate_technical_contradiction(description: str) -> str:
     return await formulate_tc(description)
 
 
+pipeline.register(mcp)
+
+
 @mcp.tool()
 async def get_inventive_principles_by_matrix(
     improving_params: list[int], preserving_params: list[int]
@@ -81,3 +96,34 @@ async def get_random_inventive_principles(limit: int = 5) -> str:
         limit: Number of random principles to return (1-40, default: 5)
     """
     return await get_random_principles(limit)
+
+
+# Register resources
+@mcp.resource("triz://principles", mime_type="application/json")
+async def principles() -> str:
+    """All 40 TRIZ Inventive Principles with their rules, hints and examples."""
+    return await catalog.read_principles()
+
+
+@mcp.resource("triz://principles/{principle_id}", mime_type="application/json")
+async def principle(principle_id: int) -> str:
+    """A single TRIZ Inventive Principle by ID (1-40)."""
+    return await catalog.read_principle(principle_id)
+
+
+@mcp.resource("triz://parameters", mime_type="application/json")
+async def parameters() -> str:
+    """All 39 TRIZ Parameters with their descriptions and examples."""
+    return await catalog.read_parameters()
+
+
+@mcp.resource("triz://parameters/{parameter_id}", mime_type="application/json")
+async def parameter(parameter_id: int) -> str:
+    """A single TRIZ Parameter by ID (1-39)."""
+    return await catalog.read_parameter(parameter_id)
+
+
+@mcp.resource("triz://matrix", mime_type="application/json")
+async def matrix() -> str:
+    """The TRIZ contradiction matrix, indexed [improving - 1][preserving - 1]."""
+    return await catalog.read_matrix()